@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+여론조사 집계 벤치마크
+지역별 파이썬 반복문(naive)과 NumPy 벡터 연산(PollAggregate)으로
+같은 이동 평균/선두/오차범위 밖 여부를 계산해 시간과 결과 일치 여부를 비교합니다.
+
+사용법:
+    python3 python/bench_aggregate.py --surveys 10000
+"""
+
+import argparse
+import math
+import random
+import time
+from datetime import date, timedelta
+
+from bench_loader import CANDIDATES, REGION_CODES
+from poll_aggregate import DEFAULT_WINDOW, PollAggregate
+
+
+def make_polls(n_surveys, coverage=0.6, seed=0, drop=0.0):
+    """지역별로 일부 조사일에만 조사가 있는 합성 polls (대략 n_surveys건)
+    drop: 조사마다 정당이 빠질 확률 (후보 사퇴/미조사로 창에서 정당이 사라지는 경우)
+    """
+    rng = random.Random(seed)
+    n_dates = max(1, round(n_surveys / (len(REGION_CODES) * coverage)))
+    start = date(2022, 1, 3)
+    timeline = []
+    for i in range(n_dates):
+        surveys = []
+        for code in REGION_CODES:
+            if rng.random() > coverage:
+                continue
+            surveys.append({
+                'regionCode': code,
+                'candidates': [
+                    {'name': name, 'party': party, 'rate': round(rng.uniform(20, 50), 1)}
+                    for name, party in CANDIDATES
+                    if rng.random() >= drop
+                ]
+            })
+        timeline.append({'date': (start + timedelta(days=i)).isoformat(), 'surveys': surveys})
+    return {'meta': {'marginOfError': 3.1}, 'timeline': timeline}
+
+
+def naive_trends(polls, window=DEFAULT_WINDOW):
+    """지역마다 조사일을 순회하며 이동 평균을 구하는 기준 구현 (마지막 조사일 기준)"""
+    moe = polls['meta']['marginOfError']
+    dates = sorted({e['date'] for e in polls['timeline']})
+    by_region = {}
+    for entry in polls['timeline']:
+        for survey in entry['surveys']:
+            by_region.setdefault(survey['regionCode'], {})[entry['date']] = {
+                c['party']: c['rate'] for c in survey['candidates']
+            }
+
+    result = {}
+    for code, surveys in by_region.items():
+        last_avg = None
+        for i, d in enumerate(dates):
+            sums, counts = {}, {}
+            for past in dates[max(0, i - window + 1):i + 1]:
+                for party, rate in surveys.get(past, {}).items():
+                    sums[party] = sums.get(party, 0.0) + rate
+                    counts[party] = counts.get(party, 0) + 1
+            if sums:
+                last_avg = {p: sums[p] / counts[p] for p in sums}
+        ranked = sorted(last_avg.values(), reverse=True)
+        leader = max(last_avg, key=last_avg.get)
+        lead = ranked[0] - (ranked[1] if len(ranked) > 1 else 0.0)
+        result[code] = (leader, lead, lead > 2 * moe)
+    return result
+
+
+def results_match(naive, agg, trends=None):
+    """naive_trends 결과와 PollAggregate의 마지막 조사일 선두/격차/오차범위 밖 여부 비교"""
+    trends = trends if trends is not None else agg.trends()
+    last = len(agg.dates) - 1
+    # 격차는 부동소수점 합산 순서 차이만큼의 허용 오차로 비교
+    return all(
+        naive[code][0] == trends[code]['leader']
+        and naive[code][2] == trends[code]['outside_moe']
+        and math.isclose(naive[code][1], agg.lead[ri, last], abs_tol=1e-6)
+        for ri, code in enumerate(agg.regions)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='여론조사 집계: naive vs NumPy')
+    parser.add_argument('--surveys', type=int, default=10000)
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    args = parser.parse_args()
+
+    polls = make_polls(args.surveys)
+    n_surveys = sum(len(e['surveys']) for e in polls['timeline'])
+
+    t0 = time.perf_counter()
+    naive = naive_trends(polls, args.window)
+    t_naive = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    agg = PollAggregate(polls, window=args.window)
+    trends = agg.trends()
+    t_numpy = time.perf_counter() - t0
+
+    # 정당이 빠지는 조사가 섞인 경우 (창에서 사라진 정당이 선두로 남으면 안 됨)
+    dropped = make_polls(args.surveys, seed=1, drop=0.3)
+
+    print(f"조사 {n_surveys}건, 조사일 {len(agg.dates)}개, 지역 {len(agg.regions)}개, 창 {args.window}")
+    print(f"naive 반복문: {t_naive * 1000:9.1f} ms")
+    print(f"NumPy 집계 : {t_numpy * 1000:9.1f} ms  (x{t_naive / t_numpy:.1f})")
+    print(f"결과 일치   : {results_match(naive, agg, trends)}")
+    print(f"결과 일치 (정당 누락 30%): "
+          f"{results_match(naive_trends(dropped, args.window), PollAggregate(dropped, window=args.window))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+여론조사 로더 벤치마크
+기존 json.load 방식(load_data)과 스트리밍 방식(poll_stream.load_latest)의
+최대 상주 메모리(peak RSS)와 소요 시간을 합성 데이터로 비교합니다.
+
+사용법:
+    python3 python/bench_loader.py --dates 500 2000 8000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+REGION_CODES = ['11', '26', '27', '28', '29', '30', '31', '36', '41',
+                '42', '43', '44', '45', '46', '47', '48', '50']
+CANDIDATES = [('김민수', '민주당'), ('이준호', '국민의힘'), ('박영희', '기타')]
+
+
+def write_synthetic_polls(path, n_dates, seed=0):
+    """n_dates개 조사일 x 17개 지역의 합성 polls JSON 파일 작성"""
+    rng = random.Random(seed)
+    start = date(2022, 1, 3)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"meta": {"lastUpdate": "%s", "pollster": "synthetic", '
+                '"sampleSize": 1000, "marginOfError": 3.1}, "timeline": [\n'
+                % (start + timedelta(days=n_dates - 1)).isoformat())
+        for i in range(n_dates):
+            day = (start + timedelta(days=i)).isoformat()
+            surveys = []
+            for code in REGION_CODES:
+                rates = [rng.uniform(20, 50) for _ in CANDIDATES]
+                surveys.append({
+                    'id': f'{code}_{day}',
+                    'region': code,
+                    'regionCode': code,
+                    'candidates': [
+                        {'name': name, 'party': party, 'rate': round(rate, 1)}
+                        for (name, party), rate in zip(CANDIDATES, rates)
+                    ]
+                })
+            f.write(('' if i == 0 else ',\n')
+                    + json.dumps({'date': day, 'surveys': surveys}, ensure_ascii=False))
+        f.write('\n]}\n')
+
+
+def run_worker(mode, path):
+    """하위 프로세스에서 한 가지 방식만 실행하고 결과를 JSON으로 출력"""
+    t0 = time.perf_counter()
+    if mode == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            polls = json.load(f)
+        latest = {}
+        for entry in polls['timeline']:
+            for survey in entry['surveys']:
+                latest[survey['regionCode']] = entry['date']
+    else:
+        from poll_stream import load_latest
+        polls = load_latest(path)
+    elapsed = time.perf_counter() - t0
+    # Linux: ru_maxrss 단위는 KB
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'seconds': elapsed, 'peak_kb': peak_kb}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='여론조사 로더 메모리/시간 비교')
+    parser.add_argument('--dates', type=int, nargs='+', default=[500, 2000, 8000])
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker)
+        return
+
+    print(f"{'조사일 수':>8} {'파일(MB)':>9} {'방식':>7} {'시간(s)':>9} {'Peak RSS(MB)':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_dates in args.dates:
+            path = os.path.join(tmp, f'polls_{n_dates}.json')
+            write_synthetic_polls(path, n_dates)
+            size_mb = os.path.getsize(path) / 1e6
+            for mode in ('json', 'stream'):
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--worker', mode, path],
+                    capture_output=True, text=True, check=True,
+                    cwd=os.path.dirname(os.path.abspath(__file__))
+                )
+                result = json.loads(out.stdout)
+                print(f"{n_dates:>8} {size_mb:>9.1f} {mode:>7} "
+                      f"{result['seconds']:>9.3f} {result['peak_kb'] / 1024:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+시작 시간 벤치마크
+1) python -X importtime으로 generate_map 모듈 임포트 비용 측정
+   (현재: folium 지연 임포트 / 이전 방식: folium + folium.plugins를 먼저 임포트)
+2) 빠른 렌더러와 folium 렌더러로 map.html을 만드는 전체 실행 시간 비교
+
+사용법:
+    python3 python/bench_startup.py --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_time_us(code):
+    """-X importtime 출력에서 최상위 임포트들의 누적 시간(us) 합계"""
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, check=True, cwd=SCRIPT_DIR
+    )
+    total = 0
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # 들여쓰기가 없는 항목이 최상위 임포트
+        if not name.startswith('  '):
+            total += int(cumulative)
+    return total
+
+
+def wall_time(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, capture_output=True, check=True, cwd=SCRIPT_DIR)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='generate_map 시작 시간 비교')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {
+        '지연 임포트 (현재)': 'import generate_map',
+        'folium 선임포트 (이전)': 'import folium; from folium import plugins; import generate_map',
+    }
+    print("[임포트 시간] python -X importtime, 중앙값")
+    for label, code in cases.items():
+        samples = [import_time_us(code) for _ in range(args.repeat)]
+        print(f"  {label:<20} {statistics.median(samples) / 1000:8.1f} ms")
+
+    print("[전체 실행 시간] generate_map.py, 중앙값")
+    with tempfile.TemporaryDirectory() as tmp:
+        for renderer in ('fast', 'folium'):
+            output = os.path.join(tmp, f'map_{renderer}.html')
+            cmd = ['generate_map.py', '--renderer', renderer, '--output', output]
+            samples = [wall_time(cmd) for _ in range(args.repeat)]
+            print(f"  {renderer:<20} {statistics.median(samples) * 1000:8.1f} ms"
+                  f"  ({os.path.getsize(output) / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
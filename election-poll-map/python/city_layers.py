@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+시군구 단위 지도 레이어
+시군구 마커를 MarkerCluster로 묶고, 확대 수준에 따라
+광역(낮은 줌) ↔ 시군구(높은 줌) 레이어를 바꿔 보여 줍니다.
+현재 보이지 않는 레이어는 지도에서 제거되어 DOM/캔버스에 그려지지 않습니다.
+단계구분도는 시작 줌 단계만 페이지에 싣고 나머지 단계는 확대할 때 파일로 받아 옵니다.
+"""
+
+import json
+
+from branca.element import MacroElement
+from jinja2 import Template
+
+# 이 줌 이상에서 시군구 레이어 표시 (미만에서는 광역 레이어)
+CITY_MIN_ZOOM = 9
+
+# 이 줌 이상에서는 클러스터를 풀어 개별 마커 표시
+CLUSTER_DISABLE_ZOOM = 12
+
+
+class ZoomLayerSwitch(MacroElement):
+    """줌 수준에 따라 레이어 묶음을 지도에 붙였다 떼는 스크립트
+
+    tiers: [(최소 줌, [레이어, ...]), ...] - 현재 줌 이하에서 가장 높은 단계 하나만 표시
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var map = {{ this._parent.get_name() }};
+            var tiers = [{% for min_zoom, layers in this.tiers %}
+                [{{ min_zoom }}, [{% for layer in layers %}{{ layer.get_name() }}{% if not loop.last %}, {% endif %}{% endfor %}]]{% if not loop.last %},{% endif %}{% endfor %}
+            ];
+            var active = null;
+
+            function toggle(layers, visible) {
+                layers.forEach(function (layer) {
+                    if (visible && !map.hasLayer(layer)) {
+                        map.addLayer(layer);
+                    } else if (!visible && map.hasLayer(layer)) {
+                        map.removeLayer(layer);
+                    }
+                });
+            }
+
+            function sync() {
+                var zoom = map.getZoom();
+                var pick = 0;
+                tiers.forEach(function (tier, i) {
+                    if (zoom >= tier[0]) {
+                        pick = i;
+                    }
+                });
+                if (pick === active) {
+                    return;
+                }
+                active = pick;
+                tiers.forEach(function (tier, i) {
+                    toggle(tier[1], i === pick);
+                });
+            }
+
+            map.on('zoomend', sync);
+            sync();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, tiers):
+        super().__init__()
+        self._name = 'ZoomLayerSwitch'
+        self.tiers = sorted(
+            ((min_zoom, list(layers)) for min_zoom, layers in tiers),
+            key=lambda tier: tier[0]
+        )
+
+
+class TieredChoropleth(MacroElement):
+    """줌 단계별 단순화 경계 단계구분도 (줌 전환 스크립트 하나로 시군구 레이어 표시도 함께 처리)
+
+    tiers: [(최소 줌, TopoJSON 또는 None, 파일 URL 또는 None), ...] - TopoJSON이 있는 단계는 페이지에 싣고,
+           없는 단계는 처음 그 줌에 도달할 때 URL에서 받아 옴 (받기 전이나 실패하면 현재 단계 유지)
+    props: 지역 code -> {'name', 'color', 'popup'}
+    overlays: [(최소 줌, 레이어), ...] - 그 줌 이상에서만 지도에 붙임 (시군구 클러스터)
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var map = {{ this._parent.get_name() }};
+            var props = {{ this.props_json }};
+            var tiers = {{ this.tiers_json }};
+            var overlays = [{% for min_zoom, layer in this.overlays %}
+                [{{ min_zoom }}, {{ layer.get_name() }}]{% if not loop.last %},{% endif %}{% endfor %}
+            ];
+            var layers = [], loading = [], failed = [], active = null;
+
+            // TopoJSON 호(델타 인코딩) → MultiPolygon (호 사이 연결점 중복 제거, 단순화로 점 4개 미만이 된 링 제외)
+            function decode(topo) {
+                var sx = topo.transform.scale[0], sy = topo.transform.scale[1];
+                var tx = topo.transform.translate[0], ty = topo.transform.translate[1];
+                var arcs = topo.arcs.map(function (arc) {
+                    var x = 0, y = 0;
+                    return arc.map(function (d) {
+                        x += d[0];
+                        y += d[1];
+                        return [x * sx + tx, y * sy + ty];
+                    });
+                });
+                var features = [];
+                topo.objects.regions.geometries.forEach(function (geom) {
+                    var info = props[geom.properties.code];
+                    if (!info) {
+                        return;
+                    }
+                    var polygons = [];
+                    geom.arcs.forEach(function (polygon) {
+                        var rings = [];
+                        polygon.forEach(function (refs) {
+                            var ring = [];
+                            refs.forEach(function (ref) {
+                                var coords = ref >= 0 ? arcs[ref] : arcs[~ref].slice().reverse();
+                                ring = ring.concat(ring.length ? coords.slice(1) : coords);
+                            });
+                            var first = ring[0], last = ring[ring.length - 1];
+                            if (ring.length && (first[0] !== last[0] || first[1] !== last[1])) {
+                                ring.push(first);
+                            }
+                            if (ring.length >= 4) {
+                                rings.push(ring);
+                            }
+                        });
+                        if (rings.length) {
+                            polygons.push(rings);
+                        }
+                    });
+                    if (polygons.length) {
+                        features.push({
+                            type: 'Feature',
+                            properties: info,
+                            geometry: {type: 'MultiPolygon', coordinates: polygons}
+                        });
+                    }
+                });
+                return {type: 'FeatureCollection', features: features};
+            }
+
+            function build(i, topo) {
+                var layer = L.geoJson(decode(topo), {
+                    style: function (feature) {
+                        return {fillColor: feature.properties.color, color: '#ffffff',
+                                weight: 1, fillOpacity: 0.6};
+                    },
+                    onEachFeature: function (feature, shape) {
+                        shape.bindTooltip(feature.properties.name);
+                        shape.bindPopup(feature.properties.popup, {maxWidth: 300});
+                        shape.on('mouseover', function () {
+                            shape.setStyle({weight: 3, fillOpacity: 0.8});
+                        });
+                        shape.on('mouseout', function () {
+                            layer.resetStyle(shape);
+                        });
+                    }
+                });
+                layers[i] = layer;
+            }
+
+            function load(i) {
+                loading[i] = true;
+                fetch(tiers[i][2]).then(function (response) {
+                    if (!response.ok) {
+                        throw new Error(response.status);
+                    }
+                    return response.json();
+                }).then(function (topo) {
+                    build(i, topo);
+                    sync();
+                }).catch(function (error) {
+                    failed[i] = true;
+                    console.warn('단계구분도 단계를 받지 못해 현재 단계 유지:', tiers[i][2], error);
+                });
+            }
+
+            function sync() {
+                var zoom = map.getZoom();
+                var pick = 0;
+                tiers.forEach(function (tier, i) {
+                    if (zoom >= tier[0] && !failed[i]) {
+                        pick = i;
+                    }
+                });
+                if (!layers[pick] && tiers[pick][1]) {
+                    build(pick, tiers[pick][1]);
+                }
+                if (!layers[pick]) {
+                    if (!loading[pick]) {
+                        load(pick);
+                    }
+                } else if (pick !== active) {
+                    if (active !== null) {
+                        map.removeLayer(layers[active]);
+                    }
+                    map.addLayer(layers[pick]);
+                    active = pick;
+                }
+                overlays.forEach(function (overlay) {
+                    var visible = zoom >= overlay[0];
+                    if (visible && !map.hasLayer(overlay[1])) {
+                        map.addLayer(overlay[1]);
+                    } else if (!visible && map.hasLayer(overlay[1])) {
+                        map.removeLayer(overlay[1]);
+                    }
+                });
+            }
+
+            map.on('zoomend', sync);
+            sync();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, tiers, props, overlays=()):
+        super().__init__()
+        self._name = 'TieredChoropleth'
+        self.tiers = sorted(tiers, key=lambda tier: tier[0])
+        self.props_json = json.dumps(props, ensure_ascii=False).replace('</', '<\\/')
+        self.tiers_json = json.dumps([list(tier) for tier in self.tiers],
+                                     ensure_ascii=False, separators=(',', ':'))
+        self.overlays = list(overlays)
+
+
+def build_city_fragments(regions, latest_surveys, popup_builder, color_of):
+    """시군구 마커 조각 목록
+
+    시군구별 조사가 없으면 상위 광역자치단체(parent)의 최신 조사를 사용합니다.
+    popup_builder(name, candidates, date)와 color_of(candidates)는 광역 마커와 같은 규칙을 씁니다.
+    """
+    province_codes = {p['name']: p['code'] for p in regions['provinces']}
+    fragments = []
+    for city in regions.get('cities', []):
+        survey_data = latest_surveys.get(city.get('code'))
+        label = city['name']
+        if not survey_data:
+            survey_data = latest_surveys.get(province_codes.get(city.get('parent')))
+            label = f"{city['name']} ({city['parent']} 광역 조사)"
+        if not survey_data or not survey_data['candidates']:
+            continue
+        fragments.append({
+            'name': city['name'],
+            'parent': city.get('parent'),
+            'lat': city['lat'],
+            'lng': city['lng'],
+            'color': color_of(survey_data['candidates']),
+            'popup_html': popup_builder(label, survey_data['candidates'], survey_data['date'])
+        })
+    return fragments
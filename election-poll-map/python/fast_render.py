@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+folium 없이 Leaflet 지도 HTML을 만드는 빠른 렌더러
+미리 컴파일한 문자열 템플릿에 마커 조각(build_fragments 결과)과
+범례/제목/정보 패널 HTML만 채워 넣습니다. folium(및 jinja2/branca) 임포트 비용이 없습니다.
+"""
+
+import json
+from string import Template
+
+LEAFLET_VERSION = '1.9.4'
+
+# 모듈 로드 시 한 번만 컴파일 ($ 치환만 사용하므로 JS 중괄호와 충돌 없음)
+PAGE_TEMPLATE = Template("""\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no" />
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@$leaflet/dist/leaflet.css"/>
+    <script src="https://cdn.jsdelivr.net/npm/leaflet@$leaflet/dist/leaflet.js"></script>
+    <style>
+        html, body { width: 100%; height: 100%; margin: 0; padding: 0; }
+        #map { position: absolute; top: 0; bottom: 0; right: 0; left: 0; }
+    </style>
+</head>
+<body>
+    <div id="map"></div>
+$overlays
+    <script>
+    (function () {
+        var map = L.map('map', {center: [36.3, 127.8], zoom: 7});
+        L.tileLayer('https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png', {
+            attribution: '&copy; OpenStreetMap contributors &copy; CARTO',
+            subdomains: 'abcd', maxZoom: 20
+        }).addTo(map);
+
+        // [위도, 경도, 반지름, 색상, 지역명, 팝업 HTML]
+        var markers = $markers;
+        var overlays = {};
+        markers.forEach(function (m) {
+            var key = '📍 ' + m[4];
+            var group = overlays[key] || (overlays[key] = L.featureGroup().addTo(map));
+            L.circleMarker([m[0], m[1]], {
+                radius: m[2], color: m[3], fill: true, fillColor: m[3],
+                fillOpacity: 0.7, weight: 2, opacity: 1.0
+            }).bindPopup(m[5], {maxWidth: 300}).addTo(group);
+        });
+        L.control.layers(null, overlays, {position: 'topright', collapsed: false}).addTo(map);
+    })();
+    </script>
+</body>
+</html>
+""")
+
+
+def render_fast_page(fragments, overlay_html):
+    """마커 조각과 오버레이 HTML 목록으로 완성된 지도 HTML 반환"""
+    markers = json.dumps(
+        [[f['lat'], f['lng'], f['radius'], f['color'], f['name'], f['popup_html']]
+         for f in fragments],
+        ensure_ascii=False, separators=(',', ':')
+    ).replace('</', '<\\/')
+    return PAGE_TEMPLATE.substitute(
+        leaflet=LEAFLET_VERSION,
+        overlays='\n'.join(overlay_html),
+        markers=markers
+    )
@@ -2,18 +2,31 @@
 """
 2026 지방선거 여론조사 지도 생성 스크립트
 Folium을 사용하여 전국 지도에 여론조사 데이터를 시각화합니다.
+folium은 필요한 경로에서만 임포트하며, 기본 단일 지도는 빠른 렌더러(fast_render)로 만듭니다.
 """
 
-import folium
-from folium import plugins
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import json
 import os
+import time
+
+from fast_render import render_fast_page
+from poll_store import PollStore
+from poll_stream import load_latest
+from region_shapes import ShapeCache
+from render_cache import RenderCache, page_fingerprint, region_fingerprint
+from shared_assets import render_page, write_assets
 
 # 데이터 파일 경로
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 REGIONS_FILE = os.path.join(DATA_DIR, 'regions.json')
 POLLS_FILE = os.path.join(DATA_DIR, 'polls_2026.json')
 OUTPUT_FILE = os.path.join(os.path.dirname(__file__), '..', 'map.html')
+ASSET_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets')
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), '..', 'archive')
+CACHE_FILE = os.path.join(os.path.dirname(__file__), '..', '.cache', 'render_cache.json')
+SHAPE_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'shapes')
 
 # 정당별 색상 정의
 PARTY_COLORS = {
@@ -22,15 +35,31 @@ PARTY_COLORS = {
     '기타': '#8b949e'         # 회색
 }
 
-def load_data():
-    """데이터 파일 로드"""
-    with open(REGIONS_FILE, 'r', encoding='utf-8') as f:
-        regions = json.load(f)
+def _load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_atomic(path, text):
+    """임시 파일에 쓴 뒤 교체 - 읽는 쪽은 항상 완성된 파일만 봄"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_data(stream=False):
+    """데이터 파일 로드
+
+    stream=True이면 여론조사 파일을 조사 단위로 스트리밍하여
+    지역별 최신 조사만 남깁니다 (대용량 아카이브용).
+    """
+    regions = _load_json(REGIONS_FILE)
 
-    with open(POLLS_FILE, 'r', encoding='utf-8') as f:
-        polls = json.load(f)
+    if stream:
+        return regions, load_latest(POLLS_FILE)
 
-    return regions, polls
+    return regions, _load_json(POLLS_FILE)
 
 def get_leading_candidate(candidates):
     """후보자 중 가장 높은 지지율을 가진 후보 반환"""
@@ -38,8 +67,8 @@ def get_leading_candidate(candidates):
         return None, 0
     return max(candidates, key=lambda x: x['rate']), max(c['rate'] for c in candidates)
 
-def create_popup_html(region_name, candidates, survey_date):
-    """팝업 HTML 생성"""
+def create_popup_html(region_name, candidates, survey_date, trend=None):
+    """팝업 HTML 생성 (trend가 있으면 이동 평균 요약 행 추가)"""
     html = f"""
     <div style="font-family:'Malgun Gothic',sans-serif;width:280px;">
         <h3 style="margin:5px 0;color:#333;">{region_name}</h3>
@@ -60,91 +89,165 @@ def create_popup_html(region_name, candidates, survey_date):
             </tr>
         """
 
+    if trend:
+        color = PARTY_COLORS.get(trend['leader'], '#999')
+        momentum = '' if trend['momentum'] is None else f" ({trend['momentum']:+.1f})"
+        moe_label = '오차범위 밖' if trend['outside_moe'] else '오차범위 내'
+        html += f"""
+            <tr style="background:#f5f5f5;">
+                <td style="padding:3px;"><strong>최근 {trend['window']}개 조사일 평균 선두</strong></td>
+                <td style="padding:3px;text-align:right;"><strong style="color:{color};">{trend['leader']}</strong></td>
+            </tr>
+            <tr>
+                <td style="padding:3px;">격차 / 추세</td>
+                <td style="padding:3px;text-align:right;">{trend['lead']}%p {moe_label}{momentum}</td>
+            </tr>
+        """
+
     html += """
         </table>
     </div>
     """
     return html
 
-def create_map(regions, polls):
-    """Folium 지도 생성"""
-    # 기본 지도 설정 (대한민국 중심)
-    m = folium.Map(
-        location=[36.3, 127.8],
-        zoom_start=7,
-        tiles='cartodbpositron'
-    )
+def build_marker_fragment(region, survey_data, trend=None):
+    """지역 마커 조각 생성 (팝업 HTML + 마커 스타일, folium 객체 아님)
 
-    # 최신 여론조사 데이터 가져오기 (가장 최근 데이터)
-    latest_surveys = {}
-    for entry in polls['timeline']:
-        for survey in entry['surveys']:
-            region_code = survey['regionCode']
-            if region_code not in latest_surveys or entry['date'] > latest_surveys[region_code]['date']:
-                latest_surveys[region_code] = {
-                    'date': entry['date'],
-                    'candidates': survey['candidates']
-                }
+    trend가 있으면 단일 조사 대신 이동 평균 선두 정당 색으로 칠합니다.
+    """
+    candidates = survey_data['candidates']
+    leading_cand, leading_rate = get_leading_candidate(candidates)
+
+    if not leading_cand:
+        return None
+
+    leading_party = trend['leader'] if trend else leading_cand['party']
+    color = PARTY_COLORS.get(leading_party, '#999')
+    return {
+        'code': region['code'],
+        'name': region['name'],
+        'lat': region['lat'],
+        'lng': region['lng'],
+        # 원형 마커 (지지율 기반 크기)
+        # 반지름: 지지율의 절반 (20-30 정도)
+        'radius': max(10, leading_rate / 2),
+        'color': color,
+        'popup_html': create_popup_html(
+            region['name'],
+            candidates,
+            survey_data['date'],
+            trend
+        )
+    }
 
-    # 각 광역자치단체에 마커 추가
-    feature_groups = {}
+def build_fragments(regions, latest_surveys, cache=None, trends=None):
+    """광역자치단체별 마커 조각 목록 (cache가 있으면 바뀐 지역만 렌더링)"""
+    trends = trends or {}
+    fragments = []
     for region in regions['provinces']:
-        region_code = region['code']
-        region_name = region['name']
-
         # 이 지역의 최신 여론조사 데이터
-        survey_data = latest_surveys.get(region_code)
+        survey_data = latest_surveys.get(region['code'])
         if not survey_data:
             continue
 
-        candidates = survey_data['candidates']
-        leading_cand, leading_rate = get_leading_candidate(candidates)
-
-        if not leading_cand:
-            continue
-
-        # 지역별 레이어 생성
-        if region_name not in feature_groups:
-            feature_groups[region_name] = folium.FeatureGroup(
-                name=f"📍 {region_name}",
-                show=True
-            )
-
-        # 원형 마커 (지지율 기반 크기)
-        # 반지름: 지지율의 절반 (20-30 정도)
-        marker_radius = max(10, leading_rate / 2)
-
-        popup_html = create_popup_html(
-            region_name,
-            candidates,
-            survey_data['date']
-        )
+        trend = trends.get(region['code'])
+        if cache is not None:
+            fingerprint = region_fingerprint(region, survey_data, trend)
+            hit, fragment = cache.lookup(region['code'], fingerprint)
+            if not hit:
+                fragment = build_marker_fragment(region, survey_data, trend)
+                cache.store(region['code'], fingerprint, fragment)
+        else:
+            fragment = build_marker_fragment(region, survey_data, trend)
+
+        if fragment:
+            fragments.append(fragment)
+    return fragments
+
+def leading_color(candidates):
+    """최고 지지율 후보의 정당 색상"""
+    leading_cand, _ = get_leading_candidate(candidates)
+    return PARTY_COLORS.get(leading_cand['party'], '#999')
+
+def add_city_layer(m, regions, latest_surveys):
+    """시군구 마커를 클러스터 레이어로 추가 (지도에는 확대 시에만 붙음)"""
+    import folium
+    from folium import plugins
+    from city_layers import CLUSTER_DISABLE_ZOOM, build_city_fragments
+
+    cluster = plugins.MarkerCluster(
+        name="🏙️ 시군구",
+        show=False,
+        options={
+            'chunkedLoading': True,
+            'disableClusteringAtZoom': CLUSTER_DISABLE_ZOOM,
+            'spiderfyOnMaxZoom': False,
+            'removeOutsideVisibleBounds': True
+        }
+    )
 
-        circle = folium.CircleMarker(
-            location=[region['lat'], region['lng']],
-            radius=marker_radius,
-            popup=folium.Popup(popup_html, max_width=300),
-            color=PARTY_COLORS.get(leading_cand['party'], '#999'),
+    for fragment in build_city_fragments(regions, latest_surveys,
+                                         create_popup_html, leading_color):
+        folium.CircleMarker(
+            location=[fragment['lat'], fragment['lng']],
+            radius=6,
+            popup=folium.Popup(fragment['popup_html'], max_width=300),
+            tooltip=fragment['name'],
+            color=fragment['color'],
             fill=True,
-            fillColor=PARTY_COLORS.get(leading_cand['party'], '#999'),
+            fillColor=fragment['color'],
             fillOpacity=0.7,
-            weight=2,
-            opacity=1.0
-        )
+            weight=1
+        ).add_to(cluster)
 
-        circle.add_to(feature_groups[region_name])
+    cluster.add_to(m)
+    return cluster
 
-    # 레이어를 지도에 추가
-    for fg in feature_groups.values():
-        fg.add_to(m)
-
-    # 레이어 컨트롤 추가
-    folium.LayerControl(
-        position='topright',
-        collapsed=False
-    ).add_to(m)
+def add_choropleth_layers(m, fragments, shapes, output_file=None):
+    """줌 단계별 단순화 경계에 여론조사 결과를 결합한 단계구분도 (지도에 붙이지 않은 요소 반환)
 
+    시작 줌 단계만 페이지에 싣고, 나머지 단계는 assets/에 내용 해시 파일로 써 두고
+    확대할 때 받아 옵니다. output_file이 없으면(저장 위치를 모름) 모든 단계를 페이지에 싣습니다.
+    """
+    from city_layers import TieredChoropleth
+
+    props = {
+        fragment['code']: {'name': fragment['name'], 'color': fragment['color'],
+                           'popup': fragment['popup_html']}
+        for fragment in fragments
+    }
+    asset_url = None
+    if output_file is not None:
+        asset_url = os.path.relpath(
+            ASSET_DIR, os.path.dirname(os.path.abspath(output_file))
+        ).replace(os.sep, '/')
+
+    topologies = shapes.topologies()
+    start_zoom = m.options.get('zoom', 0)
+    initial = max((min_zoom for min_zoom, _ in topologies.values() if min_zoom <= start_zoom),
+                  default=min(min_zoom for min_zoom, _ in topologies.values()))
+    tiers = []
+    for tier, (min_zoom, topo) in topologies.items():
+        start = time.perf_counter()
+        if asset_url is None or min_zoom == initial:
+            tiers.append((min_zoom, topo, None))
+            size = len(json.dumps(topo, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            shapes.record_render(tier, size, time.perf_counter() - start)
+        else:
+            name = shapes.publish(tier, topo, ASSET_DIR)
+            tiers.append((min_zoom, None, f'{asset_url}/{name}'))
+            shapes.record_render(tier, os.path.getsize(os.path.join(ASSET_DIR, name)),
+                                 time.perf_counter() - start, asset=name)
+    return TieredChoropleth(tiers, props)
+
+def create_overlay_html(polls, as_of=None, trends=None):
+    """범례, 타이틀, 정보 패널 HTML 목록 (folium/빠른 렌더러 공용)"""
     # 범례 HTML 추가
+    color_note = ""
+    if trends:
+        window = next(iter(trends.values()))['window']
+        color_note = f"<strong>마커 색상:</strong> 최근 {window}개 조사일 평균 선두<br>"
+
     legend_html = """
     <div style="position: fixed;
                 bottom: 50px; right: 10px; width: 280px; height: auto;
@@ -171,14 +274,12 @@ def create_map(regions, polls):
         </div>
         <hr style="margin: 8px 0; border: none; border-top: 1px solid #ddd;">
         <div style="font-size: 12px; color: #666;">
-            <strong>마커 크기:</strong> 최고 지지율에 비례<br>
-            <strong>마지막 업데이트:</strong> """ + polls['meta']['lastUpdate'] + """
+            <strong>마커 크기:</strong> 최고 지지율에 비례<br>""" + color_note + """
+            <strong>마지막 업데이트:</strong> """ + (as_of or polls['meta']['lastUpdate']) + """
         </div>
     </div>
     """
 
-    m.get_root().html.add_child(folium.Element(legend_html))
-
     # 타이틀 추가
     title_html = """
     <div style="position: fixed;
@@ -190,8 +291,6 @@ def create_map(regions, polls):
     </div>
     """
 
-    m.get_root().html.add_child(folium.Element(title_html))
-
     # 정보 패널 추가
     info_html = """
     <div style="position: fixed;
@@ -206,22 +305,398 @@ def create_map(regions, polls):
     </div>
     """
 
-    m.get_root().html.add_child(folium.Element(info_html))
+    return [legend_html, title_html, info_html]
+
+def create_map(regions, polls, store=None, as_of=None, cache=None, cities=False, trends=None,
+               shapes=None, output_file=None):
+    """Folium 지도 생성
+
+    cities=True이면 확대 시 시군구 클러스터 레이어를 표시하고,
+    trends(PollAggregate.trends 결과)가 있으면 이동 평균 선두 기준으로 색을 칠합니다.
+    shapes(ShapeCache)가 있으면 원형 마커 대신 줌 단계별 단계구분도를 그립니다.
+    output_file은 단계구분도의 나머지 줌 단계 파일을 가리킬 상대 경로 계산에 씁니다.
+    """
+    import folium
+    from city_layers import CITY_MIN_ZOOM, ZoomLayerSwitch
+
+    # 기본 지도 설정 (대한민국 중심)
+    # 시군구 모드는 마커가 많으므로 SVG 대신 캔버스 렌더러 사용
+    m = folium.Map(
+        location=[36.3, 127.8],
+        zoom_start=7,
+        tiles='cartodbpositron',
+        prefer_canvas=cities
+    )
+
+    # 최신 여론조사 데이터 가져오기 (지역별 인덱스 조회)
+    if store is None:
+        store = PollStore(polls)
+    latest_surveys = store.latest_all(as_of=as_of)
+
+    fragments = build_fragments(regions, latest_surveys, cache, trends)
+    choropleth = None
+    if shapes is not None:
+        choropleth = add_choropleth_layers(m, fragments, shapes, output_file)
+        fragments = []
+
+    # 각 광역자치단체에 마커 추가
+    feature_groups = {}
+    for fragment in fragments:
+        region_name = fragment['name']
+
+        # 지역별 레이어 생성
+        if region_name not in feature_groups:
+            feature_groups[region_name] = folium.FeatureGroup(
+                name=f"📍 {region_name}",
+                show=True
+            )
+
+        circle = folium.CircleMarker(
+            location=[fragment['lat'], fragment['lng']],
+            radius=fragment['radius'],
+            popup=folium.Popup(fragment['popup_html'], max_width=300),
+            color=fragment['color'],
+            fill=True,
+            fillColor=fragment['color'],
+            fillOpacity=0.7,
+            weight=2,
+            opacity=1.0
+        )
+
+        circle.add_to(feature_groups[region_name])
+
+    # 레이어를 지도에 추가
+    for fg in feature_groups.values():
+        fg.add_to(m)
+
+    # 시군구 레이어: 광역 레이어와 줌 수준에 따라 교대로 표시
+    if cities:
+        city_layer = add_city_layer(m, regions, latest_surveys)
+        if choropleth is not None:
+            # 단계구분도는 모든 줌에서 배경으로 두고 시군구 클러스터만 확대 시 표시 (전환 스크립트 하나)
+            choropleth.overlays.append((CITY_MIN_ZOOM, city_layer))
+        else:
+            ZoomLayerSwitch([
+                (0, feature_groups.values()),
+                (CITY_MIN_ZOOM, [city_layer])
+            ]).add_to(m)
+    # 시군구 레이어 변수가 정의된 뒤에 전환 스크립트가 오도록 마지막에 추가
+    if choropleth is not None:
+        choropleth.add_to(m)
+
+    # 레이어 컨트롤 추가
+    folium.LayerControl(
+        position='topright',
+        collapsed=False
+    ).add_to(m)
+
+    # 범례/타이틀/정보 패널 추가
+    for html in create_overlay_html(polls, as_of, trends):
+        m.get_root().html.add_child(folium.Element(html))
 
     return m
 
+def render_map_html(regions, polls, store, renderer='fast', as_of=None, cache=None,
+                    trends=None, cities=False, shapes=None, output_file=None):
+    """지도 HTML 문자열 생성
+
+    renderer='fast'는 folium 없이 문자열 템플릿으로, 'folium'은 create_map으로 만듭니다.
+    시군구/단계구분도 모드는 folium 렌더러가 필요합니다.
+    """
+    if renderer == 'fast':
+        fragments = build_fragments(regions, store.latest_all(as_of=as_of), cache, trends)
+        return render_fast_page(fragments, create_overlay_html(polls, as_of, trends))
+
+    m = create_map(regions, polls, store, as_of=as_of, cache=cache, cities=cities,
+                   trends=trends, shapes=shapes, output_file=output_file)
+    return m.get_root().render()
+
+def save_shared_asset_map(regions, polls, store, output_file, asset_names, as_of=None):
+    """공유 자산(assets/)을 참조하고 압축 데이터만 담은 지도 HTML 저장"""
+    asset_url = os.path.relpath(
+        ASSET_DIR, os.path.dirname(os.path.abspath(output_file))
+    ).replace(os.sep, '/')
+    html = render_page(
+        regions,
+        store.latest_all(as_of=as_of),
+        as_of or polls['meta']['lastUpdate'],
+        asset_names,
+        asset_url
+    )
+    write_atomic(output_file, html)
+
+# 일괄 생성 작업자 프로세스 공유 데이터 (initializer에서 한 번만 설정)
+_batch_state = {}
+
+def _init_batch_worker(regions, polls, store, output_dir, asset_names, renderer,
+                       cities=False, aggregate=None, shapes=None):
+    _batch_state.update(regions=regions, polls=polls, store=store,
+                        output_dir=output_dir, asset_names=asset_names, renderer=renderer,
+                        cities=cities, aggregate=aggregate, shapes=shapes)
+
+def _render_snapshot(as_of):
+    """작업자: 기준일 지도 한 장 생성 후 저장 경로 반환"""
+    output_file = os.path.join(_batch_state['output_dir'], f'map_{as_of}.html')
+    if _batch_state['asset_names']:
+        save_shared_asset_map(_batch_state['regions'], _batch_state['polls'],
+                              _batch_state['store'], output_file,
+                              _batch_state['asset_names'], as_of=as_of)
+        return output_file
+
+    aggregate = _batch_state['aggregate']
+    write_atomic(output_file, render_map_html(
+        _batch_state['regions'], _batch_state['polls'], _batch_state['store'],
+        renderer=_batch_state['renderer'], as_of=as_of,
+        trends=aggregate.trends(as_of) if aggregate is not None else None,
+        cities=_batch_state['cities'], shapes=_batch_state['shapes'], output_file=output_file
+    ))
+    return output_file
+
+def render_snapshots(regions, polls, dates, output_dir=ARCHIVE_DIR, workers=None, store=None,
+                     shared_assets=False, renderer='fast', cities=False, aggregate=None,
+                     shapes=None):
+    """기준일 목록에 대해 지도를 프로세스 풀로 일괄 생성
+
+    데이터 파싱과 인덱스 생성은 한 번만 하고 작업자 프로세스에 공유합니다.
+    aggregate(PollAggregate)가 있으면 기준일마다 그 날짜의 이동 평균으로 색을 칠합니다.
+    생성된 파일 경로 목록과 처리량(장/초)을 반환합니다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if store is None:
+        store = PollStore(polls)
+    # 공유 자산은 작업자 간 경합을 피하도록 부모 프로세스에서 한 번만 작성
+    asset_names = write_assets(ASSET_DIR, PARTY_COLORS) if shared_assets else None
+    # 단계구분도 캐시 파일도 작업자가 동시에 만들지 않도록 먼저 생성
+    if shapes is not None:
+        shapes.topologies()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_batch_worker,
+        initargs=(regions, polls, store, output_dir, asset_names, renderer,
+                  cities, aggregate, shapes)
+    ) as executor:
+        outputs = list(executor.map(_render_snapshot, dates))
+    elapsed = time.perf_counter() - start
+
+    return outputs, len(outputs) / elapsed if elapsed > 0 else float('inf')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='2026 지방선거 여론조사 지도 생성')
+    parser.add_argument('--stream', action='store_true',
+                        help='여론조사 파일을 스트리밍으로 읽어 지역별 최신 조사만 유지')
+    parser.add_argument('--incremental', action='store_true',
+                        help='지역별 해시 캐시로 바뀐 지역만 다시 렌더링 (변경 없으면 저장 생략)')
+    parser.add_argument('--cities', action='store_true',
+                        help='확대 시 시군구 마커를 클러스터 레이어로 표시')
+    parser.add_argument('--smoothed', type=int, nargs='?', const=3, default=None, metavar='WINDOW',
+                        help='최근 WINDOW개 조사일 이동 평균 선두로 색칠 (NumPy 필요, 기본 3)')
+    parser.add_argument('--choropleth', metavar='GEOJSON',
+                        help='행정구역 경계 GeoJSON으로 단계구분도 생성 (줌 단계별 단순화 결과 캐시)')
+    parser.add_argument('--code-property', default=None,
+                        help="경계 GeoJSON에서 지역 코드 속성 이름 (기본: code/CTPRVN_CD 등 자동 탐색)")
+    parser.add_argument('--shared-assets', action='store_true',
+                        help='스타일/팝업 템플릿을 assets/ 번들로 분리하고 지도에는 압축 데이터만 저장')
+    parser.add_argument('--dates', nargs='+', metavar='DATE',
+                        help="기준일별 지도 일괄 생성 (YYYY-MM-DD 목록 또는 'all' = timeline 전체 날짜)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='일괄 생성 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--output-dir', default=ARCHIVE_DIR,
+                        help='일괄 생성 결과(map_<날짜>.html) 저장 경로')
+    parser.add_argument('--renderer', choices=['auto', 'fast', 'folium'], default='auto',
+                        help='fast: folium 없이 템플릿으로 생성, folium: folium 사용 '
+                             '(auto: 시군구/단계구분도 모드만 folium)')
+    parser.add_argument('--output', default=OUTPUT_FILE,
+                        help='단일 지도 저장 경로')
+    parser.add_argument('--watch', action='store_true',
+                        help='상주 모드: data/ 변경 시 자동으로 다시 생성')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='감시 주기(초)')
+    parser.add_argument('--debounce', type=float, default=2.0,
+                        help='마지막 변경 후 이 시간(초) 동안 조용하면 재생성')
+    args = parser.parse_args()
+
+    if args.smoothed is not None and args.smoothed < 1:
+        parser.error('--smoothed WINDOW는 1 이상이어야 합니다')
+    if args.stream and (args.dates or args.smoothed is not None or args.incremental):
+        # 스트리밍은 지역별 최신 조사만 남기므로 과거 조사/추세가 필요한 모드와 함께 쓸 수 없음
+        parser.error('--stream은 --dates/--smoothed/--incremental과 함께 쓸 수 없습니다')
+    if args.shared_assets and (args.cities or args.smoothed is not None or args.choropleth):
+        # 공유 자산 페이지는 광역 마커 템플릿만 지원
+        parser.error('--shared-assets는 --cities/--smoothed/--choropleth와 함께 쓸 수 없습니다')
+
+    needs_folium = args.cities or args.choropleth
+    if args.renderer == 'auto':
+        args.renderer = 'folium' if needs_folium else 'fast'
+    elif args.renderer == 'fast' and needs_folium:
+        parser.error('--cities/--choropleth 모드는 --renderer folium이 필요합니다')
+    return args
+
+def build(args, regions, polls, cache=None, shapes=None):
+    """단일 지도(또는 --dates 일괄) 생성, 파일을 썼으면 True 반환"""
+    store = PollStore(polls)
+
+    if args.dates:
+        dates = store.dates() if args.dates == ['all'] else sorted(args.dates)
+        print(f"기준일 {len(dates)}개 지도 일괄 생성 중...")
+        aggregate = None
+        if args.smoothed is not None:
+            from poll_aggregate import PollAggregate
+            aggregate = PollAggregate(polls, window=args.smoothed)
+        outputs, throughput = render_snapshots(
+            regions, polls, dates, args.output_dir, args.workers, store,
+            shared_assets=args.shared_assets, renderer=args.renderer,
+            cities=args.cities, aggregate=aggregate, shapes=shapes
+        )
+        print(f"✅ 완료! {len(outputs)}개 지도 생성 ({throughput:.2f} 장/초)")
+        print(f"📁 폴더: {args.output_dir}")
+        return True
+
+    trends = None
+    if args.smoothed is not None:
+        from poll_aggregate import PollAggregate
+        trends = PollAggregate(polls, window=args.smoothed).trends()
+
+    if cache is not None:
+        cache.reset_stats()
+        latest_surveys = store.latest_all()
+        region_fps = {r['code']: region_fingerprint(r, latest_surveys.get(r['code']),
+                                                    (trends or {}).get(r['code']))
+                      for r in regions['provinces']}
+        if args.cities:
+            # 시군구 자체 조사만 바뀐 경우도 다시 생성 (조사가 없는 시군구는 광역 조사를 따름)
+            for city in regions.get('cities', []):
+                region_fps[f"city:{city.get('parent')}/{city['name']}"] = region_fingerprint(
+                    city, latest_surveys.get(city.get('code')))
+        page_fp = page_fingerprint(
+            region_fps,
+            polls['meta'],
+            {'shared_assets': args.shared_assets,
+             'renderer': args.renderer,
+             'cities': regions.get('cities') if args.cities else None,
+             'choropleth': args.choropleth and os.path.getmtime(args.choropleth)}
+        )
+        if cache.is_current(page_fp, args.output):
+            print("변경 사항 없음 - 지도 생성을 건너뜁니다.")
+            return False
+
+    if args.shared_assets:
+        print("지도 생성 중 (공유 자산 모드)...")
+        save_shared_asset_map(regions, polls, store, args.output,
+                              write_assets(ASSET_DIR, PARTY_COLORS))
+    else:
+        print(f"지도 생성 중 ({args.renderer} 렌더러)...")
+        html = render_map_html(regions, polls, store, args.renderer, cache=cache, trends=trends,
+                               cities=args.cities, shapes=shapes, output_file=args.output)
+
+        if shapes is not None:
+            for entry in shapes.report:
+                source = entry['source_vertices'] if entry['source_vertices'] is not None else '-'
+                print(f"  단계구분도 [{entry['tier']:>4}] 허용오차 {entry['tolerance_m']}m: "
+                      f"정점 {source} → {entry['vertices']}, 캐시 {entry['bytes'] / 1024:.1f}KB "
+                      f"({'적중' if entry['cached'] else '생성'} {entry['seconds'] * 1000:.0f}ms), "
+                      + (f"확대 시 받는 파일 {entry['asset']} {entry['render_bytes'] / 1024:.1f}KB"
+                         if entry.get('asset') else f"지도에 포함 {entry['render_bytes'] / 1024:.1f}KB"))
+
+        print(f"지도 저장 중 ({args.output})...")
+        write_atomic(args.output, html)
+
+    if cache is not None:
+        cache.mark_page(page_fp)
+        cache.save()
+        print(f"증분 생성: {cache.misses}개 지역 재렌더링, {cache.hits}개 지역 캐시 사용")
+
+    print("✅ 완료! 지도가 생성되었습니다.")
+    print(f"📁 파일: {args.output}")
+    return True
+
+def _snapshot_mtimes(paths):
+    """감시 대상 파일별 (수정 시각, 크기)"""
+    result = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        result[path] = (st.st_mtime_ns, st.st_size)
+    return result
+
+def _watch_targets(args):
+    targets = [os.path.join(DATA_DIR, name) for name in sorted(os.listdir(DATA_DIR))
+               if name.endswith('.json')]
+    if args.choropleth:
+        targets.append(args.choropleth)
+    return targets
+
+def watch(args):
+    """data/ 변경을 감시하며 지도를 다시 생성하는 상주 모드
+
+    인터프리터, folium, 파싱된 regions.json, 렌더링 캐시를 유지한 채
+    변경이 debounce 초 동안 잠잠해지면 한 번만 다시 생성합니다.
+    """
+    regions, polls = load_data(stream=args.stream)
+    cache = RenderCache(CACHE_FILE) if args.incremental else None
+    shapes = ShapeCache(args.choropleth, SHAPE_CACHE_DIR, args.code_property) \
+        if args.choropleth else None
+
+    build(args, regions, polls, cache, shapes)
+    seen = _snapshot_mtimes(_watch_targets(args))
+    pending_since = None
+    changed = set()
+    print(f"👀 {DATA_DIR} 감시 중 (주기 {args.interval}s, 디바운스 {args.debounce}s) - Ctrl+C로 종료")
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = _snapshot_mtimes(_watch_targets(args))
+            if current != seen:
+                paths = sorted(p for p in set(current) | set(seen)
+                               if current.get(p) != seen.get(p))
+                changed.update(paths)
+                seen = current
+                # 연속 쓰기 중에는 타이머만 갱신
+                pending_since = time.monotonic()
+                print(f"[{time.strftime('%H:%M:%S')}] 변경 감지: "
+                      f"{', '.join(os.path.basename(p) for p in paths)}")
+                continue
+
+            if pending_since is None or time.monotonic() - pending_since < args.debounce:
+                continue
+
+            start = time.perf_counter()
+            try:
+                if REGIONS_FILE in changed:
+                    regions, polls = load_data(stream=args.stream)
+                else:
+                    polls = load_latest(POLLS_FILE) if args.stream else _load_json(POLLS_FILE)
+                build(args, regions, polls, cache, shapes)
+            except (OSError, ValueError, KeyError) as e:
+                # 쓰는 도중의 깨진 JSON 등은 다음 변경 때 다시 시도
+                print(f"[{time.strftime('%H:%M:%S')}] 재생성 실패: {e}")
+            else:
+                print(f"[{time.strftime('%H:%M:%S')}] 재생성 완료 "
+                      f"({(time.perf_counter() - start) * 1000:.0f}ms, "
+                      f"변경 후 {(time.monotonic() - pending_since):.2f}s)")
+            pending_since = None
+            changed.clear()
+    except KeyboardInterrupt:
+        print("감시 종료")
+
 def main():
-    print("데이터 로드 중...")
-    regions, polls = load_data()
+    args = parse_args()
 
-    print("지도 생성 중...")
-    m = create_map(regions, polls)
+    if args.watch:
+        watch(args)
+        return
 
-    print(f"지도 저장 중 ({OUTPUT_FILE})...")
-    m.save(OUTPUT_FILE)
+    print("데이터 로드 중...")
+    regions, polls = load_data(stream=args.stream)
 
-    print("✅ 완료! 지도가 생성되었습니다.")
-    print(f"📁 파일: {OUTPUT_FILE}")
+    cache = RenderCache(CACHE_FILE) if args.incremental else None
+    shapes = ShapeCache(args.choropleth, SHAPE_CACHE_DIR, args.code_property) \
+        if args.choropleth else None
+    build(args, regions, polls, cache, shapes)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+NumPy 기반 여론조사 집계 엔진
+timeline 전체를 지역 x 조사일 x 정당 배열로 바꾼 뒤
+이동 평균, 추세(모멘텀), 오차범위 밖 우위 여부를 한 번의 벡터 연산으로 계산합니다.
+
+후보 축은 정당 기준입니다 (지역별 선거에서 정당당 후보 1명).
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 이동 평균 창 크기 (timeline 조사일 수)
+DEFAULT_WINDOW = 3
+
+
+def _shift(arr, n, fill):
+    """조사일 축(axis=1)으로 n칸 뒤로 민 배열"""
+    out = np.full_like(arr, fill)
+    out[:, n:] = arr[:, :-n]
+    return out
+
+
+def _window_sum(arr, window):
+    """조사일 축으로 (당일 포함) 최근 window칸 합, 앞쪽은 0으로 채워 같은 길이 유지"""
+    pad = np.zeros((arr.shape[0], window - 1) + arr.shape[2:], dtype=arr.dtype)
+    padded = np.concatenate([pad, arr], axis=1)
+    return sliding_window_view(padded, window, axis=1).sum(axis=-1)
+
+
+def _ffill_days(arr, valid):
+    """valid(지역 x 조사일)가 False인 날을 직전 유효일의 정당 값 전체로 채움
+
+    정당별로 따로 채우지 않음 - 창에서 빠진 정당이 마지막 평균을 계속 들고 있으면
+    선두/격차가 실제 창과 달라지므로, 그날 조사가 하나도 없을 때만 직전 날을 통째로 씀
+    """
+    idx = np.where(valid, np.arange(arr.shape[1])[None, :], 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    filled = np.take_along_axis(arr, idx[..., None], axis=1)
+    # 첫 유효일 이전은 NaN 유지
+    seen = np.logical_or.accumulate(valid, axis=1)
+    return np.where(seen[..., None], filled, np.nan)
+
+
+class PollAggregate:
+    """지역 x 조사일 x 정당 배열과 이동 평균/추세/우위 계산 결과"""
+
+    def __init__(self, polls, window=DEFAULT_WINDOW, margin_of_error=None):
+        self.window = window
+        self.margin_of_error = margin_of_error if margin_of_error is not None \
+            else polls.get('meta', {}).get('marginOfError', 0.0)
+
+        timeline = polls.get('timeline', [])
+        self.dates = sorted({entry['date'] for entry in timeline})
+        date_index = {d: i for i, d in enumerate(self.dates)}
+
+        region_index = {}
+        party_index = {}
+        r_idx, d_idx, p_idx, values = [], [], [], []
+        for entry in timeline:
+            di = date_index[entry['date']]
+            for survey in entry['surveys']:
+                ri = region_index.setdefault(survey['regionCode'], len(region_index))
+                for cand in survey['candidates']:
+                    r_idx.append(ri)
+                    d_idx.append(di)
+                    p_idx.append(party_index.setdefault(cand['party'], len(party_index)))
+                    values.append(cand['rate'])
+
+        self.regions = list(region_index)
+        self.parties = list(party_index)
+        self._region_pos = region_index
+
+        self.rates = np.full(
+            (len(self.regions), len(self.dates), len(self.parties)), np.nan
+        )
+        if values:
+            self.rates[r_idx, d_idx, p_idx] = values
+
+        self._compute()
+
+    def _compute(self):
+        """이동 평균, 모멘텀, 선두/격차/오차범위 밖 여부 일괄 계산"""
+        rates = self.rates
+        if not self.parties or not self.dates:
+            shape = rates.shape[:2]
+            self.smoothed = self.momentum = rates
+            self.leader = np.full(shape, -1)
+            self.lead = np.full(shape, np.nan)
+            self.outside_moe = np.zeros(shape, dtype=bool)
+            return
+
+        observed = ~np.isnan(rates)
+        window = max(1, min(self.window, rates.shape[1]))
+
+        # 최근 window개 조사일 합/개수 (결측 제외)
+        # 전체 누적합의 차분은 오차가 쌓여 2×MoE 경계에서 판정이 뒤집히므로 창마다 직접 더함
+        win_sum = _window_sum(np.where(observed, rates, 0.0), window)
+        win_count = _window_sum(observed.astype(np.int64), window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            smoothed = np.where(win_count > 0, win_sum / win_count, np.nan)
+
+        # 창 안에 그 지역 조사가 하나도 없는 날만 직전 평균 유지 (정당 전체를 함께)
+        self.smoothed = _ffill_days(smoothed, win_count.sum(axis=2) > 0)
+        self.momentum = self.smoothed - _shift(self.smoothed, 1, np.nan)
+
+        # 선두/2위 (정당 축 정렬)
+        masked = np.where(np.isnan(self.smoothed), -np.inf, self.smoothed)
+        ranked = np.sort(masked, axis=2)
+        has_leader = np.isfinite(ranked[..., -1])
+        self.leader = np.where(has_leader, np.argmax(masked, axis=2), -1)
+        if len(self.parties) > 1:
+            second = np.where(np.isfinite(ranked[..., -2]), ranked[..., -2], 0.0)
+        else:
+            second = np.zeros(rates.shape[:2])
+        self.lead = np.where(has_leader, ranked[..., -1] - second, np.nan)
+        # 두 후보 지지율 차이가 오차범위(±MoE)의 2배를 넘으면 '오차범위 밖' 우위
+        self.outside_moe = has_leader & (self.lead > 2 * self.margin_of_error)
+
+    def date_position(self, as_of=None):
+        """기준일 이전(당일 포함) 마지막 조사일 인덱스 (없으면 -1)"""
+        if as_of is None:
+            return len(self.dates) - 1
+        return int(np.searchsorted(self.dates, as_of, side='right')) - 1
+
+    def trends(self, as_of=None):
+        """지역 코드별 평균 추세 요약 딕셔너리"""
+        di = self.date_position(as_of)
+        if di < 0:
+            return {}
+
+        result = {}
+        for region_code, ri in self._region_pos.items():
+            leader = self.leader[ri, di]
+            if leader < 0:
+                continue
+            momentum = self.momentum[ri, di]
+            result[region_code] = {
+                'date': self.dates[di],
+                'window': self.window,
+                'leader': self.parties[leader],
+                'lead': round(float(self.lead[ri, di]), 1),
+                'outside_moe': bool(self.outside_moe[ri, di]),
+                'momentum': None if np.isnan(momentum[leader]) else round(float(momentum[leader]), 1),
+                'smoothed': {
+                    party: round(float(v), 1)
+                    for party, v in zip(self.parties, self.smoothed[ri, di])
+                    if not np.isnan(v)
+                }
+            }
+        return result
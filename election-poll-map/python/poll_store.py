@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+여론조사 인덱스 저장소
+polls_2026.json을 한 번만 읽어 지역별로 날짜 정렬된 인덱스를 만들고,
+최신/기준일/기간 조회를 이진 탐색(O(log n))으로 처리합니다.
+"""
+
+from bisect import bisect_left, bisect_right
+import json
+
+
+class PollStore:
+    """지역 코드별 날짜 정렬 여론조사 인덱스"""
+
+    def __init__(self, polls):
+        self.meta = polls.get('meta', {})
+        # 지역 코드 -> 날짜 오름차순 리스트 / 같은 순서의 조사 리스트
+        self._dates = {}
+        self._surveys = {}
+
+        rows = {}
+        for entry in polls.get('timeline', []):
+            date = entry['date']
+            for survey in entry['surveys']:
+                rows.setdefault(survey['regionCode'], []).append((date, survey))
+
+        for region_code, items in rows.items():
+            # 안정 정렬: 같은 날짜의 조사는 파일 순서를 유지
+            items.sort(key=lambda x: x[0])
+            self._dates[region_code] = [date for date, _ in items]
+            self._surveys[region_code] = [survey for _, survey in items]
+
+    @classmethod
+    def from_file(cls, path):
+        """JSON 파일에서 저장소 생성"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def region_codes(self):
+        """조사가 있는 지역 코드 목록"""
+        return list(self._dates)
+
+    def dates(self):
+        """전체 조사일 목록 (오름차순, 중복 제거)"""
+        return sorted({d for dates in self._dates.values() for d in dates})
+
+    def _record(self, region_code, idx):
+        survey = self._surveys[region_code][idx]
+        return {
+            'date': self._dates[region_code][idx],
+            'candidates': survey['candidates'],
+            'survey': survey
+        }
+
+    def latest(self, region_code):
+        """지역의 최신 조사 (없으면 None)"""
+        if not self._dates.get(region_code):
+            return None
+        return self._record(region_code, len(self._dates[region_code]) - 1)
+
+    def as_of(self, region_code, date):
+        """기준일(date) 이전 또는 당일의 가장 최근 조사 (없으면 None)"""
+        dates = self._dates.get(region_code)
+        if not dates:
+            return None
+        idx = bisect_right(dates, date) - 1
+        if idx < 0:
+            return None
+        return self._record(region_code, idx)
+
+    def range(self, region_code, start, end):
+        """[start, end] 기간의 조사 목록 (날짜 오름차순)"""
+        dates = self._dates.get(region_code)
+        if not dates:
+            return []
+        lo = bisect_left(dates, start)
+        hi = bisect_right(dates, end)
+        return [self._record(region_code, i) for i in range(lo, hi)]
+
+    def latest_all(self, as_of=None):
+        """전 지역의 최신 조사 딕셔너리 (as_of 지정 시 해당 일자 기준)"""
+        result = {}
+        for region_code in self._dates:
+            if as_of is None:
+                record = self.latest(region_code)
+            else:
+                record = self.as_of(region_code, as_of)
+            if record:
+                result[region_code] = record
+        return result
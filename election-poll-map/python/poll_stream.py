@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+대용량 여론조사 파일 스트리밍 로더
+polls_*.json 전체를 json.load로 올리지 않고, timeline 항목을
+조사(survey) 단위로 하나씩 읽어 필요한 데이터만 남깁니다.
+메모리 사용량은 파일 크기가 아니라 남기는 데이터(지역 수)에 비례합니다.
+"""
+
+import json
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+class PollStream:
+    """polls JSON을 조사 단위로 순회하는 스트리밍 파서"""
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.meta = {}
+        self._decoder = json.JSONDecoder()
+        self._file = None
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    # ------------------------------------------------------------
+    # 버퍼 관리
+    # ------------------------------------------------------------
+
+    def _fill(self):
+        """청크를 하나 더 읽어 버퍼에 붙임 (소비한 앞부분은 버림)"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        """공백을 건너뛴 다음 문자 (소비하지 않음)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError(f"예상치 못한 파일 끝: {self.path}")
+
+    def _expect(self, ch):
+        if self._peek() != ch:
+            raise ValueError(f"JSON 형식 오류: '{ch}' 필요, '{self._buf[self._pos]}' 발견")
+        self._pos += 1
+
+    def _value(self):
+        """다음 JSON 값 하나를 디코딩 (버퍼가 모자라면 더 읽음)"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 숫자가 버퍼 끝에서 잘렸을 수 있으므로 경계에 닿으면 더 읽고 재시도
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _iter_array(self, handle):
+        """'[' ... ']' 배열의 각 원소를 handle로 처리"""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield from handle()
+            ch = self._peek()
+            self._pos += 1
+            if ch == ']':
+                return
+            if ch != ',':
+                raise ValueError(f"JSON 형식 오류: ',' 또는 ']' 필요, '{ch}' 발견")
+
+    def _iter_object(self):
+        """'{' ... '}' 객체의 키를 하나씩 반환 (값은 호출자가 소비)"""
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            yield key
+            ch = self._peek()
+            self._pos += 1
+            if ch == '}':
+                return
+            if ch != ',':
+                raise ValueError(f"JSON 형식 오류: ',' 또는 '}}' 필요, '{ch}' 발견")
+
+    # ------------------------------------------------------------
+    # 여론조사 구조 순회
+    # ------------------------------------------------------------
+
+    def _survey(self):
+        yield self._value()
+
+    def _entry(self):
+        """timeline 항목 하나: (date, survey)를 조사 단위로 반환"""
+        date = None
+        pending = []
+        for key in self._iter_object():
+            if key == 'date':
+                date = self._value()
+                # surveys가 date보다 먼저 나온 경우 보류분 처리
+                for survey in pending:
+                    yield date, survey
+                pending = []
+            elif key == 'surveys':
+                for survey in self._iter_array(self._survey):
+                    if date is None:
+                        pending.append(survey)
+                    else:
+                        yield date, survey
+            else:
+                self._value()
+
+    def surveys(self):
+        """(date, survey) 튜플을 파일 순서대로 반환 (meta는 self.meta에 저장)"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self._file = f
+            self._buf, self._pos, self._eof = '', 0, False
+            for key in self._iter_object():
+                if key == 'timeline':
+                    yield from self._iter_array(self._entry)
+                elif key == 'meta':
+                    self.meta = self._value()
+                else:
+                    self._value()
+            self._file = None
+            self._buf = ''
+
+
+def load_latest(path, as_of=None):
+    """지역별 최신 조사만 남겨 polls 형식 딕셔너리로 반환
+
+    as_of를 지정하면 해당 일자 이전(당일 포함) 조사 중 최신만 남깁니다.
+    반환값은 load_data()의 polls와 같은 구조이므로 create_map에 그대로 넘길 수 있습니다.
+    """
+    stream = PollStream(path)
+    latest = {}
+    for date, survey in stream.surveys():
+        if as_of is not None and date > as_of:
+            continue
+        region_code = survey['regionCode']
+        if region_code not in latest or date > latest[region_code][0]:
+            latest[region_code] = (date, survey)
+
+    by_date = {}
+    for date, survey in latest.values():
+        by_date.setdefault(date, []).append(survey)
+
+    return {
+        'meta': stream.meta,
+        'timeline': [
+            {'date': date, 'surveys': by_date[date]}
+            for date in sorted(by_date)
+        ]
+    }
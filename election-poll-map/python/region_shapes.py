@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+단계구분도(choropleth)용 행정구역 경계 단순화/캐시
+원본 경계 GeoJSON을 정수 격자로 양자화하고, 이웃 지역이 공유하는 경계를
+하나의 호(arc)로 묶은 뒤 호 단위로 Douglas–Peucker 단순화를 합니다.
+공유 경계는 한 번만 단순화되므로 줌 단계를 낮춰도 지역 사이에 틈이나 겹침이 생기지 않습니다.
+결과는 줌 단계별로 TopoJSON(양자화 + 델타 인코딩)으로 저장하고 지역 code로 조회합니다.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+
+# 양자화 격자 크기 (TopoJSON transform과 동일한 방식)
+QUANTIZATION = 100000
+
+# 줌 단계별 (최소 줌, 단순화 허용 오차 m)
+ZOOM_TIERS = {
+    'low': (0, 2000),
+    'mid': (8, 500),
+    'high': (10, 100),
+}
+
+# 원본 GeoJSON에서 지역 코드를 찾을 속성 이름 (앞쪽 우선)
+CODE_PROPERTIES = ('code', 'regionCode', 'CTPRVN_CD', 'SIG_CD', 'adm_cd')
+
+METERS_PER_DEGREE = 111320.0
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _feature_code(feature, code_property=None):
+    props = feature.get('properties') or {}
+    for key in ((code_property,) if code_property else CODE_PROPERTIES):
+        if props.get(key) is not None:
+            return str(props[key])
+    return None
+
+
+def _polygons(geometry):
+    """Polygon/MultiPolygon을 [폴리곤[링[좌표]]] 형태로 통일"""
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+# ------------------------------------------------------------
+# 위상(토폴로지) 구성: 양자화 → 분기점 탐색 → 호 분할/중복 제거
+# ------------------------------------------------------------
+
+def build_topology(features, code_property=None):
+    """경계 피처 목록을 양자화된 호(arc)와 지역별 호 참조로 변환"""
+    shapes = []
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+    for fi, feature in enumerate(features):
+        code = _feature_code(feature, code_property)
+        if code is None or not feature.get('geometry'):
+            continue
+        polygons = _polygons(feature['geometry'])
+        for polygon in polygons:
+            for ring in polygon:
+                for x, y in (pt[:2] for pt in ring):
+                    min_x, max_x = min(min_x, x), max(max_x, x)
+                    min_y, max_y = min(min_y, y), max(max_y, y)
+        shapes.append((code, fi, polygons))
+
+    if not shapes:
+        raise ValueError("지역 코드가 있는 Polygon/MultiPolygon 피처가 없습니다")
+
+    scale = (
+        (max_x - min_x) / (QUANTIZATION - 1) or 1.0,
+        (max_y - min_y) / (QUANTIZATION - 1) or 1.0,
+    )
+    translate = (min_x, min_y)
+
+    # 링 양자화 (연속 중복점 제거, 닫힘점 제외)
+    rings = []
+    for code, fi, polygons in shapes:
+        for pi, polygon in enumerate(polygons):
+            for ring in polygon:
+                q = []
+                for pt in ring:
+                    p = (round((pt[0] - translate[0]) / scale[0]),
+                         round((pt[1] - translate[1]) / scale[1]))
+                    if not q or q[-1] != p:
+                        q.append(p)
+                if len(q) > 1 and q[0] == q[-1]:
+                    q.pop()
+                if len(q) >= 3:
+                    rings.append((code, (fi, pi), q))
+
+    # 점마다 이웃 점 쌍 - 링마다 이웃이 다르게 나타나는 점이 공유 경계의 분기점
+    neighbors = {}
+    for _, _, ring in rings:
+        n = len(ring)
+        for i, p in enumerate(ring):
+            neighbors.setdefault(p, set()).add(frozenset((ring[i - 1], ring[(i + 1) % n])))
+
+    arcs = []
+    arc_index = {}
+    regions = {}
+    for code, poly_key, ring in rings:
+        n = len(ring)
+        junctions = [i for i in range(n) if len(neighbors[ring[i]]) > 1]
+        if not junctions:
+            # 분기점이 없는 링(섬, 전체 공유 링)은 가장 작은 점에서 시작해 기준을 통일
+            junctions = [min(range(n), key=lambda i: ring[i])]
+
+        refs = []
+        for k, start in enumerate(junctions):
+            end = junctions[(k + 1) % len(junctions)]
+            if end <= start:
+                end += n
+            path = tuple(ring[i % n] for i in range(start, end + 1))
+            if path in arc_index:
+                refs.append(arc_index[path])
+            elif path[::-1] in arc_index:
+                refs.append(~arc_index[path[::-1]])
+            else:
+                arc_index[path] = len(arcs)
+                refs.append(len(arcs))
+                arcs.append(list(path))
+
+        regions.setdefault(code, {}).setdefault(poly_key, []).append(refs)
+
+    return {
+        'scale': scale,
+        'translate': translate,
+        'arcs': arcs,
+        # code -> [폴리곤[링[호 참조]]]
+        'regions': {code: [rings_ for _, rings_ in sorted(polys.items())]
+                    for code, polys in regions.items()}
+    }
+
+
+# ------------------------------------------------------------
+# 단순화
+# ------------------------------------------------------------
+
+def douglas_peucker(points, tolerance, to_meters):
+    """Douglas–Peucker 단순화 (양 끝점 유지, 반복 스택 방식)"""
+    if len(points) <= 2:
+        return list(points)
+
+    xy = [to_meters(p) for p in points]
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = xy[first]
+        bx, by = xy[last]
+        dx, dy = bx - ax, by - ay
+        seg_len2 = dx * dx + dy * dy
+        max_dist, index = -1.0, first
+        for i in range(first + 1, last):
+            px, py = xy[i]
+            if seg_len2 == 0:
+                dist = math.hypot(px - ax, py - ay)
+            else:
+                dist = abs(dy * px - dx * py + bx * ay - by * ax) / math.sqrt(seg_len2)
+            if dist > max_dist:
+                max_dist, index = dist, i
+        if max_dist > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def simplify_topology(topology, tolerance_m):
+    """호 단위 단순화 후 TopoJSON 딕셔너리 반환 (좌표는 델타 인코딩)"""
+    sx, sy = topology['scale']
+    tx, ty = topology['translate']
+    lat0 = ty + sy * QUANTIZATION / 2
+    kx = METERS_PER_DEGREE * math.cos(math.radians(lat0)) * sx
+    ky = METERS_PER_DEGREE * sy
+
+    def to_meters(p):
+        return p[0] * kx, p[1] * ky
+
+    encoded = []
+    for arc in topology['arcs']:
+        simple = douglas_peucker(arc, tolerance_m, to_meters)
+        delta = [list(simple[0])]
+        for (x0, y0), (x1, y1) in zip(simple, simple[1:]):
+            delta.append([x1 - x0, y1 - y0])
+        encoded.append(delta)
+
+    geometries = [
+        {'type': 'MultiPolygon', 'arcs': polygons, 'properties': {'code': code}}
+        for code, polygons in topology['regions'].items()
+    ]
+    return {
+        'type': 'Topology',
+        'transform': {'scale': [sx, sy], 'translate': [tx, ty]},
+        'objects': {'regions': {'type': 'GeometryCollection', 'geometries': geometries}},
+        'arcs': encoded
+    }
+
+
+# ------------------------------------------------------------
+# 캐시
+# ------------------------------------------------------------
+
+class ShapeCache:
+    """줌 단계별 단순화 TopoJSON 디스크 캐시 (원본 해시가 바뀌면 다시 생성)"""
+
+    def __init__(self, boundary_file, cache_dir, code_property=None):
+        self.boundary_file = boundary_file
+        self.cache_dir = cache_dir
+        self.code_property = code_property
+        self.report = []
+        self._source = None
+        self._topology = None
+        self._stat = None
+
+    def _tier_path(self, tier):
+        return os.path.join(self.cache_dir, f'shapes_{tier}.topo.json')
+
+    def _source_digest(self):
+        # 같은 인스턴스를 재사용하는 --watch에서 경계 파일이 바뀌면 해시/토폴로지를 다시 계산
+        st = os.stat(self.boundary_file)
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat != self._stat:
+            self._stat = stat
+            self._source = None
+            self._topology = None
+        if self._source is None:
+            self._source = _file_digest(self.boundary_file)
+        return self._source
+
+    def _build_topology(self):
+        if self._topology is None:
+            with open(self.boundary_file, 'r', encoding='utf-8') as f:
+                features = json.load(f).get('features', [])
+            self._topology = build_topology(features, self.code_property)
+        return self._topology
+
+    def tier(self, tier):
+        """줌 단계 TopoJSON (캐시 적중 시 파일만 읽음)"""
+        path = self._tier_path(tier)
+        tolerance = ZOOM_TIERS[tier][1]
+        source = self._source_digest()
+
+        start = time.perf_counter()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                topo = json.load(f)
+            if topo.get('source') == source and topo.get('tolerance') == tolerance:
+                self._record(tier, topo, path, time.perf_counter() - start, cached=True)
+                return topo
+
+        topology = self._build_topology()
+        topo = simplify_topology(topology, tolerance)
+        topo['source'] = source
+        topo['tolerance'] = tolerance
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(topo, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        self._record(tier, topo, path, time.perf_counter() - start, cached=False)
+        return topo
+
+    def _record(self, tier, topo, path, seconds, cached):
+        raw = sum(len(arc) for arc in self._topology['arcs']) if self._topology else None
+        self.report.append({
+            'tier': tier,
+            'tolerance_m': ZOOM_TIERS[tier][1],
+            'vertices': sum(len(arc) for arc in topo['arcs']),
+            'source_vertices': raw,
+            'bytes': os.path.getsize(path),
+            'seconds': seconds,
+            'cached': cached
+        })
+
+    def record_render(self, tier, size, seconds, asset=None):
+        """지도에 넣은 단계별 크기/소요 시간 기록 (asset: 따로 내보낸 파일명, 이때 size는 파일 크기)"""
+        for entry in self.report:
+            if entry['tier'] == tier:
+                entry['render_bytes'] = size
+                entry['render_seconds'] = seconds
+                entry['asset'] = asset
+
+    def topologies(self):
+        """줌 단계 -> (최소 줌, 페이지에 싣는 TopoJSON - 캐시용 source/tolerance 제외)"""
+        self.report = []
+        result = {}
+        for tier, (min_zoom, _) in ZOOM_TIERS.items():
+            topo = self.tier(tier)
+            result[tier] = (min_zoom, {k: v for k, v in topo.items() if k not in ('source', 'tolerance')})
+        return result
+
+    @staticmethod
+    def publish(tier, topo, asset_dir):
+        """단계 TopoJSON을 내용 해시 파일명으로 asset_dir에 저장 (이미 있으면 그대로), 파일명 반환"""
+        content = json.dumps(topo, ensure_ascii=False, separators=(',', ':'))
+        name = f"shapes_{tier}.{hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]}.topo.json"
+        path = os.path.join(asset_dir, name)
+        if not os.path.exists(path):
+            os.makedirs(asset_dir, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return name
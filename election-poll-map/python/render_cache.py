@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+증분 지도 생성을 위한 렌더링 캐시
+지역별 최신 조사의 해시(fingerprint)와 렌더링된 마커 조각(팝업 HTML, 마커 스타일)을
+디스크에 저장해 두고, 다음 실행에서는 해시가 바뀐 지역만 다시 렌더링합니다.
+"""
+
+import hashlib
+import json
+import os
+
+# 팝업/마커 렌더링 방식이 바뀌면 올려서 기존 캐시를 무효화
+RENDER_VERSION = 2
+
+
+def _digest(obj):
+    payload = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def region_fingerprint(region, survey_data, trend=None):
+    """지역 좌표/이름과 최신 조사 내용(이동 평균 요약 포함)으로 만든 해시"""
+    return _digest({
+        'v': RENDER_VERSION,
+        'region': region,
+        'date': survey_data['date'] if survey_data else None,
+        'candidates': survey_data['candidates'] if survey_data else None,
+        'trend': trend
+    })
+
+
+def page_fingerprint(region_fingerprints, meta, options=None):
+    """전체 페이지 해시 (지역 해시 + 범례에 들어가는 메타 + 생성 옵션)"""
+    return _digest({
+        'v': RENDER_VERSION,
+        'regions': region_fingerprints,
+        'meta': meta,
+        'options': options or {}
+    })
+
+
+class RenderCache:
+    """지역별 마커 조각 디스크 캐시 (JSON 매니페스트 하나)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.page = None
+        self.regions = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get('version') == RENDER_VERSION:
+                self.page = data.get('page')
+                self.regions = data.get('regions', {})
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, region_code, fingerprint):
+        """(적중 여부, 조각) 반환 - 조각이 None인 경우도 캐시됨"""
+        cached = self.regions.get(region_code)
+        if cached and cached['fingerprint'] == fingerprint:
+            self.hits += 1
+            return True, cached['fragment']
+        self.misses += 1
+        return False, None
+
+    def store(self, region_code, fingerprint, fragment):
+        self.regions[region_code] = {'fingerprint': fingerprint, 'fragment': fragment}
+        self._dirty = True
+
+    def is_current(self, page_fp, output_file):
+        """페이지 해시가 같고 출력 파일이 남아 있으면 재생성 불필요"""
+        return self.page == page_fp and os.path.exists(output_file)
+
+    def mark_page(self, page_fp):
+        if self.page != page_fp:
+            self.page = page_fp
+            self._dirty = True
+
+    def save(self):
+        """변경이 있을 때만 원자적으로 저장"""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': RENDER_VERSION,
+                'page': self.page,
+                'regions': self.regions
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+공유 정적 자산 출력 모드
+스타일, 팝업 템플릿, 정당 색상(PARTY_COLORS)을 담은 CSS/JS 번들을 한 번만 쓰고,
+각 지도 HTML에는 압축된 여론조사 데이터(JSON)만 넣습니다.
+번들 파일명에 내용 해시를 붙여 CDN/브라우저가 장기 캐시할 수 있게 합니다.
+"""
+
+import hashlib
+import json
+import os
+
+LEAFLET_VERSION = '1.9.4'
+
+ASSET_CSS = """\
+html, body { width: 100%; height: 100%; margin: 0; padding: 0; }
+#map { position: absolute; top: 0; bottom: 0; right: 0; left: 0; }
+.em-panel { position: fixed; background-color: white; z-index: 9999;
+            border-radius: 5px; font-family: 'Malgun Gothic', sans-serif; }
+.em-legend { bottom: 50px; right: 10px; width: 280px; border: 2px solid grey;
+             font-size: 14px; padding: 10px; }
+.em-legend h4 { margin: 0 0 10px 0; padding-bottom: 5px; border-bottom: 1px solid #ddd; }
+.em-legend .em-item { margin-bottom: 8px; }
+.em-legend .em-dot { display: inline-block; width: 12px; height: 12px;
+                     border-radius: 50%; margin-right: 5px; }
+.em-legend hr { margin: 8px 0; border: none; border-top: 1px solid #ddd; }
+.em-legend .em-note { font-size: 12px; color: #666; }
+.em-title { top: 10px; left: 50px; border: 2px solid grey; font-size: 18px;
+            padding: 15px; font-weight: bold; }
+.em-info { top: 70px; right: 10px; width: 280px; border: 1px solid #ddd;
+           font-size: 12px; padding: 10px; }
+.em-popup { font-family: 'Malgun Gothic', sans-serif; width: 280px; }
+.em-popup h3 { margin: 5px 0; color: #333; }
+.em-popup hr { margin: 5px 0; }
+.em-popup table { width: 100%; border-collapse: collapse; font-size: 12px; }
+.em-popup td { padding: 3px; }
+.em-popup td.em-r { text-align: right; }
+.em-popup tr.em-head { background: #f5f5f5; }
+"""
+
+# {{PARTY_COLORS}}는 번들 작성 시 치환
+ASSET_JS = """\
+(function () {
+  'use strict';
+  var PARTY_COLORS = {{PARTY_COLORS}};
+  var DEFAULT_COLOR = '#999';
+
+  function esc(s) {
+    return String(s).replace(/[&<>"']/g, function (c) {
+      return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+    });
+  }
+
+  function colorOf(party) {
+    return PARTY_COLORS[party] || DEFAULT_COLOR;
+  }
+
+  // 압축 데이터: region = [이름, 위도, 경도, 조사일, [[후보, 정당 인덱스, 지지율], ...]]
+  function popupHtml(region, parties) {
+    var rows = region[4].slice().sort(function (a, b) { return b[2] - a[2]; });
+    var html = '<div class="em-popup"><h3>' + esc(region[0]) + '</h3><hr>' +
+      '<table><tr class="em-head"><td><strong>조사일</strong></td>' +
+      '<td class="em-r">' + esc(region[3]) + '</td></tr>';
+    rows.forEach(function (c) {
+      var party = parties[c[1]];
+      html += '<tr><td>' + esc(c[0]) + ' (' + esc(party) + ')</td>' +
+        '<td class="em-r"><strong style="color:' + colorOf(party) + ';">' + c[2] + '%</strong></td></tr>';
+    });
+    return html + '</table></div>';
+  }
+
+  function panel(cls, html) {
+    var div = document.createElement('div');
+    div.className = 'em-panel ' + cls;
+    div.innerHTML = html;
+    document.body.appendChild(div);
+  }
+
+  function legendHtml(lastUpdate) {
+    var items = [['민주당', '민주당 우위 지역'], ['국민의힘', '국민의힘 우위 지역'], ['기타', '기타 후보 우위']];
+    var html = '<h4>⚡ 범례</h4>';
+    items.forEach(function (it) {
+      html += '<div class="em-item"><span class="em-dot" style="background-color:' +
+        colorOf(it[0]) + ';"></span><strong>' + it[1] + '</strong></div>';
+    });
+    return html + '<hr><div class="em-note"><strong>마커 크기:</strong> 최고 지지율에 비례<br>' +
+      '<strong>마지막 업데이트:</strong> ' + esc(lastUpdate) + '</div>';
+  }
+
+  window.renderElectionMap = function (data) {
+    var map = L.map('map', {center: [36.3, 127.8], zoom: 7});
+    L.tileLayer('https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}{r}.png', {
+      attribution: '&copy; OpenStreetMap contributors &copy; CARTO',
+      subdomains: 'abcd', maxZoom: 20
+    }).addTo(map);
+
+    var overlays = {};
+    data.r.forEach(function (region) {
+      var lead = region[4].reduce(function (a, b) { return b[2] > a[2] ? b : a; });
+      var color = colorOf(data.p[lead[1]]);
+      var group = L.featureGroup().addTo(map);
+      L.circleMarker([region[1], region[2]], {
+        radius: Math.max(10, lead[2] / 2), color: color, fill: true, fillColor: color,
+        fillOpacity: 0.7, weight: 2, opacity: 1.0
+      }).bindPopup(function () { return popupHtml(region, data.p); }, {maxWidth: 300})
+        .addTo(group);
+      overlays['📍 ' + region[0]] = group;
+    });
+    L.control.layers(null, overlays, {position: 'topright', collapsed: false}).addTo(map);
+
+    panel('em-legend', legendHtml(data.u));
+    panel('em-title', '📊 2026 지방선거 여론조사 시각화');
+    panel('em-info', '<strong>사용 방법:</strong><br>1. 왼쪽 목록에서 지역을 선택합니다<br>' +
+      '2. 지도의 마커를 클릭하면 상세 정보를 봅니다<br>3. 차트 섹션에서 시계열 데이터를 확인합니다');
+  };
+})();
+"""
+
+PAGE_TEMPLATE = """\
+<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@{leaflet}/dist/leaflet.css">
+<link rel="stylesheet" href="{css}">
+<script src="https://cdn.jsdelivr.net/npm/leaflet@{leaflet}/dist/leaflet.js"></script>
+<script src="{js}"></script>
+</head><body><div id="map"></div>
+<script type="application/json" id="poll-data">{data}</script>
+<script>renderElectionMap(JSON.parse(document.getElementById('poll-data').textContent));</script>
+</body></html>
+"""
+
+
+def _hashed_name(stem, ext, content):
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:10]
+    return f'{stem}.{digest}.{ext}'
+
+
+def write_assets(asset_dir, party_colors):
+    """CSS/JS 번들 작성 (내용이 같으면 다시 쓰지 않음), 파일명 딕셔너리 반환"""
+    os.makedirs(asset_dir, exist_ok=True)
+    js = ASSET_JS.replace(
+        '{{PARTY_COLORS}}', json.dumps(party_colors, ensure_ascii=False)
+    )
+    names = {}
+    for key, stem, ext, content in (('css', 'election-map', 'css', ASSET_CSS),
+                                    ('js', 'election-map', 'js', js)):
+        name = _hashed_name(stem, ext, content)
+        path = os.path.join(asset_dir, name)
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        names[key] = name
+    return names
+
+
+def compact_data(regions, latest_surveys, last_update):
+    """지도 한 장에 필요한 최소 데이터 (정당명은 인덱스로 치환)"""
+    parties = []
+    party_index = {}
+    rows = []
+    for region in regions['provinces']:
+        survey_data = latest_surveys.get(region['code'])
+        if not survey_data or not survey_data['candidates']:
+            continue
+        cands = []
+        for cand in survey_data['candidates']:
+            if cand['party'] not in party_index:
+                party_index[cand['party']] = len(parties)
+                parties.append(cand['party'])
+            cands.append([cand['name'], party_index[cand['party']], cand['rate']])
+        rows.append([region['name'], region['lat'], region['lng'], survey_data['date'], cands])
+    return {'u': last_update, 'p': parties, 'r': rows}
+
+
+def render_page(regions, latest_surveys, last_update, asset_names, asset_url):
+    """공유 자산을 참조하는 압축 지도 HTML 생성"""
+    data = json.dumps(
+        compact_data(regions, latest_surveys, last_update),
+        ensure_ascii=False, separators=(',', ':')
+    ).replace('</', '<\\/')
+    return PAGE_TEMPLATE.format(
+        leaflet=LEAFLET_VERSION,
+        css=f"{asset_url}/{asset_names['css']}",
+        js=f"{asset_url}/{asset_names['js']}",
+        data=data
+    )
@@ -10,6 +10,14 @@ const DataManager = (() => {
         us: 'data/us-stocks.json',
         crypto: 'data/crypto-list.json'
     };
+    // 변경분 발행 폴더 (python/collect_korean_stocks.py --delta)
+    const DELTA_DIRS = {
+        korean: 'data/korean',
+        us: 'data/us',
+        crypto: 'data/crypto'
+    };
+    // 시장별 { version, doc } (manifest가 없으면 false로 기록해 다시 묻지 않음)
+    const deltaState = {};
 
     /**
      * 캐시 키 생성
@@ -79,7 +87,72 @@ const DataManager = (() => {
     };
 
     /**
-     * JSON 파일에서 데이터 로드
+     * 패치 적용 (python/delta_publish.py apply_patch와 같은 규칙)
+     * 기존 종목은 바뀐 필드만 덮어쓰고, 새 종목은 끝에 추가
+     */
+    const applyPatch = (doc, patch, listKey) => {
+        const removed = new Set(patch.remove || []);
+        const records = (doc[listKey] || [])
+            .filter(item => !removed.has(item.id))
+            .map(item => ({ ...item }));
+        const index = new Map(records.map(item => [item.id, item]));
+        for (const change of patch.upsert || []) {
+            const item = index.get(change.id);
+            if (item) {
+                Object.assign(item, change);
+            } else {
+                const added = { ...change };
+                records.push(added);
+                index.set(added.id, added);
+            }
+        }
+        return { ...doc, ...(patch.meta || {}), [listKey]: records };
+    };
+
+    const fetchJSON = async (path, options) => {
+        const response = await fetch(path, options);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+        return response.json();
+    };
+
+    /**
+     * 변경분 발행 데이터 로드: manifest를 읽고 내 버전 이후 패치만 받음
+     * (처음이거나 내 버전이 현재 스냅샷보다 오래됐으면 스냅샷부터)
+     */
+    const loadFromDelta = async (market) => {
+        const dir = DELTA_DIRS[market];
+        if (!dir || deltaState[market] === false) return null;
+
+        const response = await fetch(`${dir}/manifest.json`, { cache: 'no-cache' });
+        if (!response.ok) {
+            deltaState[market] = false;
+            return null;
+        }
+        const manifest = await response.json();
+
+        let state = deltaState[market];
+        if (state && state.version === manifest.version) {
+            return state.doc;
+        }
+        if (!state || state.version < manifest.snapshot.version || state.version > manifest.version) {
+            const doc = await fetchJSON(`${dir}/${manifest.snapshot.file}`);
+            state = { version: manifest.snapshot.version, doc };
+        }
+
+        const pending = manifest.patches.filter(entry => entry.version > state.version);
+        const patches = await Promise.all(pending.map(entry => fetchJSON(`${dir}/${entry.file}`)));
+        for (const patch of patches) {
+            state = { version: patch.version, doc: applyPatch(state.doc, patch, manifest.listKey) };
+        }
+
+        deltaState[market] = state;
+        return state.doc;
+    };
+
+    /**
+     * JSON 파일에서 데이터 로드 (변경분 발행 데이터가 있으면 우선)
      */
     const loadFromJSON = async (market) => {
         const path = DATA_PATHS[market];
@@ -88,6 +161,14 @@ const DataManager = (() => {
         }
 
         try {
+            const delta = await loadFromDelta(market).catch(error => {
+                console.error(`변경분 로드 실패 (${market}):`, error);
+                return null;
+            });
+            if (delta) {
+                return normalizeData(market, delta);
+            }
+
             const response = await fetch(path);
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
@@ -140,7 +221,8 @@ const DataManager = (() => {
                         data = await loadFromJSON(market);
                     }
                 } else {
-                    throw new Error(`알 수 없는 시장: ${market}`);\n                }
+                    throw new Error(`알 수 없는 시장: ${market}`);
+                }
 
                 // 캐시에 저장
                 if (data && data.length > 0) {
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+비동기 시세 수집 프레임워크 (asyncio, 표준 라이브러리만 사용)
+- HTTPClient: asyncio 스트림 위의 최소 HTTP/1.1 GET 클라이언트, 호스트별 keep-alive 연결 재사용
+- SourceAdapter: 수집 소스 어댑터 (종목 목록 → 요청 단위 → 응답 파싱 → 대시보드 JSON 스키마)
+- plan_batches: 묶음 조회 API용 종목 나누기 (URL 길이, 요청당 종목 수 상한, 동시 요청 수 고려)
+- Collector: 소스별 동시 요청 수 제한 + 전체 마감 시간 (마감되면 그때까지 모은 종목만 사용)
+"""
+
+import asyncio
+import gzip
+import json
+import math
+import ssl
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote_plus, urlencode, urlsplit
+
+
+def build_url(url: str, params: Optional[Dict] = None) -> str:
+    """
+    URL + 쿼리 파라미터 (쉼표는 인코딩하지 않음, HTTPClient가 보내는 것과 같은 문자열)
+    """
+    query = urlencode(params or {}, safe=",")
+    if not query:
+        return url
+    return url + ("&" if urlsplit(url).query else "?") + query
+
+
+def plan_batches(symbols: List[str], max_batch: int, budget: int,
+                 parallel: int = 1) -> List[List[str]]:
+    """
+    종목 목록을 요청 단위로 나누기
+    - 한 묶음은 max_batch개 이하, 쉼표로 이은 인코딩 길이가 budget(URL에 남은 글자 수) 이하
+    - 묶음 수가 parallel보다 적으면 동시 요청 슬롯이 놀므로 크기를 줄여 parallel개 이상으로 균등 분할
+    """
+    if not symbols:
+        return []
+    size = min(max_batch, max(1, math.ceil(len(symbols) / max(1, parallel))))
+    # 같은 개수라도 길이 상한에 먼저 걸리면 거기서 자름
+    batches, current, length = [], [], 0
+    for symbol in symbols:
+        n = len(quote_plus(symbol, safe=","))
+        extra = n + (1 if current else 0)
+        if current and (len(current) >= size or length + extra > budget):
+            batches.append(current)
+            current, length, extra = [], 0, n
+        current.append(symbol)
+        length += extra
+    batches.append(current)
+    return batches
+
+
+class HTTPError(Exception):
+    """
+    2xx가 아닌 응답
+    """
+
+    def __init__(self, status: int, url: str, headers: Optional[Dict] = None):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+        self.url = url
+        self.headers = headers or {}
+
+
+# 요청 하나의 실패로 보고 그 단위만 실패로 세는 예외
+# (응답이 중간에 끊기면 IncompleteReadError(EOFError), 헤더가 너무 길면 LimitOverrunError,
+#  압축이 깨지면 zlib.error)
+FETCH_ERRORS = (HTTPError, OSError, EOFError, asyncio.TimeoutError, asyncio.LimitOverrunError,
+                ValueError, zlib.error)
+
+
+class Response:
+    def __init__(self, status: int, headers: Dict, body: bytes, url: str):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+    def raise_for_status(self):
+        if not 200 <= self.status < 300:
+            raise HTTPError(self.status, self.url, self.headers)
+
+
+class HTTPClient:
+    """
+    호스트별 keep-alive 연결 풀
+    응답을 다 읽은 연결은 유휴 목록에 돌려놓고 다음 요청에서 재사용
+    (동시 연결 수는 소스별 concurrency가 제한)
+    """
+
+    def __init__(self, timeout: float = 10.0, max_idle_per_host: int = 100,
+                 user_agent: str = "financial-dashboard-collector/1.0"):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.user_agent = user_agent
+        self.opened = 0
+        self.requests = 0
+        self._idle: Dict[Tuple[str, str, int], List] = {}
+        self._ssl: Optional[ssl.SSLContext] = None
+
+    async def _connect(self, key: Tuple[str, str, int]):
+        scheme, host, port = key
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        reader, writer = await asyncio.open_connection(host, port, ssl=context)
+        self.opened += 1
+        return reader, writer
+
+    def _release(self, key, reader, writer):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.max_idle_per_host and not writer.is_closing():
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def get(self, url: str, params: Optional[Dict] = None,
+                  headers: Optional[Dict] = None) -> Response:
+        """
+        GET 요청 (유휴 연결이 서버에서 닫혀 있었으면 새 연결로 한 번 더 시도)
+        """
+        parts = urlsplit(build_url(url, params))
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        lines = [f"GET {target} HTTP/1.1", f"Host: {parts.netloc}", "Connection: keep-alive",
+                 "Accept: application/json", "Accept-Encoding: gzip, deflate",
+                 f"User-Agent: {self.user_agent}"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        self.requests += 1
+
+        for attempt in range(2):
+            idle = self._idle.get(key)
+            reused = bool(idle)
+            reader, writer = (idle.pop() if reused
+                              else await asyncio.wait_for(self._connect(key), self.timeout))
+            try:
+                writer.write(request)
+                status, response_headers, body, keep = await asyncio.wait_for(
+                    self._read_response(reader), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                # 시간 초과/취소: 응답 중간이므로 연결을 재사용하지 않음
+                writer.close()
+                raise
+            if keep:
+                self._release(key, reader, writer)
+            else:
+                writer.close()
+            return Response(status, response_headers, body, url)
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        version, status = lines[0].split(" ", 2)[:2]
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        keep = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readuntil(b"\r\n")
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep = False
+
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+        return int(status), headers, body, keep
+
+    async def close(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+
+class SourceAdapter:
+    """
+    수집 소스 어댑터
+    하위 클래스에서 fetch_universe / request / parse / mock 구현
+    base_url이 없으면 mock() 데이터를 그대로 사용
+    """
+
+    name = "source"          # 결과 키
+    market = ""
+    currency = ""
+    list_key = "stocks"      # 대시보드 JSON의 목록 키 (stocks / cryptos)
+    concurrency = 8          # 이 소스의 동시 요청 수
+    max_batch = 1            # 요청당 종목 수 상한 (1이면 종목마다 요청)
+    max_url_length = 2000    # 묶음 요청 URL 길이 상한
+
+    def __init__(self, base_url: Optional[str] = None, symbols: Optional[List[str]] = None,
+                 concurrency: Optional[int] = None, max_batch: Optional[int] = None):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.symbols = symbols
+        if concurrency is not None:
+            self.concurrency = concurrency
+        if max_batch is not None:
+            self.max_batch = max_batch
+
+    async def universe(self, client: HTTPClient) -> List[str]:
+        """
+        수집할 종목 코드 (지정하지 않았으면 소스에서 조회)
+        """
+        if self.symbols is not None:
+            return list(self.symbols)
+        return await self.fetch_universe(client)
+
+    async def fetch_universe(self, client: HTTPClient) -> List[str]:
+        raise NotImplementedError
+
+    def units(self, symbols: List[str]) -> List[List[str]]:
+        """
+        요청 단위로 나누기 (max_batch가 1이면 종목당 요청 하나)
+        """
+        if self.max_batch <= 1:
+            return [[symbol] for symbol in symbols]
+        # 종목 없이 만든 URL 길이를 빼고 남은 글자 수 안에서 묶음
+        budget = self.max_url_length - len(build_url(*self.request([])))
+        return plan_batches(symbols, self.max_batch, budget, self.concurrency)
+
+    def request(self, unit: List[str]) -> Tuple[str, Optional[Dict]]:
+        """
+        요청 단위 → (URL, 쿼리 파라미터)
+        """
+        raise NotImplementedError
+
+    def parse(self, unit: List[str], payload) -> List[Dict]:
+        """
+        응답 JSON → 대시보드 스키마 레코드 목록
+        """
+        raise NotImplementedError
+
+    def mock(self) -> Dict:
+        raise NotImplementedError
+
+    def build(self, records: List[Dict]) -> Dict:
+        return {
+            "lastUpdate": datetime.now().isoformat() + "Z",
+            "market": self.market,
+            "currency": self.currency,
+            self.list_key: records,
+        }
+
+
+class Collector:
+    """
+    여러 소스를 한 이벤트 루프에서 동시에 수집
+    deadline(초)이 지나면 남은 요청을 취소하고 그때까지 받은 종목만 결과로 만듦
+    """
+
+    def __init__(self, sources: List[SourceAdapter], deadline: float = 60.0,
+                 client: Optional[HTTPClient] = None):
+        self.sources = sources
+        self.deadline = deadline
+        self.client = client or HTTPClient()
+        self.stats: Dict[str, Dict] = {}
+        self.elapsed = 0.0
+        self._order: Dict[str, Dict[str, int]] = {}
+
+    async def _collect(self, source: SourceAdapter, records: List[Dict]):
+        stats = self.stats[source.name]
+        start = time.perf_counter()
+        try:
+            if source.base_url is None:
+                records.extend(source.mock().get(source.list_key, []))
+                stats["symbols"] = len(records)
+                return
+
+            symbols = await source.universe(self.client)
+            stats["symbols"] = len(symbols)
+            self._order[source.name] = {symbol: i for i, symbol in enumerate(symbols)}
+            semaphore = asyncio.Semaphore(source.concurrency)
+
+            async def fetch(unit):
+                async with semaphore:
+                    url, params = source.request(unit)
+                    stats["requests"] += 1
+                    try:
+                        response = await self.client.get(url, params)
+                        response.raise_for_status()
+                        records.extend(source.parse(unit, response.json()))
+                    except FETCH_ERRORS as e:
+                        stats["failed"] += len(unit)
+                        stats["error"] = str(e) or type(e).__name__
+
+            # 예상 못 한 예외도 그 단위만 실패로 세고 나머지 요청은 끝까지 기다림
+            units = source.units(symbols)
+            outcomes = await asyncio.gather(*(fetch(unit) for unit in units), return_exceptions=True)
+            for unit, outcome in zip(units, outcomes):
+                if isinstance(outcome, Exception):
+                    stats["failed"] += len(unit)
+                    stats["error"] = str(outcome) or type(outcome).__name__
+        finally:
+            stats["elapsed"] = time.perf_counter() - start
+
+    async def run(self) -> Dict[str, Dict]:
+        """
+        {소스 이름: 대시보드 JSON (받은 종목이 없으면 {})}
+        """
+        start = time.perf_counter()
+        records = {source.name: [] for source in self.sources}
+        tasks = {}
+        for source in self.sources:
+            self.stats[source.name] = {"symbols": 0, "requests": 0, "failed": 0,
+                                       "elapsed": 0.0, "timed_out": False, "error": None}
+            tasks[asyncio.ensure_future(self._collect(source, records[source.name]))] = source
+
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            self.stats[tasks[task].name]["timed_out"] = True
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception() is not None:
+                self.stats[tasks[task].name]["error"] = str(task.exception())
+        self.elapsed = time.perf_counter() - start
+
+        results = {}
+        for source in self.sources:
+            # 응답 도착 순서가 아니라 종목 목록 순서로 합침
+            order = self._order.get(source.name)
+            if order:
+                records[source.name].sort(key=lambda r: order.get(r.get("id"), len(order)))
+            self.stats[source.name]["collected"] = len(records[source.name])
+            results[source.name] = source.build(records[source.name]) if records[source.name] else {}
+        return results
+
+    def print_report(self):
+        total = 0
+        for name, s in self.stats.items():
+            total += s["collected"]
+            rate = s["collected"] / s["elapsed"] if s["elapsed"] else 0.0
+            note = " (마감 시간 초과)" if s["timed_out"] else ""
+            if s["error"]:
+                note += f" - 마지막 오류: {s['error']}"
+            print(f"  {name:<8} {s['collected']:>6}/{s['symbols']:<6}종목  요청 {s['requests']:>5}  "
+                  f"실패 {s['failed']:>4}  {s['elapsed']:6.2f}초  {rate:8.0f}종목/초{note}")
+        rate = total / self.elapsed if self.elapsed else 0.0
+        print(f"  합계 {total}종목, {self.elapsed:.2f}초, {rate:.0f}종목/초 "
+              f"(HTTP 요청 {self.client.requests}회, 새 연결 {self.client.opened}개)")
+        limited = getattr(self.client, "stats", None)
+        if limited:
+            print(f"  재시도 {limited['retries']}회 (429 {limited['throttled']}회), "
+                  f"속도 제한 대기 {limited['waited']:.1f}초, 합친 요청 {limited['coalesced']}개")
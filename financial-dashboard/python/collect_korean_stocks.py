@@ -2,16 +2,63 @@
 """
 한국 주식 데이터 수집 스크립트
 네이버 금융, KRX 등에서 종목 정보를 수집하여 JSON으로 저장
+
+세 소스(한국/미국 주식, 크립토)를 asyncio로 동시에 수집 (async_collector.py)
+- 소스별 어댑터 + 동시 요청 수 제한, keep-alive 연결 재사용, 전체 마감 시간
+- 호스트별 토큰 버킷 + Retry-After를 따르는 지수 백오프 + 같은 요청 합치기 (rate_limit.py)
+- 일부 종목을 받지 못하면 이전 파일의 값으로 채워 저장 (빈 곳보다 조금 지난 값이 나음)
+- --delta: 전체 JSON 대신 data/<market>/에 스냅샷 + 바뀐 종목만 담은 패치 + manifest 발행 (delta_publish.py)
+- --history: 수집할 때마다 종목별 price/change/volume/high/low를 틱 저장소에 추가 (tick_store.py)
+- 주식 시세 API 주소(--url)가 없으면 Mock 데이터 사용
+
+사용법:
+    python collect_korean_stocks.py
+    python collect_korean_stocks.py --url http://127.0.0.1:8765 --deadline 30
+    python collect_korean_stocks.py --stub --symbols 3000 --latency 0.05   # 로컬 스텁 서버로 처리량 측정
+    python collect_korean_stocks.py --stub --stub-limit 200 --rate 180      # 429를 돌려주는 스텁
+    python collect_korean_stocks.py --stub --sweep 1 10 50 100 200 500       # 묶음 크기별 수집 시간
+    python collect_korean_stocks.py --delta --interval 60                   # 1분마다 변경분 발행
+    python collect_korean_stocks.py --interval 60 --history ../history      # 1분마다 틱 기록
 """
 
+import argparse
+import asyncio
+import contextlib
+import io
 import json
 import os
+import time
 from datetime import datetime
-from typing import List, Dict
-
-# 현재는 Mock 데이터를 사용하고 있으며,
-# 실제 크롤링이 필요한 경우 다음 라이브러리를 사용할 수 있습니다:
-# pip install requests beautifulsoup4 selenium
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import quote
+
+from async_collector import Collector, HTTPClient, SourceAdapter
+from delta_publish import DeltaPublisher, atomic_write
+from rate_limit import RateLimitedClient
+
+COINGECKO_URL = "https://api.coingecko.com"
+
+# 수집할 코인 id -> (이름, 심볼)
+CRYPTO_NAMES = {
+    "bitcoin": ("Bitcoin", "BTC"), "ethereum": ("Ethereum", "ETH"), "solana": ("Solana", "SOL"),
+    "ripple": ("XRP", "XRP"), "cardano": ("Cardano", "ADA"), "polkadot": ("Polkadot", "DOT"),
+    "dogecoin": ("Dogecoin", "DOGE"), "litecoin": ("Litecoin", "LTC"),
+    "polygon": ("Polygon", "MATIC"), "uniswap": ("Uniswap", "UNI"),
+    "chainlink": ("Chainlink", "LINK"), "bitcoin-cash": ("Bitcoin Cash", "BCH"),
+    "eos": ("EOS", "EOS"), "monero": ("Monero", "XMR"), "stellar": ("Stellar", "XLM"),
+}
+
+# 호스트별 (초당 요청 수, 버스트) - CoinGecko 무료 API는 분당 30회 안팎
+HOST_LIMITS = {
+    "api.coingecko.com": (0.5, 5),
+}
+
+# 소스 이름 -> 저장 파일
+OUTPUT_FILES = {
+    "korean": "korean-stocks.json",
+    "us": "us-stocks.json",
+    "crypto": "crypto-list.json",
+}
 
 
 def get_mock_korean_stocks() -> Dict:
@@ -53,32 +100,11 @@ def get_mock_korean_stocks() -> Dict:
     }
 
 
-def collect_korean_stocks() -> Dict:
+def get_mock_us_stocks() -> Dict:
     """
-    한국 주식 데이터 수집
+    Mock 미국 주식 데이터 반환
     """
-    print("한국 주식 데이터 수집 중...")
-
-    # 현재는 Mock 데이터 사용
-    # 실제 구현 시 다음과 같이 수정:
-    # 1. requests를 이용한 API 호출
-    # 2. BeautifulSoup를 이용한 웹 스크래핑
-    # 3. Selenium을 이용한 동적 콘텐츠 수집
-
-    data = get_mock_korean_stocks()
-
-    print(f"수집 완료: {len(data['stocks'])}개 종목")
-    return data
-
-
-def collect_us_stocks() -> Dict:
-    """
-    미국 주식 데이터 수집
-    실제 구현 시 Yahoo Finance API 또는 Alpha Vantage 사용
-    """
-    print("미국 주식 데이터 수집 중...")
-
-    data = {
+    return {
         "lastUpdate": datetime.now().isoformat() + "Z",
         "market": "us",
         "currency": "USD",
@@ -99,71 +125,65 @@ def collect_us_stocks() -> Dict:
         ]
     }
 
-    print(f"수집 완료: {len(data['stocks'])}개 종목")
-    return data
 
-
-def collect_crypto() -> Dict:
+def get_mock_crypto() -> Dict:
     """
-    크립토 데이터 수집
-    CoinGecko API를 이용한 무료 수집
+    Mock 크립토 데이터 반환
     """
-    print("크립토 데이터 수집 중...")
+    return {
+        "lastUpdate": datetime.now().isoformat() + "Z",
+        "market": "crypto",
+        "currency": "USD",
+        "cryptos": [
+            {
+                "id": "bitcoin",
+                "name": "Bitcoin",
+                "symbol": "BTC",
+                "price": 98425.50,
+                "change": 2.45,
+                "volume24h": 45200000000,
+                "marketCap": 1950000000000,
+                "high": 99850.00,
+                "low": 96200.00
+            },
+            # ... 추가 종목들
+        ]
+    }
 
-    try:
-        import requests
 
-        # CoinGecko API 사용 (인증 불필요, 무료)
-        url = "https://api.coingecko.com/api/v3/simple/price"
-        params = {
-            "ids": "bitcoin,ethereum,solana,ripple,cardano,polkadot,dogecoin,litecoin,polygon,uniswap,chainlink,bitcoin-cash,eos,monero,stellar",
-            "vs_currencies": "usd",
-            "include_market_cap": "true",
-            "include_24hr_vol": "true",
-            "include_24hr_change": "true"
-        }
+def load_json(filepath: str) -> Optional[Dict]:
+    """
+    이전에 저장한 JSON (없거나 깨졌으면 None)
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
 
-        print("크립토 데이터 수집 완료 (CoinGecko API)")
-        return response.json()
+def fill_from_previous(data: Dict, previous: Optional[Dict], list_key: str) -> int:
+    """
+    이번에 받지 못한 종목을 이전 데이터의 값으로 채움 (채운 종목 수 반환)
+    """
+    if not previous:
+        return 0
 
-    except ImportError:
-        print("requests 라이브러리가 없습니다. Mock 데이터 사용")
-        return {
-            "lastUpdate": datetime.now().isoformat() + "Z",
-            "market": "crypto",
-            "currency": "USD",
-            "cryptos": [
-                {
-                    "id": "bitcoin",
-                    "name": "Bitcoin",
-                    "symbol": "BTC",
-                    "price": 98425.50,
-                    "change": 2.45,
-                    "volume24h": 45200000000,
-                    "marketCap": 1950000000000,
-                    "high": 99850.00,
-                    "low": 96200.00
-                },
-                # ... 추가 종목들
-            ]
-        }
-    except Exception as e:
-        print(f"크립토 데이터 수집 실패: {e}")
-        return {}
+    collected = {item["id"] for item in data[list_key]}
+    stale = [item for item in previous.get(list_key, []) if item.get("id") not in collected]
+    data[list_key].extend(stale)
+    return len(stale)
 
 
 def save_json(data: Dict, filepath: str) -> bool:
     """
-    JSON 파일로 저장
+    JSON 파일로 저장 (임시 파일에 쓴 뒤 이름 바꾸기)
     """
     try:
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        atomic_write(filepath, payload)
 
         print(f"저장 완료: {filepath}")
         return True
@@ -172,37 +192,276 @@ def save_json(data: Dict, filepath: str) -> bool:
         return False
 
 
+class QuoteSource(SourceAdapter):
+    """
+    /symbols/<market>, /quote/<market>/<symbol>, /quotes/<market>?symbols= 형식의 시세 API
+    (stub_server.py와 같은 형식, max_batch가 1보다 크면 묶음 조회)
+    실제 소스를 붙일 때는 request/parse만 바꾼 하위 클래스를 만들면 됨
+    """
+
+    concurrency = 32
+    max_batch = 100
+
+    async def fetch_universe(self, client: HTTPClient) -> List[str]:
+        response = await client.get(f"{self.base_url}/symbols/{self.market}")
+        response.raise_for_status()
+        return response.json()
+
+    def request(self, unit):
+        if self.max_batch <= 1:
+            return f"{self.base_url}/quote/{self.market}/{quote(unit[0])}", None
+        return f"{self.base_url}/quotes/{self.market}", {"symbols": ",".join(unit)}
+
+    def parse(self, unit, payload):
+        return payload if isinstance(payload, list) else [payload]
+
+
+class KoreanStockSource(QuoteSource):
+    name = "korean"
+    market = "korean"
+    currency = "KRW"
+
+    def mock(self):
+        return get_mock_korean_stocks()
+
+
+class USStockSource(QuoteSource):
+    name = "us"
+    market = "us"
+    currency = "USD"
+
+    def mock(self):
+        return get_mock_us_stocks()
+
+
+class CryptoSource(SourceAdapter):
+    """
+    CoinGecko simple/price (ids를 쉼표로 이어 묶음 요청, URL 길이 안에서 나눔)
+    """
+
+    name = "crypto"
+    market = "crypto"
+    currency = "USD"
+    list_key = "cryptos"
+    concurrency = 4
+    max_batch = 250
+
+    def __init__(self, base_url: Optional[str] = COINGECKO_URL, symbols: Optional[List[str]] = None,
+                 concurrency: Optional[int] = None, max_batch: Optional[int] = None):
+        super().__init__(base_url, symbols, concurrency, max_batch)
+
+    async def fetch_universe(self, client):
+        return list(CRYPTO_NAMES)
+
+    def request(self, unit):
+        return f"{self.base_url}/api/v3/simple/price", {
+            "ids": ",".join(unit),
+            "vs_currencies": "usd",
+            "include_market_cap": "true",
+            "include_24hr_vol": "true",
+            "include_24hr_change": "true"
+        }
+
+    def parse(self, unit, payload):
+        """
+        CoinGecko 응답 → cryptos 스키마 (js/data.js loadCryptoFromAPI와 같은 필드)
+        """
+        records = []
+        for coin_id in unit:
+            data = payload.get(coin_id)
+            if not data:
+                continue
+            name, symbol = CRYPTO_NAMES.get(coin_id, (coin_id, coin_id.upper()))
+            records.append({
+                "id": coin_id,
+                "name": name,
+                "symbol": symbol,
+                "price": data.get("usd", 0),
+                "change": round(data.get("usd_24h_change") or 0, 2),
+                "volume24h": data.get("usd_24h_vol") or 0,
+                "marketCap": data.get("usd_market_cap") or 0
+            })
+        return records
+
+    def mock(self):
+        return get_mock_crypto()
+
+
+async def collect_all(args) -> Tuple[Collector, Dict]:
+    """
+    세 소스를 동시에 수집 (--stub이면 같은 이벤트 루프에 스텁 서버를 띄움)
+    """
+    stock_url, crypto_url, server = args.url, args.crypto_url, None
+    if args.stub:
+        from stub_server import StubServer
+
+        server = StubServer(latency=args.latency, symbols=args.symbols, rate_limit=args.stub_limit)
+        stock_url = crypto_url = await server.start()
+        print(f"스텁 서버: {stock_url} (지연 {args.latency * 1000:.0f}ms, 시장별 {args.symbols}종목)")
+
+    crypto_symbols = None
+    if args.stub:
+        from stub_server import make_universe
+
+        crypto_symbols = make_universe("crypto", args.symbols)
+    sources = [
+        KoreanStockSource(stock_url, concurrency=args.concurrency, max_batch=args.batch_size),
+        USStockSource(stock_url, concurrency=args.concurrency, max_batch=args.batch_size),
+        CryptoSource(crypto_url, symbols=crypto_symbols, max_batch=args.batch_size),
+    ]
+    default = (args.rate, max(1.0, args.rate / 10)) if args.rate else None
+    client = RateLimitedClient(HTTPClient(), limits=HOST_LIMITS, default=default)
+    collector = Collector(sources, deadline=args.deadline, client=client)
+    try:
+        results = await collector.run()
+    finally:
+        await collector.client.close()
+        if server is not None:
+            await server.close()
+    return collector, results
+
+
+def sweep_batch_sizes(args):
+    """
+    묶음 크기별 수집 시간 (스텁 서버, 저장하지 않음)
+    """
+    args.stub = True
+    print(f"{'묶음 크기':>8}{'요청 수':>9}{'종목':>8}{'실패':>6}{'전체 시간':>10}{'종목/초':>9}")
+    for size in args.sweep:
+        args.batch_size = size
+        with contextlib.redirect_stdout(io.StringIO()):
+            collector, _ = asyncio.run(collect_all(args))
+        stats = collector.stats.values()
+        collected = sum(s["collected"] for s in stats)
+        print(f"{size:>12}{sum(s['requests'] for s in stats):>11}{collected:>10}"
+              f"{sum(s['failed'] for s in stats):>8}{collector.elapsed:>12.2f}초"
+              f"{collected / collector.elapsed:>11.0f}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="금융 대시보드 데이터 수집")
+    parser.add_argument("--url", help="주식 시세 API 주소 (/symbols, /quote 형식, 없으면 Mock 데이터)")
+    parser.add_argument("--crypto-url", default=COINGECKO_URL, help="CoinGecko API 주소")
+    parser.add_argument("--deadline", type=float, default=60.0, help="전체 수집 마감 시간 (초)")
+    parser.add_argument("--concurrency", type=int, help="주식 소스별 동시 요청 수 (기본 32)")
+    parser.add_argument("--rate", type=float,
+                        help="HOST_LIMITS에 없는 호스트의 초당 요청 수 (없으면 제한 없이 429만 재시도)")
+    parser.add_argument("--stub", action="store_true",
+                        help="로컬 스텁 서버에서 수집해 처리량만 측정 (데이터 파일은 덮어쓰지 않음)")
+    parser.add_argument("--latency", type=float, default=0.05, help="--stub 응답 지연 (초)")
+    parser.add_argument("--symbols", type=int, default=3000, help="--stub 시장별 종목 수")
+    parser.add_argument("--stub-limit", type=float, help="--stub이 허용하는 초당 요청 수 (넘으면 429)")
+    parser.add_argument("--batch-size", type=int,
+                        help="요청당 종목 수 상한 (1이면 종목마다 요청, 기본 주식 100/크립토 250)")
+    parser.add_argument("--delta", action="store_true",
+                        help="data/<market>/에 스냅샷 + 변경분 패치 + manifest로 발행")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="이 간격(초)마다 반복 수집 (0이면 한 번)")
+    parser.add_argument("--history", metavar="DIR",
+                        help="수집할 때마다 틱 저장소(DIR/<market>/<날짜>/)에 추가")
+    parser.add_argument("--output-dir", help="저장 폴더 (기본 ../data, --stub은 지정해야 저장)")
+    parser.add_argument("--sweep", type=int, nargs="+", metavar="SIZE",
+                        help="--stub에서 묶음 크기별로 반복 수집해 전체 시간 비교")
+    return parser.parse_args()
+
+
+def record_ticks(collector: Collector, results: Dict, stores: Dict, history_dir: str):
+    """
+    이번에 받은 종목만 틱 저장소에 추가 (이전 값으로 채운 종목은 기록하지 않음)
+    """
+    from tick_store import TickStore
+
+    now = time.time()
+    for source in collector.sources:
+        data = results[source.name]
+        if not data or not data[source.list_key]:
+            continue
+        if source.name not in stores:
+            stores[source.name] = TickStore(history_dir, source.name)
+        try:
+            count = stores[source.name].append(now, data[source.list_key])
+        except ValueError as e:
+            print(f"{source.name}: 틱 기록 건너뜀 ({e})")
+            continue
+        print(f"{source.name}: 틱 {count}종목 기록")
+
+
+def save_results(collector: Collector, results: Dict, data_dir: str,
+                 publishers: Optional[Dict[str, DeltaPublisher]] = None):
+    """
+    수집 결과 저장 (publishers가 있으면 변경분 발행)
+    """
+    for source in collector.sources:
+        data = results[source.name]
+        filepath = os.path.join(data_dir, OUTPUT_FILES[source.name])
+        # 받은 종목이 없는 소스는 기존 파일 유지
+        if not data:
+            continue
+
+        publisher = None
+        if publishers is not None:
+            if source.name not in publishers:
+                publishers[source.name] = DeltaPublisher(os.path.join(data_dir, source.name),
+                                                         source.list_key)
+            publisher = publishers[source.name]
+
+        stats = collector.stats[source.name]
+        if stats["failed"] or stats["timed_out"]:
+            previous = publisher.current if publisher is not None else load_json(filepath)
+            filled = fill_from_previous(data, previous, source.list_key)
+            if filled:
+                print(f"{source.name}: 받지 못한 {filled}개 종목은 이전 값 사용")
+
+        if publisher is None:
+            save_json(data, filepath)
+            continue
+        result = publisher.publish(data)
+        print(f"{source.name}: v{result['version']} {result['kind']} "
+              f"(변경 {result['changed']}종목, 삭제 {result['removed']}종목, {result['written']:,}B 기록)")
+
+
 def main():
     """
     메인 실행 함수
     """
+    args = parse_args()
+
     # 데이터 디렉토리 경로
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, '..', 'data')
+    data_dir = args.output_dir or os.path.join(script_dir, '..', 'data')
 
     print("=" * 50)
     print("금융 대시보드 데이터 수집 스크립트")
     print("=" * 50)
     print()
 
-    # 한국 주식
-    print("[1/3] 한국 주식 수집")
-    korean_data = collect_korean_stocks()
-    save_json(korean_data, os.path.join(data_dir, 'korean-stocks.json'))
-    print()
-
-    # 미국 주식
-    print("[2/3] 미국 주식 수집")
-    us_data = collect_us_stocks()
-    save_json(us_data, os.path.join(data_dir, 'us-stocks.json'))
-    print()
+    if args.sweep:
+        sweep_batch_sizes(args)
+        return
 
-    # 크립토
-    print("[3/3] 크립토 수집")
-    crypto_data = collect_crypto()
-    if crypto_data:
-        save_json(crypto_data, os.path.join(data_dir, 'crypto-list.json'))
-    print()
+    # 변경분 발행기는 반복 수집 동안 이전 상태를 메모리에 유지
+    publishers = {} if args.delta else None
+    stores = {}
+    try:
+        while True:
+            print("한국 주식 / 미국 주식 / 크립토 동시 수집 중...")
+            collector, results = asyncio.run(collect_all(args))
+            collector.print_report()
+            print()
+
+            if args.history:
+                record_ticks(collector, results, stores, args.history)
+            if args.stub and not args.output_dir:
+                print("스텁 수집 결과는 저장하지 않습니다.")
+            else:
+                save_results(collector, results, data_dir, publishers)
+            print()
+
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
 
     print("=" * 50)
     print("데이터 수집 완료!")
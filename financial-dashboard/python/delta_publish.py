@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+변경분(delta) 발행: 매 수집마다 전체 JSON을 다시 쓰는 대신 이전 스냅샷과 비교해 바뀐 종목만 기록
+
+data/<market>/ 폴더 구조 (market: korean, us, crypto)
+    manifest.json          현재 버전, 기준 스냅샷, 그 뒤 패치 목록 (클라이언트가 가장 먼저 읽는 파일)
+    snapshot-<버전>.json    전체 데이터 (공백 없는 JSON)
+    patch-<버전>.json       직전 버전 대비 바뀐 종목의 바뀐 필드만 (upsert) + 빠진 종목 id (remove)
+
+- 모든 파일은 임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽이 쓰다 만 파일을 보지 않음)
+- 데이터 파일을 먼저 쓰고 manifest를 마지막에 교체 (manifest가 없는 파일을 가리키지 않음)
+- 패치가 snapshot_every개를 넘거나 패치 합계가 스냅샷 크기의 절반을 넘으면 새 스냅샷으로 압축
+- 클라이언트(js/data.js)는 자기 버전 이후 패치만 받아 적용
+
+사용법:
+    python delta_publish.py --symbols 3000 --ticks 20 --moves 0.05   # 틱당 쓰기/전송 바이트 비교
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+def dumps_compact(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def atomic_write(path: str, payload: bytes):
+    """
+    같은 폴더의 임시 파일에 쓰고 fsync 후 이름 바꾸기
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp는 0600으로 만들므로 웹 서버가 읽을 수 있게
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def diff_records(previous: List[Dict], current: List[Dict]) -> Tuple[List[Dict], List[str]]:
+    """
+    id 기준 비교 → (upsert: 새 종목은 전체, 바뀐 종목은 id + 바뀐 필드, remove: 빠진 id)
+    """
+    before = {item["id"]: item for item in previous}
+    upsert = []
+    for item in current:
+        old = before.pop(item["id"], None)
+        if old is None:
+            upsert.append(item)
+            continue
+        changed = {k: v for k, v in item.items() if old.get(k) != v}
+        if changed:
+            changed["id"] = item["id"]
+            upsert.append(changed)
+    return upsert, list(before)
+
+
+def apply_patch(doc: Dict, patch: Dict, list_key: str) -> Dict:
+    """
+    패치 적용 (js/data.js applyPatch와 같은 규칙: 기존 종목은 필드 덮어쓰기, 새 종목은 끝에 추가)
+    """
+    removed = set(patch.get("remove", []))
+    records = [dict(item) for item in doc.get(list_key, []) if item["id"] not in removed]
+    index = {item["id"]: item for item in records}
+    for change in patch.get("upsert", []):
+        if change["id"] in index:
+            index[change["id"]].update(change)
+        else:
+            item = dict(change)
+            records.append(item)
+            index[item["id"]] = item
+    result = dict(doc, **patch.get("meta", {}))
+    result[list_key] = records
+    return result
+
+
+class DeltaPublisher:
+    """
+    시장 하나의 스냅샷/패치/manifest 관리
+    시작할 때 기존 manifest가 있으면 스냅샷 + 패치로 현재 상태를 복원해 버전을 이어감
+    """
+
+    def __init__(self, directory: str, list_key: str, snapshot_every: int = 50,
+                 max_patch_ratio: float = 0.5):
+        self.directory = directory
+        self.list_key = list_key
+        self.snapshot_every = snapshot_every
+        self.max_patch_ratio = max_patch_ratio
+        self.manifest: Optional[Dict] = None
+        self.current: Optional[Dict] = None
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read(self, name: str):
+        with open(self._path(name), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load(self):
+        try:
+            manifest = self._read("manifest.json")
+            doc = self._read(manifest["snapshot"]["file"])
+            for entry in manifest["patches"]:
+                doc = apply_patch(doc, self._read(entry["file"]), self.list_key)
+        except (OSError, ValueError, KeyError):
+            return
+        self.manifest, self.current = manifest, doc
+
+    def publish(self, data: Dict) -> Dict:
+        """
+        새 수집 결과 발행 → {"version", "kind": snapshot/patch, "written", "served", "changed", "removed"}
+        written: 이번에 쓴 바이트 (manifest 포함), served: 최신 클라이언트가 받을 바이트
+        """
+        meta = {k: v for k, v in data.items() if k != self.list_key}
+        version = self.manifest["version"] + 1 if self.manifest else 1
+
+        if self.current is not None:
+            upsert, remove = diff_records(self.current.get(self.list_key, []), data[self.list_key])
+            changed_meta = {k: v for k, v in meta.items() if self.current.get(k) != v}
+            patch = {"version": version, "upsert": upsert, "remove": remove, "meta": changed_meta}
+            payload = dumps_compact(patch)
+            patches = self.manifest["patches"]
+            chain = sum(p["bytes"] for p in patches) + len(payload)
+            if (len(patches) < self.snapshot_every
+                    and chain <= self.max_patch_ratio * self.manifest["snapshot"]["bytes"]):
+                name = f"patch-{version}.json"
+                atomic_write(self._path(name), payload)
+                self.current = apply_patch(self.current, patch, self.list_key)
+                patches.append({"version": version, "file": name, "bytes": len(payload)})
+                written = len(payload) + self._write_manifest(version)
+                return {"version": version, "kind": "patch", "written": written,
+                        "served": written, "changed": len(upsert), "removed": len(remove)}
+
+        # 첫 발행 또는 패치가 쌓이면 전체 스냅샷으로 압축
+        changed = len(data[self.list_key]) if self.current is None else len(upsert)
+        removed = 0 if self.current is None else len(remove)
+        self.current = dict(data)
+        payload = dumps_compact(self.current)
+        name = f"snapshot-{version}.json"
+        atomic_write(self._path(name), payload)
+        previous = self.manifest
+        self.manifest = {"version": version, "listKey": self.list_key,
+                         "snapshot": {"version": version, "file": name, "bytes": len(payload)},
+                         "patches": []}
+        written = len(payload) + self._write_manifest(version)
+        self._prune(previous)
+        return {"version": version, "kind": "snapshot", "written": written, "served": written,
+                "changed": changed, "removed": removed}
+
+    def _write_manifest(self, version: int) -> int:
+        self.manifest["version"] = version
+        self.manifest["lastUpdate"] = self.current.get("lastUpdate")
+        payload = dumps_compact(self.manifest)
+        atomic_write(self._path("manifest.json"), payload)
+        return len(payload)
+
+    def _prune(self, previous: Optional[Dict]):
+        """
+        직전 세대(이전 스냅샷과 그 패치)는 남기고 그보다 오래된 파일 삭제
+        (방금 이전 manifest를 읽은 클라이언트가 아직 받을 수 있도록)
+        """
+        keep = {"manifest.json", self.manifest["snapshot"]["file"]}
+        if previous is not None:
+            keep.add(previous["snapshot"]["file"])
+            keep.update(p["file"] for p in previous["patches"])
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") and name not in keep and name.startswith(("snapshot-", "patch-")):
+                os.remove(self._path(name))
+
+
+# ============================================================
+# 측정: 가격만 일부 바뀌는 틱에서 전체 쓰기 vs 변경분 발행
+# ============================================================
+
+def simulate(args):
+    from stub_server import make_quote, make_universe
+
+    rng = random.Random(0)
+    symbols = make_universe("korean", args.symbols)
+    stocks = [make_quote("korean", s) for s in symbols]
+    full_total = delta_total = served_total = 0
+    patch_bytes = []
+    with tempfile.TemporaryDirectory() as directory:
+        publisher = DeltaPublisher(directory, "stocks", snapshot_every=args.snapshot_every)
+        print(f"{'틱':>4}{'종류':>10}{'변경':>6}{'전체 JSON':>12}{'변경분 쓰기':>12}{'전송':>10}")
+        for tick in range(args.ticks):
+            for item in rng.sample(stocks, int(len(stocks) * args.moves)):
+                step = rng.choice((-1, 1)) * 100
+                item["price"] += step
+                item["change"] = round(item["change"] + step / item["price"] * 100, 2)
+            data = {"lastUpdate": datetime.now().isoformat() + "Z", "market": "korean",
+                    "currency": "KRW", "stocks": [dict(item) for item in stocks]}
+            full = len(json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+            result = publisher.publish(data)
+            # 최신 클라이언트는 manifest + 새 패치 하나만 받음 (스냅샷 틱은 스냅샷 전체)
+            served = result["served"]
+            full_total += full
+            delta_total += result["written"]
+            served_total += served
+            if result["kind"] == "patch":
+                patch_bytes.append(result["written"])
+            print(f"{tick + 1:>4}{result['kind']:>12}{result['changed']:>8}{full:>12,}"
+                  f"{result['written']:>14,}{served:>12,}")
+        assert publisher.current["stocks"] == data["stocks"]
+    print(f"합계: 전체 JSON {full_total:,}B, 변경분 쓰기 {delta_total:,}B "
+          f"({full_total / delta_total:.0f}배 감소), 전송 {served_total:,}B")
+    if patch_bytes:
+        average = sum(patch_bytes) / len(patch_bytes)
+        print(f"패치 틱 평균 {average:,.0f}B (전체 JSON 대비 {full / average:.0f}분의 1)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="변경분 발행 바이트 측정")
+    parser.add_argument("--symbols", type=int, default=3000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--moves", type=float, default=0.05, help="틱마다 가격이 바뀌는 종목 비율")
+    parser.add_argument("--snapshot-every", type=int, default=50)
+    simulate(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
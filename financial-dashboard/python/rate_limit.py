@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+호스트별 요청 속도 제한 + 재시도 계층 (async_collector.HTTPClient를 감싸서 사용)
+- TokenBucket: 호스트별 토큰 버킷, 429를 받으면 속도를 절반으로 줄이고 성공하면 조금씩 회복 (AIMD)
+- Backoff: 지터를 넣은 지수 백오프, Retry-After 헤더가 있으면 그 시간을 우선
+  (Retry-After 동안은 같은 호스트의 모든 요청을 멈춤)
+- 요청 합치기: 같은 URL/파라미터로 동시에 들어온 요청은 진행 중인 요청 하나의 결과를 함께 사용
+  (ids/symbols처럼 쉼표로 이은 목록 파라미터는 순서/중복을 무시하고 비교)
+
+사용법:
+    python rate_limit.py --stub-limit 5 --callers 8 --duration 20   # 429 스텁 상대로 분당 성공 요청 수 비교
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from async_collector import HTTPClient, HTTPError, Response
+
+# 쉼표로 이은 목록 파라미터 (응답이 순서와 무관하므로 요청 합치기 키에서 정렬/중복 제거)
+LIST_PARAMS = ("ids", "symbols")
+
+
+def coalesce_key(url: str, params: Optional[Dict] = None) -> Tuple[str, str]:
+    """
+    요청 합치기 키 (파라미터 이름순, LIST_PARAMS 값은 정렬 + 중복 제거)
+    """
+    items = []
+    for name, value in sorted((params or {}).items()):
+        if name in LIST_PARAMS and isinstance(value, str):
+            value = ",".join(sorted(set(v for v in value.split(",") if v)))
+        items.append((name, value))
+    return url, urlencode(items)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    초당 rate개, 최대 capacity개까지 쌓이는 토큰 버킷
+    대기 순서는 asyncio.Lock의 FIFO 순서
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """
+        토큰 하나 사용 (기다린 초를 돌려줌)
+        """
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return time.monotonic() - start
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """
+        seconds 동안 이 호스트 요청 중지 (Retry-After), 쌓인 토큰도 버림
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+
+    def penalize(self):
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class Backoff:
+    """
+    재시도 정책: 2^attempt * base 상한 안에서 균등 지터 (full jitter), cap초를 넘지 않음
+    """
+
+    def __init__(self, base: float = 0.5, cap: float = 30.0, retries: int = 5,
+                 statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)):
+        self.base = base
+        self.cap = cap
+        self.retries = retries
+        self.statuses = statuses
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            # 같은 시각에 몰리지 않도록 약간의 지터만 더함
+            return min(self.cap, retry_after) + random.uniform(0, self.base)
+        return random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+
+
+class RateLimitedClient:
+    """
+    HTTPClient + 호스트별 토큰 버킷 + 재시도 + 요청 합치기
+    limits: {호스트: (초당 요청 수, 버스트)}, 목록에 없는 호스트는 default (None이면 제한 없음)
+    """
+
+    def __init__(self, client: Optional[HTTPClient] = None,
+                 limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default: Optional[Tuple[float, float]] = None,
+                 backoff: Optional[Backoff] = None, coalesce: bool = True):
+        self.client = client or HTTPClient()
+        self.limits = limits or {}
+        self.default = default
+        self.backoff = backoff or Backoff()
+        self.coalesce = coalesce
+        self.buckets: Dict[str, Optional[TokenBucket]] = {}
+        self.stats = {"retries": 0, "throttled": 0, "coalesced": 0, "waited": 0.0}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    @property
+    def requests(self) -> int:
+        return self.client.requests
+
+    @property
+    def opened(self) -> int:
+        return self.client.opened
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        if host not in self.buckets:
+            limit = self.limits.get(host, self.default)
+            self.buckets[host] = TokenBucket(*limit) if limit else None
+        return self.buckets[host]
+
+    async def get(self, url: str, params: Optional[Dict] = None,
+                  headers: Optional[Dict] = None) -> Response:
+        if not self.coalesce or headers:
+            return await self._get(url, params, headers)
+        key = coalesce_key(url, params)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(self._get(url, params, headers))
+        self._inflight[key] = future
+        future.add_done_callback(lambda f: self._finished(key, f))
+        # 먼저 온 호출자가 취소돼도 함께 기다리는 호출자를 위해 요청은 계속 진행
+        return await asyncio.shield(future)
+
+    def _finished(self, key, future: asyncio.Future):
+        self._inflight.pop(key, None)
+        # 기다리던 호출자가 모두 취소된 경우에도 예외를 회수
+        if not future.cancelled():
+            future.exception()
+
+    async def _get(self, url, params, headers) -> Response:
+        host = urlsplit(url).netloc
+        bucket = self.bucket(host)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                self.stats["waited"] += await bucket.acquire()
+            try:
+                response = await self.client.get(url, params, headers)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                # 연결 오류/시간 초과/응답 중간 끊김은 재시도 대상
+                if attempt >= self.backoff.retries:
+                    raise
+                response = None
+            if response is not None and response.status not in self.backoff.statuses:
+                if bucket is not None:
+                    bucket.reward()
+                return response
+            if attempt >= self.backoff.retries:
+                return response
+            retry_after = None
+            if response is not None:
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                if response.status == 429:
+                    self.stats["throttled"] += 1
+                    if bucket is not None:
+                        bucket.penalize()
+            delay = self.backoff.delay(attempt, retry_after)
+            if bucket is not None and retry_after is not None:
+                bucket.pause(delay)
+            self.stats["retries"] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        await self.client.close()
+
+
+# ============================================================
+# 측정: 429를 돌려주는 스텁 상대로 분당 성공 요청 수
+# ============================================================
+
+async def _poll(client, url, ids_pool, callers, duration, rng):
+    """
+    callers개 호출자가 duration초 동안 코인 id 묶음을 계속 요청 → (성공, 실패)
+    """
+    deadline = time.monotonic() + duration
+    ok = failed = 0
+
+    async def caller():
+        nonlocal ok, failed
+        while time.monotonic() < deadline:
+            # 호출자마다 id 순서가 다름 (합치기 키가 순서에 무관해야 함)
+            group = rng.choice(ids_pool)
+            ids = ",".join(rng.sample(group, len(group)))
+            try:
+                response = await asyncio.wait_for(
+                    client.get(f"{url}/api/v3/simple/price", {"ids": ids, "vs_currencies": "usd"}),
+                    max(0.01, deadline - time.monotonic()))
+                response.raise_for_status()
+                ok += 1
+            except (HTTPError, OSError, asyncio.TimeoutError):
+                failed += 1
+                # 제한 없는 호출자는 곧바로 다시 시도 (운영 폴링과 같은 패턴)
+                await asyncio.sleep(0.05)
+
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    return ok, failed
+
+
+async def measure(args):
+    from stub_server import StubServer
+
+    ids_pool = [["bitcoin", "ethereum", "solana"], ["ripple", "cardano"], ["dogecoin", "litecoin"]]
+    modes = [
+        ("제한 없음", lambda: HTTPClient()),
+        ("백오프만", lambda: RateLimitedClient(coalesce=False)),
+        ("버킷+백오프", lambda: RateLimitedClient(default=(args.rate, args.burst), coalesce=False)),
+        ("버킷+백오프+합치기", lambda: RateLimitedClient(default=(args.rate, args.burst))),
+    ]
+    print(f"스텁 한도 초당 {args.stub_limit}회 (초과 시 429 + Retry-After), 호출자 {args.callers}개, "
+          f"모드별 {args.duration:.0f}초")
+    print(f"{'모드':<20}{'성공/분':>8}{'실패':>7}{'서버 요청':>10}{'429':>7}{'재시도':>7}{'합치기':>7}")
+    for label, factory in modes:
+        server = StubServer(latency=args.latency, rate_limit=args.stub_limit)
+        url = await server.start()
+        client = factory()
+        try:
+            ok, failed = await _poll(client, url, ids_pool, args.callers, args.duration,
+                                     random.Random(0))
+        finally:
+            await client.close()
+            await server.close()
+        stats = getattr(client, "stats", {"retries": 0, "coalesced": 0})
+        print(f"{label:<20}{ok * 60 / args.duration:>10.0f}{failed:>7}{server.requests:>12}"
+              f"{server.rejected:>7}{stats['retries']:>8}{stats['coalesced']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="속도 제한/백오프 효과 측정 (429 스텁)")
+    parser.add_argument("--stub-limit", type=float, default=5, help="스텁이 허용하는 초당 요청 수")
+    parser.add_argument("--rate", type=float, default=5, help="클라이언트 토큰 버킷 초당 요청 수")
+    parser.add_argument("--burst", type=float, default=2, help="토큰 버킷 크기")
+    parser.add_argument("--callers", type=int, default=8, help="동시 호출자 수")
+    parser.add_argument("--duration", type=float, default=20, help="모드별 측정 시간 (초)")
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 응답 지연 (초)")
+    asyncio.run(measure(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+수집기 테스트용 로컬 HTTP 스텁 서버
+고정(결정적) 시세 응답을 설정한 지연 후 돌려줌 (HTTP/1.1 keep-alive 지원)
+
+경로:
+    /symbols/<market>                    종목 코드 목록 (korean, us, crypto)
+    /quote/<market>/<symbol>             종목 하나 (대시보드 stocks 스키마)
+    /quotes/<market>?symbols=a,b,...     여러 종목 (목록)
+    /api/v3/simple/price?ids=a,b,...     CoinGecko simple/price 형식
+
+rate_limit(초당 요청 수)을 주면 1초 창마다 한도를 넘는 요청에 429 + Retry-After로 응답
+묶음 요청은 URL이 max_url자를 넘으면 414, 종목이 max_batch개를 넘으면 400
+응답 지연 = latency + 종목 수 × per_symbol (큰 묶음일수록 응답이 느려짐)
+
+사용법:
+    python stub_server.py --port 8765 --latency 0.05 --symbols 3000
+    python stub_server.py --rate-limit 5                     # 초당 5회 초과 시 429
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# collect_korean_stocks.CRYPTO_NAMES와 같은 15개 + 가상 코인
+CRYPTO_IDS = [
+    "bitcoin", "ethereum", "solana", "ripple", "cardano", "polkadot", "dogecoin", "litecoin",
+    "polygon", "uniswap", "chainlink", "bitcoin-cash", "eos", "monero", "stellar",
+]
+
+
+def make_universe(market: str, count: int) -> List[str]:
+    """
+    시장별 가상 종목 코드 목록
+    """
+    if market == "korean":
+        return [f"{i * 10:06d}" for i in range(1, count + 1)]
+    if market == "us":
+        names = []
+        for i in range(count):
+            code, n = "", i
+            while True:
+                code = chr(ord("A") + n % 26) + code
+                n = n // 26 - 1
+                if n < 0:
+                    break
+            names.append(code)
+        return names
+    return CRYPTO_IDS[:count] + [f"coin-{i}" for i in range(max(0, count - len(CRYPTO_IDS)))]
+
+
+def make_quote(market: str, symbol: str) -> Dict:
+    """
+    종목 코드로 정해지는 가상 시세 (같은 코드면 항상 같은 값)
+    """
+    rng = random.Random(zlib.crc32(f"{market}:{symbol}".encode()))
+    price = round(rng.uniform(1000, 500000) if market == "korean" else rng.uniform(1, 900), 2)
+    if market == "korean":
+        price = int(price // 100 * 100)
+    return {
+        "id": symbol,
+        "name": symbol,
+        "symbol": symbol,
+        "price": price,
+        "change": round(rng.uniform(-8, 8), 2),
+        "volume": rng.randint(10000, 50000000),
+        "marketCap": rng.randint(10 ** 9, 10 ** 13),
+        "pe": round(rng.uniform(3, 60), 1),
+        "high": round(price * 1.02, 2),
+        "low": round(price * 0.98, 2),
+    }
+
+
+def make_coingecko(ids: List[str], params: Dict) -> Dict:
+    """
+    CoinGecko simple/price 응답
+    """
+    result = {}
+    for coin in ids:
+        quote = make_quote("crypto", coin)
+        entry = {"usd": quote["price"]}
+        if params.get("include_market_cap") == "true":
+            entry["usd_market_cap"] = float(quote["marketCap"])
+        if params.get("include_24hr_vol") == "true":
+            entry["usd_24h_vol"] = float(quote["volume"])
+        if params.get("include_24hr_change") == "true":
+            entry["usd_24h_change"] = quote["change"]
+        result[coin] = entry
+    return result
+
+
+class StubServer:
+    """
+    asyncio 스텁 서버 (수집기와 같은 이벤트 루프에서 start/close, 단독 실행은 serve)
+    """
+
+    def __init__(self, latency: float = 0.05, symbols: int = 3000,
+                 host: str = "127.0.0.1", port: int = 0, rate_limit: Optional[float] = None,
+                 max_url: int = 2048, max_batch: int = 500, per_symbol: float = 0.0002):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.max_url = max_url
+        self.max_batch = max_batch
+        self.per_symbol = per_symbol
+        self.rejected = 0
+        self._window = (0, 0)
+        self.symbols = symbols
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._universe = {m: make_universe(m, symbols) for m in ("korean", "us", "crypto")}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # 열린 keep-alive 연결을 닫아 처리 태스크가 스스로 끝나게 함 (취소하지 않음)
+            for writer in self._handlers.values():
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+    @staticmethod
+    def batch(path: str, params: Dict) -> Optional[List[str]]:
+        """
+        묶음 요청이면 종목 목록
+        """
+        if path == "/api/v3/simple/price":
+            return [i for i in params.get("ids", "").split(",") if i]
+        if path.startswith("/quotes/"):
+            return [s for s in params.get("symbols", "").split(",") if s]
+        return None
+
+    def route(self, path: str, params: Dict) -> Tuple[int, Dict]:
+        """
+        경로 → (상태 코드, JSON 본문)
+        """
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+        if len(parts) == 2 and parts[0] == "symbols" and parts[1] in self._universe:
+            return 200, self._universe[parts[1]]
+        if len(parts) == 3 and parts[0] == "quote" and parts[1] in self._universe:
+            return 200, make_quote(parts[1], parts[2])
+        if len(parts) == 2 and parts[0] == "quotes" and parts[1] in self._universe:
+            return 200, [make_quote(parts[1], s) for s in self.batch(path, params)]
+        if path == "/api/v3/simple/price":
+            return 200, make_coingecko(self.batch(path, params), params)
+        return 404, {"error": "not found"}
+
+    async def respond(self, path: str, params: Dict, target: str = "") -> Tuple[int, Dict, Dict]:
+        """
+        (상태 코드, 추가 헤더, 본문) - 지연 후 응답
+        """
+        if self.rate_limit is not None:
+            now = time.monotonic()
+            window, count = self._window
+            if int(now) != window:
+                window, count = int(now), 0
+            self._window = (window, count + 1)
+            if count >= self.rate_limit:
+                self.rejected += 1
+                retry_after = max(1, math.ceil(window + 1 - now))
+                return 429, {"Retry-After": str(retry_after)}, {"error": "rate limited"}
+        symbols = self.batch(path, params)
+        if symbols is not None:
+            if len(target) > self.max_url:
+                return 414, {}, {"error": "URI too long"}
+            if len(symbols) > self.max_batch:
+                return 400, {}, {"error": f"too many symbols (max {self.max_batch})"}
+        await asyncio.sleep(self.latency + self.per_symbol * len(symbols or ()))
+        status, body = self.route(path, params)
+        return status, {}, body
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._handlers[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = {k.strip().lower(): v.strip()
+                           for k, v in (line.split(":", 1) for line in lines[1:] if ":" in line)}
+                self.requests += 1
+                url = urlsplit(target)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                status, extra, body = await self.respond(url.path, params, target)
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                close = headers.get("connection", "").lower() == "close"
+                response = [f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}",
+                            "Content-Type: application/json; charset=utf-8",
+                            f"Content-Length: {len(payload)}",
+                            f"Connection: {'close' if close else 'keep-alive'}"]
+                response += [f"{k}: {v}" for k, v in extra.items()]
+                writer.write(("\r\n".join(response) + "\r\n\r\n").encode("latin-1") + payload)
+                await writer.drain()
+                if close or method != "GET":
+                    break
+        finally:
+            writer.close()
+            self._handlers.pop(asyncio.current_task(), None)
+
+
+async def serve(args):
+    server = StubServer(args.latency, args.symbols, args.host, args.port, args.rate_limit)
+    url = await server.start()
+    print(f"스텁 서버: {url} (지연 {args.latency * 1000:.0f}ms, 시장별 {args.symbols}종목)")
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집기 테스트용 스텁 HTTP 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="응답 지연 (초)")
+    parser.add_argument("--symbols", type=int, default=3000, help="시장별 종목 수")
+    parser.add_argument("--rate-limit", type=float, help="초당 허용 요청 수 (넘으면 429)")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
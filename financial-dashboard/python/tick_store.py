@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+수집 틱 시계열 저장소 (추가 전용, 열 단위, 하루 단위 파티션)
+
+<root>/<market>/<YYYY-MM-DD>/ 폴더 구조 (날짜는 UTC 기준)
+    symbols.json       그날 종목 id 순서 (열 번호)
+    ts.bin / <필드>.bin  수집 중인 날: 틱 순서 (틱 × 종목) 행을 파일 끝에 덧붙임
+    ts.npy / <필드>.npy  마감된 날: 종목 순서 (종목 × 틱)로 전치해 저장
+
+- 필드: price, change, volume, high, low (그 틱에 없는 종목은 NaN)
+- 종목 id와 시각은 하루에 한 번만 저장하고 값은 고정 폭 배열 (행마다 키를 반복하는 JSON 대비 작음)
+- 날짜가 바뀌어 첫 틱이 들어오면 전날을 마감: 종목 하나의 기간 조회가 하루당 연속 구간 하나로 끝남
+- 읽기는 np.memmap/np.load(mmap_mode="r")로 필요한 페이지만 읽음
+- 읽을 때는 모든 필드 파일에 완성된 행만 사용, 추가 중 중단된 행은 쓰는 쪽이 다시 열 때 잘라냄
+- 하루 중간에 종목이 늘면 넓힌 파일을 임시로 다 쓴 뒤 widen.json(새 종목 목록)을 기록하고 교체
+  (중단되면 쓰는 쪽이 다시 열 때 widen.json이 있으면 마저 교체, 없으면 임시 파일 삭제)
+- 파일 크기가 symbols.json 폭의 행 수와 맞지 않거나 넓히는 중인 파티션은 읽지 않고 ValueError
+
+사용법:
+    python tick_store.py --symbols 3000 --days 20          # 분봉 20일치를 만들어 조회 시간 측정
+    python tick_store.py --symbols 3000 --days 250         # 1년치 (약 10.5GB, 생성 약 10분)
+    python tick_store.py --root ../history --market korean --symbol 005930
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+FIELDS = ("price", "change", "volume", "high", "low")
+DTYPES = {
+    "price": np.float64,
+    "change": np.float32,
+    "volume": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+}
+
+Timestamp = Union[int, float, datetime]
+
+# 수집 중인 날의 종목 늘리기 기록 (새 종목 목록, 있으면 넓힌 .bin.wide 파일로 교체 중)
+WIDEN_MARKER = "widen.json"
+
+
+def to_epoch(ts: Timestamp) -> int:
+    """
+    datetime 또는 epoch 초 → epoch 초 (정수, 시간대 없는 datetime은 UTC)
+    """
+    if isinstance(ts, datetime):
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return int(ts.timestamp())
+    return int(ts)
+
+
+def day_of(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d")
+
+
+class DayPartition:
+    """
+    하루치 파티션 하나 (마감된 날은 종목 × 틱, 수집 중인 날은 틱 × 종목)
+    """
+
+    def __init__(self, directory: str, lists: Optional[Dict[bytes, tuple]] = None,
+                 repair: bool = False):
+        self.directory = directory
+        self.day = os.path.basename(directory)
+        with open(self._path("symbols.json"), "rb") as f:
+            raw = f.read()
+        # 종목 목록은 보통 날마다 같으므로 파일 내용이 같으면 목록/색인을 함께 씀
+        cached = lists.get(raw) if lists is not None else None
+        if cached is None:
+            symbols = json.loads(raw)
+            cached = (symbols, {s: i for i, s in enumerate(symbols)})
+            if lists is not None:
+                lists[raw] = cached
+        self.symbols: List[str] = cached[0]
+        self.index: Dict[str, int] = cached[1]
+        self.sealed = os.path.exists(self._path("ts.npy"))
+        self._columns: Dict[str, np.ndarray] = {}
+        if self.sealed:
+            self.ts = np.load(self._path("ts.npy"))
+        else:
+            self.ts = self._recover(repair)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _recover(self, repair: bool) -> np.ndarray:
+        """
+        수집 중인 날: 모든 파일에 있는 완성된 행만 사용
+        repair=True(쓰는 쪽만)이면 쓰다 만 행을 잘라냄 - 읽는 쪽이 자르면 append 중인 행이 잘려 어긋남
+        """
+        if os.path.exists(self._path(WIDEN_MARKER)):
+            raise ValueError(f"종목을 늘리는 중인 파티션: {self.directory}")
+        width = len(self.symbols)
+        files = {"ts": (self._path("ts.bin"), 8)}
+        for field in FIELDS:
+            files[field] = (self._path(f"{field}.bin"), width * np.dtype(DTYPES[field]).itemsize)
+        sizes = {name: os.path.getsize(path) if os.path.exists(path) else 0
+                 for name, (path, _) in files.items()}
+        # 필드 파일은 ts보다 최대 한 행(쓰다 만 행 포함)만 앞설 수 있음 - 더 크면 폭이 다른 파일
+        ts_rows = sizes["ts"] // 8
+        for name, (_, row_bytes) in files.items():
+            if name != "ts" and row_bytes and sizes[name] > (ts_rows + 1) * row_bytes:
+                raise ValueError(f"{name}.bin 크기가 symbols.json 폭({width}종목)과 맞지 않음: "
+                                 f"{self.directory}")
+        rows = min(sizes[name] // row_bytes if row_bytes else ts_rows
+                   for name, (_, row_bytes) in files.items())
+        if repair:
+            for name, (path, row_bytes) in files.items():
+                if sizes[name] > rows * row_bytes:
+                    os.truncate(path, rows * row_bytes)
+        if rows == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.fromfile(self._path("ts.bin"), dtype=np.int64, count=rows)
+
+    def column(self, field: str) -> np.ndarray:
+        if field not in self._columns:
+            if self.sealed:
+                array = np.load(self._path(f"{field}.npy"), mmap_mode="r")
+            elif len(self.ts) == 0:
+                array = np.empty((0, len(self.symbols)), dtype=DTYPES[field])
+            else:
+                array = np.memmap(self._path(f"{field}.bin"), dtype=DTYPES[field], mode="r",
+                                  shape=(len(self.ts), len(self.symbols)))
+            self._columns[field] = array
+        return self._columns[field]
+
+    def series(self, symbol: str, field: str, lo: int, hi: int) -> Optional[np.ndarray]:
+        """
+        종목 하나의 lo:hi 틱 값 (그날 없는 종목이면 None)
+        """
+        j = self.index.get(symbol)
+        if j is None:
+            return None
+        array = self.column(field)
+        return np.asarray(array[j, lo:hi] if self.sealed else array[lo:hi, j])
+
+    def row(self, field: str, i: int) -> np.ndarray:
+        """
+        틱 하나의 전 종목 값
+        """
+        array = self.column(field)
+        return np.asarray(array[:, i] if self.sealed else array[i])
+
+
+class TickStore:
+    """
+    시장 하나의 틱 저장소: append(수집 틱 추가), symbol(종목 기간 조회), cross_section(시점 단면 조회)
+    마감된 날 파티션은 한 번 열면 캐시 (바뀌지 않음), 수집 중인 날은 조회할 때마다 다시 읽음
+    """
+
+    def __init__(self, root: str, market: str):
+        self.directory = os.path.join(root, market)
+        os.makedirs(self.directory, exist_ok=True)
+        self._sealed: Dict[str, DayPartition] = {}
+        self._lists: Dict[bytes, tuple] = {}
+        self._open: Optional[str] = None
+        self._last = None
+
+    # ------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------
+
+    def days(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.directory) if len(name) == 10 and name[4] == "-")
+
+    def _day_dir(self, day: str) -> str:
+        return os.path.join(self.directory, day)
+
+    def append(self, ts: Timestamp, records: Sequence[Dict]) -> int:
+        """
+        수집 틱 하나 추가 (records: 대시보드 스키마 목록, id별 price/change/volume/high/low)
+        시각은 이전 틱보다 뒤여야 함, 추가한 종목 수 반환
+        """
+        epoch = to_epoch(ts)
+        day = day_of(epoch)
+        if self._open != day:
+            self._start(day)
+        if self._last is not None and epoch <= self._last:
+            raise ValueError(f"틱 시각이 이전 틱보다 앞섬: {epoch} <= {self._last}")
+
+        directory = self._day_dir(day)
+        symbols = self._symbols
+        index = self._index
+        new = [r["id"] for r in records if r.get("id") is not None and r["id"] not in index]
+        if new:
+            self._widen(directory, symbols + list(dict.fromkeys(new)))
+            symbols, index = self._symbols, self._index
+
+        positions = np.fromiter((index[r["id"]] for r in records if r.get("id") is not None),
+                                dtype=np.int64)
+        for field in FIELDS:
+            row = np.full(len(symbols), np.nan, dtype=DTYPES[field])
+            values = [r.get(field) for r in records if r.get("id") is not None]
+            row[positions] = np.array([np.nan if v is None else v for v in values], dtype=DTYPES[field])
+            with open(os.path.join(directory, f"{field}.bin"), "ab") as f:
+                f.write(row.tobytes())
+        # ts는 마지막에 써서 ts 행 수 = 완성된 행 수
+        with open(os.path.join(directory, "ts.bin"), "ab") as f:
+            f.write(np.int64(epoch).tobytes())
+        self._last = epoch
+        return len(positions)
+
+    def _start(self, day: str):
+        """
+        새 날짜의 첫 틱: 이전 날짜를 마감하고 (있으면) 이어 쓸 파티션 열기
+        """
+        for previous in self.days():
+            if previous < day and not os.path.exists(os.path.join(self._day_dir(previous), "ts.npy")):
+                self.seal(previous)
+        directory = self._day_dir(day)
+        if os.path.exists(os.path.join(directory, "ts.npy")):
+            raise ValueError(f"이미 마감된 날짜에 추가할 수 없음: {day}")
+        if os.path.exists(os.path.join(directory, "symbols.json")):
+            # 이전 실행이 append/종목 늘리기 도중 끝났으면 여기서 정리
+            self._finish_widen(directory)
+            partition = DayPartition(directory, repair=True)
+            self._symbols = partition.symbols
+            self._last = int(partition.ts[-1]) if len(partition.ts) else None
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self._symbols = []
+            self._write_symbols(directory, [])
+            self._last = None
+        self._index = {s: i for i, s in enumerate(self._symbols)}
+        self._open = day
+
+    @staticmethod
+    def _write_symbols(directory: str, symbols: List[str]):
+        path = os.path.join(directory, "symbols.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(symbols, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def _widen(self, directory: str, symbols: List[str]):
+        """
+        하루 중간에 새 종목이 생기면 그날 파일을 넓혀 다시 씀 (기존 행의 새 열은 NaN)
+        넓힌 파일을 모두 .wide로 쓴 뒤 widen.json 기록이 확정 시점 (이후 중단되면 _finish_widen이 마저 교체)
+        """
+        rows = os.path.getsize(os.path.join(directory, "ts.bin")) // 8 \
+            if os.path.exists(os.path.join(directory, "ts.bin")) else 0
+        old = len(self._symbols)
+        if rows:
+            for field in FIELDS:
+                path = os.path.join(directory, f"{field}.bin")
+                array = np.fromfile(path, dtype=DTYPES[field], count=rows * old).reshape(rows, old)
+                wide = np.full((rows, len(symbols)), np.nan, dtype=DTYPES[field])
+                wide[:, :old] = array
+                with open(path + ".wide", "wb") as f:
+                    wide.tofile(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+            marker = os.path.join(directory, WIDEN_MARKER)
+            with open(marker + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(symbols, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(marker + ".tmp", marker)
+            self._finish_widen(directory)
+        else:
+            self._write_symbols(directory, symbols)
+        self._symbols = symbols
+        self._index = {s: i for i, s in enumerate(symbols)}
+
+    def _finish_widen(self, directory: str):
+        """
+        widen.json이 있으면 .wide 파일 교체 + symbols.json 갱신을 마치고, 없으면 남은 .wide 삭제
+        """
+        marker = os.path.join(directory, WIDEN_MARKER)
+        try:
+            with open(marker, "r", encoding="utf-8") as f:
+                symbols = json.load(f)
+        except FileNotFoundError:
+            symbols = None
+        for field in FIELDS:
+            wide = os.path.join(directory, f"{field}.bin.wide")
+            if not os.path.exists(wide):
+                continue
+            if symbols is None:
+                os.remove(wide)
+            else:
+                os.replace(wide, os.path.join(directory, f"{field}.bin"))
+        if symbols is not None:
+            self._write_symbols(directory, symbols)
+            os.remove(marker)
+        if os.path.exists(marker + ".tmp"):
+            os.remove(marker + ".tmp")
+
+    def seal(self, day: Optional[str] = None):
+        """
+        수집 중인 날을 마감: 종목 × 틱 .npy로 전치 저장 후 .bin 삭제 (ts.npy를 마지막에 씀)
+        """
+        day = day or self._open
+        if day is None:
+            return
+        directory = self._day_dir(day)
+        if not os.path.exists(os.path.join(directory, "ts.npy")):
+            self._finish_widen(directory)
+        partition = DayPartition(directory)
+        if not partition.sealed:
+            for field in FIELDS:
+                array = np.ascontiguousarray(partition.column(field).T)
+                fd, tmp = tempfile.mkstemp(suffix=".npy", dir=directory)
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, array)
+                os.replace(tmp, os.path.join(directory, f"{field}.npy"))
+            fd, tmp = tempfile.mkstemp(suffix=".npy", dir=directory)
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, partition.ts)
+            os.replace(tmp, os.path.join(directory, "ts.npy"))
+        for name in ["ts.bin"] + [f"{field}.bin" for field in FIELDS]:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+        if self._open == day:
+            self._open = None
+            self._last = None
+
+    # ------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------
+
+    def partition(self, day: str) -> Optional[DayPartition]:
+        cached = self._sealed.get(day)
+        if cached is not None:
+            return cached
+        directory = self._day_dir(day)
+        if not os.path.exists(os.path.join(directory, "symbols.json")):
+            return None
+        partition = DayPartition(directory, self._lists)
+        if partition.sealed:
+            self._sealed[day] = partition
+        return partition
+
+    def symbol(self, symbol: str, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None,
+               fields: Sequence[str] = FIELDS) -> Dict[str, np.ndarray]:
+        """
+        종목 하나의 [start, end] 구간 → {"ts": epoch 초, 필드: 값 배열}
+        """
+        lo_epoch = to_epoch(start) if start is not None else None
+        hi_epoch = to_epoch(end) if end is not None else None
+        first = day_of(lo_epoch) if lo_epoch is not None else ""
+        last = day_of(hi_epoch) if hi_epoch is not None else "9999"
+        parts = {name: [] for name in ("ts",) + tuple(fields)}
+        for day in self.days():
+            if day < first or day > last:
+                continue
+            partition = self.partition(day)
+            if partition is None or symbol not in partition.index:
+                continue
+            ts = partition.ts
+            lo = int(np.searchsorted(ts, lo_epoch, "left")) if day == first else 0
+            hi = int(np.searchsorted(ts, hi_epoch, "right")) if day == last else len(ts)
+            if lo >= hi:
+                continue
+            parts["ts"].append(ts[lo:hi])
+            for field in fields:
+                parts[field].append(partition.series(symbol, field, lo, hi))
+        return {name: np.concatenate(chunks) if chunks else
+                np.empty(0, dtype=np.int64 if name == "ts" else DTYPES[name])
+                for name, chunks in parts.items()}
+
+    def cross_section(self, at: Timestamp, fields: Sequence[str] = FIELDS) -> Optional[Dict]:
+        """
+        at 시각 또는 그 직전 틱의 전 종목 값 → {"ts", "id": 종목 목록, 필드: 값 배열} (없으면 None)
+        """
+        epoch = to_epoch(at)
+        target = day_of(epoch)
+        for day in reversed(self.days()):
+            if day > target:
+                continue
+            partition = self.partition(day)
+            if partition is None or len(partition.ts) == 0:
+                continue
+            i = int(np.searchsorted(partition.ts, epoch, "right")) - 1
+            if i < 0:
+                continue
+            result = {"ts": int(partition.ts[i]), "id": partition.symbols}
+            for field in fields:
+                result[field] = partition.row(field, i)
+            return result
+        return None
+
+    def nbytes(self) -> int:
+        total = 0
+        for base, _, files in os.walk(self.directory):
+            total += sum(os.path.getsize(os.path.join(base, name)) for name in files)
+        return total
+
+
+# ============================================================
+# 측정: 분봉 N일치 (종목 × 하루 390틱)를 만들고 조회 시간 측정
+# ============================================================
+
+def _timed(fn, repeat: int = 5) -> float:
+    """
+    가장 빠른 실행 시간 (ms)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark(args):
+    from stub_server import make_quote, make_universe
+
+    symbols = make_universe("korean", args.symbols)
+    base = np.array([make_quote("korean", s)["price"] for s in symbols], dtype=np.float64)
+    rng = np.random.default_rng(0)
+    root = args.root or tempfile.mkdtemp(prefix="ticks-")
+    store = TickStore(root, "korean")
+    open_at = datetime(2024, 1, 2, 0, 0, tzinfo=timezone.utc)  # 09:00 KST
+    ticks = 0
+    json_bytes = 0
+
+    start = time.perf_counter()
+    append_time = 0.0
+    price = base.copy()
+    for d in range(args.days):
+        day_start = open_at + timedelta(days=d)
+        for minute in range(args.minutes):
+            price *= 1 + rng.normal(0, 0.001, len(price))
+            records = [{"id": s, "price": float(p), "change": 0.0, "volume": 1000.0,
+                        "high": float(p), "low": float(p)} for s, p in zip(symbols, price)]
+            if d == 0 and minute == 0:
+                json_bytes = len(json.dumps(records, ensure_ascii=False).encode("utf-8"))
+            t0 = time.perf_counter()
+            store.append(day_start + timedelta(minutes=minute), records)
+            append_time += time.perf_counter() - t0
+            ticks += 1
+    store.seal()
+    build = time.perf_counter() - start
+
+    size = store.nbytes()
+    print(f"{args.days}일 × {args.minutes}틱 × {args.symbols}종목 = {ticks * args.symbols:,}행, "
+          f"저장 {size / 1e6:,.1f}MB (행당 {size / (ticks * args.symbols):.1f}B, "
+          f"같은 틱의 JSON은 행당 {json_bytes / args.symbols:.0f}B)")
+    print(f"추가: 틱당 평균 {append_time / ticks * 1000:.2f}ms (생성 포함 전체 {build:.1f}초)")
+
+    reader = TickStore(root, "korean")
+    target = symbols[len(symbols) // 2]
+    mid = open_at + timedelta(days=args.days // 2, minutes=args.minutes // 2)
+    cold = _timed(lambda: reader.symbol(target, fields=("price",)), repeat=1)
+    print(f"{'조회':<34}{'ms':>10}")
+    print(f"{'종목 전체 기간 price (처음 열기)':<34}{cold:>10.2f}")
+    print(f"{'종목 전체 기간 price':<34}{_timed(lambda: reader.symbol(target, fields=('price',))):>10.2f}")
+    print(f"{'종목 전체 기간 5필드':<34}{_timed(lambda: reader.symbol(target)):>10.2f}")
+    week = (mid - timedelta(days=7), mid)
+    print(f"{'종목 1주 구간 5필드':<34}{_timed(lambda: reader.symbol(target, *week)):>10.2f}")
+    print(f"{'단면 (한 시각 전 종목) 5필드':<34}{_timed(lambda: reader.cross_section(mid)):>10.2f}")
+
+    series = reader.symbol(target, fields=("price",))
+    section = reader.cross_section(mid)
+    assert len(series["ts"]) == ticks and section["ts"] == to_epoch(mid)
+    assert len(section["id"]) == args.symbols
+
+    if args.days < 250:
+        print(f"(1년 250일이면 저장 약 {size / args.days * 250 / 1e9:,.1f}GB, "
+              f"종목 조회는 마감 파티션마다 연속 구간 하나를 읽으므로 날 수에 비례)")
+    if not args.root:
+        shutil.rmtree(root)
+
+
+def show(args):
+    store = TickStore(args.root, args.market)
+    days = store.days()
+    if not days:
+        print(f"저장된 틱 없음: {store.directory}")
+        return
+    print(f"{store.directory}: {days[0]} ~ {days[-1]} ({len(days)}일, {store.nbytes() / 1e6:,.1f}MB)")
+    series = store.symbol(args.symbol)
+    for ts, price, change in list(zip(series["ts"], series["price"], series["change"]))[-args.tail:]:
+        stamp = datetime.fromtimestamp(int(ts), timezone.utc).isoformat()
+        print(f"{stamp}  {price:>14,.2f}  {change:>+7.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="틱 시계열 저장소 조회/측정")
+    parser.add_argument("--root", help="저장소 폴더 (없으면 임시 폴더에서 측정)")
+    parser.add_argument("--market", default="korean")
+    parser.add_argument("--symbol", help="이 종목의 최근 틱 출력 (--root 필요)")
+    parser.add_argument("--tail", type=int, default=20)
+    parser.add_argument("--symbols", type=int, default=3000, help="측정 종목 수")
+    parser.add_argument("--days", type=int, default=20, help="측정 일 수")
+    parser.add_argument("--minutes", type=int, default=390, help="하루 틱 수 (분봉 6.5시간)")
+    args = parser.parse_args()
+    if args.symbol:
+        if not args.root:
+            parser.error("--symbol은 --root와 함께 사용")
+        show(args)
+    else:
+        benchmark(args)
+
+
+if __name__ == '__main__':
+    main()
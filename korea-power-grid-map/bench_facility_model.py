@@ -0,0 +1,123 @@
+"""
+시설 데이터 모델 벤치마크 (표시 문자열 딕셔너리 vs __slots__ 데이터클래스 vs 열 저장)
+합성 발전소 N개(기본 100만)로 시설당 메모리(tracemalloc)와
+유형/운영사/지역별 설비용량 합계 시간을 비교합니다.
+
+사용법:
+    python bench_facility_model.py --rows 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from facility_model import FacilityTable, PowerPlant, REGION_CENTERS, assign_regions
+from grid_db import parse_quantity
+
+TYPES = ["nuclear", "coal", "lng", "hydro", "renewable"]
+OPERATORS = ["한국수력원자력", "한국동서발전", "한국서부발전", "한국중부발전", "한국남부발전",
+             "한국남동발전", "제주에너지공사"]
+
+
+def make_columns(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "lat": rng.uniform(33.2, 38.5, n).round(5),
+        "lng": rng.uniform(126.0, 129.5, n).round(5),
+        "capacity_mw": rng.integers(1, 12000, n),
+        "units": rng.integers(1, 20, n),
+        "type": rng.integers(0, len(TYPES), n),
+        "operator": rng.integers(0, len(OPERATORS), n),
+    }
+
+
+def build_legacy(cols):
+    """기존 형식: 설비용량이 '10,720MW' 같은 표시 문자열인 딕셔너리"""
+    return [{"name": f"발전소 {i}", "type": TYPES[t], "lat": float(lat), "lng": float(lng),
+             "capacity": f"{int(c):,}MW", "units": int(u), "operator": OPERATORS[o]}
+            for i, (lat, lng, c, u, t, o) in enumerate(zip(
+                cols["lat"], cols["lng"], cols["capacity_mw"], cols["units"],
+                cols["type"], cols["operator"]))]
+
+
+def build_slots(cols):
+    return [PowerPlant(f"발전소 {i}", TYPES[t], float(lat), float(lng), float(c), int(u),
+                       OPERATORS[o])
+            for i, (lat, lng, c, u, t, o) in enumerate(zip(
+                cols["lat"], cols["lng"], cols["capacity_mw"], cols["units"],
+                cols["type"], cols["operator"]))]
+
+
+def build_table(cols):
+    n = len(cols["lat"])
+    return FacilityTable([f"발전소 {i}" for i in range(n)], cols["lat"], cols["lng"],
+                         {"capacity_mw": cols["capacity_mw"], "units": cols["units"]},
+                         {"type": [TYPES[t] for t in cols["type"]],
+                          "operator": [OPERATORS[o] for o in cols["operator"]]})
+
+
+def measure(builder, cols):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = builder(cols)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size, elapsed
+
+
+def legacy_totals(plants, key, regions=None):
+    """문자열을 매번 다시 파싱하는 기존 방식의 합계"""
+    totals = {}
+    for i, p in enumerate(plants):
+        label = regions[i] if key == "region" else p[key]
+        totals[label] = totals.get(label, 0) + parse_quantity(p["capacity"])
+    return totals
+
+
+def slots_totals(plants, key, regions=None):
+    totals = {}
+    for i, p in enumerate(plants):
+        label = regions[i] if key == "region" else getattr(p, key)
+        totals[label] = totals.get(label, 0) + p.capacity_mw
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시설 데이터 모델 메모리/집계 벤치마크")
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    cols = make_columns(args.rows)
+    # 지역은 세 방식 모두 같은 배정 결과를 사용 (집계 시간만 비교)
+    region_names = list(REGION_CENTERS)
+    regions = [region_names[c] for c in assign_regions(cols["lat"], cols["lng"])]
+
+    print(f"발전소 {args.rows:,}개")
+    print(f"{'모델':<14}{'메모리':>12}{'시설당':>10}{'생성':>9}{'유형별':>10}{'운영사별':>10}{'지역별':>10}")
+    results = {}
+    for label, builder, totals in (("딕셔너리(문자열)", build_legacy, legacy_totals),
+                                   ("__slots__", build_slots, slots_totals),
+                                   ("열 저장", build_table, None)):
+        obj, size, elapsed = measure(builder, cols)
+        times = []
+        for key in ("type", "operator", "region"):
+            start = time.perf_counter()
+            if totals is None:
+                result = obj.total_by("capacity_mw", key)
+            else:
+                result = totals(obj, key, regions)
+            times.append(time.perf_counter() - start)
+            results.setdefault(key, []).append({k: round(v) for k, v in result.items()})
+        print(f"{label:<14}{size / 2 ** 20:>10.1f}MB{size / args.rows:>8.0f}B"
+              f"{elapsed:>8.2f}s" + "".join(f"{t * 1000:>8.0f}ms" for t in times))
+        del obj
+
+    consistent = all(r[0] == r[1] == r[2] for r in results.values())
+    print(f"세 방식 합계 일치: {consistent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+선로 경로 단순화/인코딩 벤치마크
+촘촘한 합성 선로(선로당 꼭짓점 수백 개, 지형 따라 굽은 경로)로
+줌 단계별 꼭짓점 수/바이트, 첫 빌드(캐시 없음)와 재빌드(캐시 적중) 시간을 비교합니다.
+
+사용법:
+    python bench_line_geometry.py --lines 2000 --vertices 400
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from line_geometry import LineGeometryCache, print_report
+
+
+def make_routes(n_lines, n_vertices, seed=0):
+    """한반도 범위 안 굽은 합성 선로 (약 10m 간격 잡음 + 큰 굴곡)"""
+    rng = np.random.default_rng(seed)
+    lines = []
+    for _ in range(n_lines):
+        start = np.array([rng.uniform(34.5, 38.0), rng.uniform(126.3, 129.3)])
+        end = start + rng.uniform(-0.4, 0.4, size=2)
+        t = np.linspace(0, 1, n_vertices)[:, None]
+        bend = np.sin(t * np.pi * rng.uniform(1, 4)) * rng.uniform(0.01, 0.05)
+        noise = rng.normal(0, 0.0001, size=(n_vertices, 2))
+        noise[[0, -1]] = 0
+        coords = start + t * (end - start) + bend * np.array([[1, -1]]) + noise
+        lines.append({"coords": coords.round(6).tolist()})
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="선로 경로 단순화/인코딩 벤치마크")
+    parser.add_argument("--lines", type=int, default=2000)
+    parser.add_argument("--vertices", type=int, default=400)
+    args = parser.parse_args()
+
+    lines = make_routes(args.lines, args.vertices)
+    print(f"선로 {len(lines)}개 x 꼭짓점 {args.vertices}개")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LineGeometryCache(tmp)
+        for label in ("첫 빌드", "재빌드"):
+            start = time.perf_counter()
+            cache.tiers(lines)
+            elapsed = time.perf_counter() - start
+            print(f"{label}: {elapsed * 1000:.0f} ms")
+            print_report(cache.report)
+
+        # 선로 하나만 바뀌면 그 선로만 다시 계산
+        lines[0] = {"coords": lines[0]["coords"][::-1]}
+        start = time.perf_counter()
+        cache.tiers(lines)
+        print(f"선로 1개 변경 후: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
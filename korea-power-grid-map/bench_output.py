@@ -0,0 +1,90 @@
+"""
+지도 HTML 출력 벤치마크 (기본 folium 출력 vs --compact)
+HTML 크기, gzip 크기, 생성 시간, 스크립트 파싱 시간(node)을 비교합니다.
+--copies N이면 시설/선로 데이터를 좌표를 조금씩 옮겨 N배로 늘려 측정합니다.
+
+사용법:
+    python bench_output.py --copies 10
+"""
+
+import argparse
+import gzip
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+import korea_grid_map as grid
+
+COMPILE_JS = """
+const fs = require('fs'), vm = require('vm');
+const code = fs.readFileSync(process.argv[1], 'utf8');
+const t0 = performance.now();
+new vm.Script(code);
+console.log((performance.now() - t0).toFixed(1));
+"""
+
+
+def scale_data(copies):
+    """모듈 데이터를 copies배로 복제 (복제본마다 좌표를 0.05도씩 이동)"""
+    def shifted(items, k):
+        out = []
+        for item in items:
+            item = dict(item, name=f'{item["name"]} #{k}' if k else item["name"])
+            if "coords" in item:
+                item["coords"] = [[lat + 0.05 * k, lng + 0.05 * k] for lat, lng in item["coords"]]
+            else:
+                item["lat"] += 0.05 * k
+                item["lng"] += 0.05 * k
+            out.append(item)
+        return out
+
+    for name in ("POWER_PLANTS", "SUBSTATIONS", "MAJOR_CITIES", "TRANSMISSION_LINES"):
+        base = getattr(grid, name)
+        setattr(grid, name, [x for k in range(copies) for x in shifted(base, k)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지도 HTML 출력: 기본 vs 압축")
+    parser.add_argument("--copies", type=int, default=1, help="데이터 복제 배수")
+    args = parser.parse_args()
+
+    import folium  # noqa: F401 (임포트 시간은 생성 시간에서 제외)
+
+    scale_data(args.copies)
+    node = shutil.which("node")
+    print(f"발전소 {len(grid.POWER_PLANTS)}, 변전소 {len(grid.SUBSTATIONS)}, "
+          f"선로 {len(grid.TRANSMISSION_LINES)}")
+    print(f"{'출력':<10}{'HTML':>10}{'gzip':>10}{'생성':>10}{'JS 파싱':>10}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, compact in (("기본", False), ("compact", True)):
+            start = time.perf_counter()
+            html = grid.build_map(compact=compact).get_root().render()
+            elapsed = time.perf_counter() - start
+            raw = html.encode("utf-8")
+            parse_ms = None
+            if node:
+                path = os.path.join(tmp, "page.js")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("\n".join(re.findall(r"<script>(.*?)</script>", html, re.S)))
+                out = subprocess.run([node, "-e", COMPILE_JS, path],
+                                     capture_output=True, text=True, check=True)
+                parse_ms = float(out.stdout)
+            results[label] = (len(raw), parse_ms)
+            print(f"{label:<10}{len(raw) / 1024:>8.1f}KB{len(gzip.compress(raw)) / 1024:>8.1f}KB"
+                  f"{elapsed * 1000:>8.0f}ms"
+                  f"{'-' if parse_ms is None else f'{parse_ms:.1f}ms':>10}")
+
+    (size_a, parse_a), (size_b, parse_b) = results["기본"], results["compact"]
+    summary = f"크기 x{size_a / size_b:.1f}"
+    if parse_a is not None:
+        summary += f", 파싱 x{parse_a / parse_b:.1f}"
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
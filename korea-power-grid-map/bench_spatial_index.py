@@ -0,0 +1,80 @@
+"""
+공간 인덱스 벤치마크
+무작위 점 N개(기본 10만)에 대해 반경/최근접/범위 질의를
+R-tree(SpatialIndex)와 전수 검사(NumPy 전체 배열, 파이썬 리스트 순회)로 비교합니다.
+
+사용법:
+    python bench_spatial_index.py --points 100000 --queries 500
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from grid_graph import _km, haversine_km
+from spatial_index import SpatialIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="R-tree vs 전수 검사")
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--radius", type=float, default=20.0, help="반경 질의 km")
+    parser.add_argument("--k", type=int, default=10, help="최근접 개수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(33.0, 38.6, args.points)
+    lngs = rng.uniform(125.0, 130.0, args.points)
+    queries = list(zip(rng.uniform(34.0, 38.0, args.queries), rng.uniform(126.0, 129.0, args.queries)))
+    records = [{"lat": a, "lng": b} for a, b in zip(lats.tolist(), lngs.tolist())]
+
+    t0 = time.perf_counter()
+    index = SpatialIndex.from_points(lats, lngs)
+    t_build = time.perf_counter() - t0
+
+    def timed(fn):
+        start = time.perf_counter()
+        result = [fn(lat, lng) for lat, lng in queries]
+        return result, (time.perf_counter() - start) / len(queries) * 1e6
+
+    # 반경
+    tree_r, t_tree_r = timed(lambda a, b: set(index.within(a, b, args.radius)[0].tolist()))
+    scan_r, t_scan_r = timed(
+        lambda a, b: set(np.flatnonzero(haversine_km(a, b, lats, lngs) <= args.radius).tolist()))
+
+    # 최근접 k
+    tree_k, t_tree_k = timed(lambda a, b: index.nearest(a, b, args.k)[1])
+    scan_k, t_scan_k = timed(lambda a, b: np.sort(haversine_km(a, b, lats, lngs))[:args.k])
+
+    # 범위 (0.5도 상자)
+    tree_b, t_tree_b = timed(lambda a, b: set(index.bbox(a, b, a + 0.5, b + 0.5).tolist()))
+    scan_b, t_scan_b = timed(lambda a, b: set(np.flatnonzero(
+        (lats >= a) & (lats <= a + 0.5) & (lngs >= b) & (lngs <= b + 0.5)).tolist()))
+
+    # 기존 방식: 파이썬 리스트 순회 (몇 개만 재서 평균)
+    sample = random.Random(0).sample(queries, min(5, len(queries)))
+    start = time.perf_counter()
+    for lat, lng in sample:
+        [r for r in records if _km(lat, lng, r["lat"], r["lng"]) <= args.radius]
+    t_list_r = (time.perf_counter() - start) / len(sample) * 1e6
+
+    ok_r = tree_r == scan_r
+    ok_k = all(np.allclose(a, b) for a, b in zip(tree_k, scan_k))
+    ok_b = tree_b == scan_b
+    print(f"점 {args.points}개, 질의 {args.queries}개, 인덱스 구성 {t_build * 1000:.1f} ms "
+          f"(레벨 {len(index.levels)}개)")
+    print(f"{'질의':<16}{'R-tree':>12}{'NumPy 전수':>14}{'배속':>8}  일치")
+    for label, tree, scan, ok in (
+        (f"반경 {args.radius:g}km", t_tree_r, t_scan_r, ok_r),
+        (f"최근접 {args.k}개", t_tree_k, t_scan_k, ok_k),
+        ("범위 0.5°", t_tree_b, t_scan_b, ok_b),
+    ):
+        print(f"{label:<16}{tree:>10.1f}us{scan:>12.1f}us{scan / tree:>7.1f}x  {ok}")
+    print(f"(파이썬 리스트 순회 반경 질의: {t_list_r:,.0f}us / 질의)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+송전탑 렌더링 벤치마크 (DivIcon 마커 vs 캔버스 레이어)
+합성 송전탑 N개(기본 5만)로 두 방식의 지도를 만들어 HTML 크기, 생성 시간,
+스크립트 파싱 시간(node), DOM 노드 수를 비교하고,
+캔버스 레이어는 실제 레이어 JS를 node에서 모의 지도/캔버스로 실행해 한 프레임 그리기 시간을 잽니다.
+(래스터화 비용은 빠지므로 실제 프레임 시간은 브라우저 콘솔의 window.towerFrameTimes로 확인)
+
+사용법:
+    python bench_towers.py --towers 50000
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+COMPILE_JS = """
+const fs = require('fs'), vm = require('vm');
+const code = fs.readFileSync(process.argv[1], 'utf8');
+const t0 = performance.now();
+new vm.Script(code);
+console.log((performance.now() - t0).toFixed(1));
+"""
+
+# 모의 Leaflet/지도/캔버스에서 TowerCanvasLayer._redraw 실행 (웹 메르카토르 투영 포함)
+FRAME_JS = """
+const fs = require('fs');
+const layerJs = fs.readFileSync(process.argv[1], 'utf8');
+const packed = fs.readFileSync(process.argv[2], 'utf8');
+let drawn = 0;
+const ctx = {setTransform() {}, drawImage() { drawn++; }};
+global.window = {devicePixelRatio: 1};
+global.Image = function () { this.complete = true; };
+global.L = {
+    Layer: {extend: proto => { const C = function (...a) { this.initialize(...a); }; Object.assign(C.prototype, proto); return C; }},
+    bind: (f, o) => f.bind(o),
+    DomUtil: {create: () => ({style: {}, getContext: () => ctx}), setPosition() {}, remove() {}},
+};
+const scale = 256 * Math.pow(2, 7);
+const map = {
+    getSize: () => ({x: 1280, y: 800}), getZoom: () => 7,
+    getBounds: () => ({pad() { return this; }, getSouth: () => 33.0, getNorth: () => 38.7,
+                       getWest: () => 124.5, getEast: () => 130.5}),
+    containerPointToLayerPoint: p => p, on() {}, off() {},
+    getPanes: () => ({overlayPane: {appendChild() {}}}),
+    latLngToContainerPoint: ll => {
+        const x = (ll[1] + 180) / 360 * scale;
+        const s = Math.sin(ll[0] * Math.PI / 180);
+        return {x: x, y: (0.5 - Math.log((1 + s) / (1 - s)) / (4 * Math.PI)) * scale};
+    },
+};
+eval(layerJs);
+let t0 = performance.now();
+const layer = new L.TowerCanvasLayer(packed, 100000, '<svg/>');
+const decodeMs = performance.now() - t0;
+layer._map = map;
+layer.onAdd(map);
+const times = [];
+for (let i = 0; i < 20; i++) { drawn = 0; layer._redraw(); times.push(layer.lastDrawMs); }
+times.sort((a, b) => a - b);
+console.log(decodeMs.toFixed(1), times[10].toFixed(1), drawn);
+"""
+
+
+def make_lines(n_towers, per_line=50, seed=0):
+    """한반도 범위 안 무작위 직선 선로 (선로당 송전탑 per_line개 + 양 끝점)"""
+    rng = np.random.default_rng(seed)
+    voltages = [765, 345, 154]
+    lines = []
+    for i in range((n_towers + per_line - 1) // per_line):
+        start = (rng.uniform(34.5, 38.0), rng.uniform(126.3, 129.3))
+        end = (start[0] + rng.uniform(-0.5, 0.5), start[1] + rng.uniform(-0.5, 0.5))
+        t = np.linspace(0, 1, per_line + 2)
+        coords = np.column_stack([start[0] + t * (end[0] - start[0]),
+                                  start[1] + t * (end[1] - start[1])]).round(6).tolist()
+        lines.append({"voltage": voltages[i % 3], "coords": coords})
+    return lines
+
+
+def build(mode, lines):
+    import folium
+    import korea_grid_map as grid
+
+    m = folium.Map(location=[36.3, 127.8], zoom_start=7, tiles=None)
+    groups = {f"v{v}": folium.FeatureGroup(name=f"{v}kV").add_to(m) for v in (765, 345, 154)}
+    if mode == "icons":
+        for line in lines:
+            color = grid.VOLTAGE_STYLES[line["voltage"]]["color"]
+            grid._add_tower_icons(line["coords"], color, groups[f"v{line['voltage']}"])
+    else:
+        points = {}
+        for line in lines:
+            points.setdefault(line["voltage"], []).extend(line["coords"][1:-1])
+        grid.add_tower_canvas(groups, points)
+    return m.get_root().render()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="송전탑 렌더링: DivIcon vs 캔버스")
+    parser.add_argument("--towers", type=int, default=50000)
+    args = parser.parse_args()
+
+    from tower_layer import TOWER_LAYER_JS, pack_coords
+
+    lines = make_lines(args.towers)
+    n_towers = sum(len(line["coords"]) - 2 for line in lines)
+    node = shutil.which("node")
+
+    print(f"송전탑 {n_towers}개")
+    print(f"{'방식':<8}{'HTML':>10}{'생성':>10}{'JS 파싱':>10}{'DOM 노드':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("icons", "canvas"):
+            start = time.perf_counter()
+            html = build(mode, lines)
+            elapsed = time.perf_counter() - start
+            script_path = os.path.join(tmp, f"{mode}.js")
+            with open(script_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(re.findall(r"<script>(.*?)</script>", html, re.S)))
+            parse_ms = "-"
+            if node:
+                out = subprocess.run([node, "-e", COMPILE_JS, script_path],
+                                     capture_output=True, text=True, check=True)
+                parse_ms = f"{float(out.stdout):.0f}ms"
+            dom_nodes = n_towers if mode == "icons" else html.count("new L.TowerCanvasLayer")
+            print(f"{mode:<8}{len(html.encode('utf-8')) / 1024:>8.0f}KB{elapsed:>9.1f}s"
+                  f"{parse_ms:>10}{dom_nodes:>10}")
+
+        if node:
+            layer_path = os.path.join(tmp, "layer.js")
+            packed_path = os.path.join(tmp, "packed.txt")
+            with open(layer_path, "w", encoding="utf-8") as f:
+                f.write(TOWER_LAYER_JS)
+            with open(packed_path, "w", encoding="ascii") as f:
+                f.write(pack_coords([c for line in lines for c in line["coords"][1:-1]]))
+            out = subprocess.run([node, "-e", FRAME_JS, layer_path, packed_path],
+                                 capture_output=True, text=True, check=True)
+            decode_ms, frame_ms, drawn = out.stdout.split()
+            print(f"캔버스 레이어 (node 모의, 래스터화 제외): 디코드 {decode_ms}ms, "
+                  f"프레임 {frame_ms}ms ({drawn}개 그림)")
+
+
+if __name__ == "__main__":
+    main()
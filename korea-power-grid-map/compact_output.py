@@ -0,0 +1,157 @@
+"""
+압축 HTML 출력 (스타일/아이콘 중복 제거 + FeatureGroup별 GeoJSON)
+- 서로 다른 스타일/아이콘/팝업 옵션을 페이지에 한 번만 정의하고 피처는 키("s0")로 참조
+- FeatureGroup마다 피처를 JS 문장 여러 개 대신 FeatureCollection 하나로 내보냄
+- 팝업 HTML 틀(create_popup_html과 같은 마크업)은 JS 함수 하나로 만들고 피처에는 제목/항목만 저장
+- 줌 단계별 선로(line_geometry.py)는 선로마다 남긴 단계의 델타 인코딩 좌표만 저장하고 zoomend에서 바꿔 그림
+"""
+
+import json
+
+from branca.element import MacroElement
+from jinja2 import Template
+
+from line_geometry import COORD_SCALE, decode
+
+
+def _js(obj):
+    """스크립트 안에 넣을 압축 JSON (</script> 조기 종료 방지)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+class CompactStyles(MacroElement):
+    """스타일 테이블 + 공용 JS 함수 (지도에 레이어보다 먼저 추가)"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = {{ this.table_js() }};
+        {% if this.tiered %}function {{ this.get_name() }}_decode(q) {
+            var out = [], lat = 0, lng = 0;
+            for (var i = 0; i < q.length; i += 2) {
+                lat += q[i]; lng += q[i + 1];
+                out.push([lat / {{ this.coord_scale }}, lng / {{ this.coord_scale }}]);
+            }
+            return out;
+        }
+        function {{ this.get_name() }}_tiered(layer, q) {
+            var tiers = q.map(function (t) { return {{ this.get_name() }}_decode(t[1]); });
+            function update() {
+                var zoom = map.getZoom(), k = 0;
+                while (k + 1 < q.length && zoom >= q[k + 1][0]) { k++; }
+                if (layer._tier !== k) { layer._tier = k; layer.setLatLngs(tiers[k]); }
+            }
+            var map = null;
+            layer.on('add', function () { map = layer._map; map.on('zoomend', update); update(); });
+            layer.on('remove', function () { map.off('zoomend', update); });
+        }
+        {% endif %}function {{ this.get_name() }}_popup(title, fields) {
+            var rows = fields.map(function (f) {
+                return '<tr><td style="font-weight:600;color:#555;padding:3px 10px 3px 0;">' + f[0] +
+                       '</td><td style="padding:3px 0;">' + f[1] + '</td></tr>';
+            }).join('');
+            return '<div style="font-family:\\'Malgun Gothic\\',sans-serif;min-width:180px;">' +
+                   '<div style="background:#1e3a5f;color:#fff;padding:6px 10px;border-radius:4px 4px 0 0;' +
+                   'font-size:13px;font-weight:700;">' + title + '</div>' +
+                   '<table style="font-size:12px;padding:6px 10px;">' + rows + '</table></div>';
+        }
+        {% if this.keyed %}var {{ this.get_name() }}_keyed = {};
+        {% endif %}function {{ this.get_name() }}_layer(fc) {
+            var S = {{ this.get_name() }};
+            var g = L.geoJSON(fc, {
+                pointToLayer: function (f, latlng) {
+                    var s = S[f.properties.s];
+                    if (s.kind === 'circle') { return L.circleMarker(latlng, s.options); }
+                    var icon = s.kind === 'div' ? L.divIcon(s.icon) : L.AwesomeMarkers.icon(s.icon);
+                    return L.marker(latlng, {icon: icon});
+                },
+                style: function (f) { return S[f.properties.s].options; },
+                onEachFeature: function (f, layer) {
+                    var p = f.properties, s = S[p.s], tip = p.t || s.tooltip;
+                    {% if this.tiered %}if (p.q) { {{ this.get_name() }}_tiered(layer, p.q); }
+                    {% endif %}                    if (tip) { layer.bindTooltip('<div>' + tip + '</div>', {sticky: true}); }
+                    if (p.n) {
+                        layer.bindPopup({{ this.get_name() }}_popup(p.n, p.f), {maxWidth: s.popupWidth});
+                    }
+                }
+            });
+            {% if this.keyed %}// 키별 (GeoJSON 그룹, 레이어) 목록: 시간축 컨트롤이 그룹에서 넣고 빼기만 함
+            g.eachLayer(function (l) {
+                var k = l.feature.properties.k, K = {{ this.get_name() }}_keyed;
+                if (k) { (K[k] = K[k] || []).push([g, l]); }
+            });
+            {% endif %}return g;
+        }
+        {% endmacro %}
+    """)
+
+    def __init__(self):
+        super().__init__()
+        self._name = "GridStyles"
+        self.entries = []
+        self._keys = {}
+        # True면 피처 키("k")별 레이어 목록을 JS에 유지 (grid_history.py)
+        self.keyed = False
+        # True면 줌 단계별 선로가 있어 단계 전환 JS를 포함 (CompactLayer.add_tiered_line)
+        self.tiered = False
+        self.coord_scale = COORD_SCALE
+
+    def intern(self, entry):
+        """스타일 항목을 등록하고 키 반환 (같은 내용이면 같은 키)"""
+        signature = json.dumps(entry, sort_keys=True, ensure_ascii=False)
+        if signature not in self._keys:
+            self._keys[signature] = f"s{len(self.entries)}"
+            self.entries.append(entry)
+        return self._keys[signature]
+
+    def table_js(self):
+        return _js({f"s{i}": entry for i, entry in enumerate(self.entries)})
+
+
+class CompactLayer(MacroElement):
+    """부모 FeatureGroup의 피처 전체를 담은 GeoJSON FeatureCollection 하나"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        {{ this.styles.get_name() }}_layer({{ this.collection_js() }})
+            .addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, styles):
+        super().__init__()
+        self._name = "CompactLayer"
+        self.styles = styles
+        self.features = []
+
+    def _add(self, geometry, style_key, title, fields, tooltip, key=None):
+        props = {"s": style_key}
+        if key is not None:
+            props["k"] = key
+        if title is not None:
+            props["n"] = title
+            props["f"] = [[k, v] for k, v in fields.items()]
+        if tooltip is not None:
+            props["t"] = tooltip
+        self.features.append({"type": "Feature", "geometry": geometry, "properties": props})
+
+    def add_point(self, lat, lng, style_key, title=None, fields=None, tooltip=None, key=None):
+        self._add({"type": "Point", "coordinates": [lng, lat]}, style_key, title, fields, tooltip,
+                  key)
+
+    def add_line(self, coords, style_key, title=None, fields=None, tooltip=None, key=None):
+        self._add({"type": "LineString", "coordinates": [[lng, lat] for lat, lng in coords]},
+                  style_key, title, fields, tooltip, key)
+
+    def add_tiered_line(self, encoded, style_key, title=None, fields=None, tooltip=None, key=None):
+        """encoded: [[최소 줌, 델타 인코딩 좌표], ...] (line_geometry.select_tiers, 브라우저에서 풀어서 그림)
+        단계가 하나뿐이면 바꿀 것이 없으므로 단순화된 좌표를 일반 선으로 저장
+        """
+        if len(encoded) == 1:
+            self.add_line(decode(encoded[0][1]), style_key, title, fields, tooltip, key)
+            return
+        self.styles.tiered = True
+        self._add({"type": "LineString", "coordinates": []}, style_key, title, fields, tooltip, key)
+        self.features[-1]["properties"]["q"] = encoded
+
+    def collection_js(self):
+        return _js({"type": "FeatureCollection", "features": self.features})
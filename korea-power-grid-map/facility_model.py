@@ -0,0 +1,233 @@
+"""
+시설 데이터 타입 모델
+- 행 단위: __slots__ 데이터클래스 (PowerPlant / Substation / City), 숫자 필드는 db_schema.sql과 같은 이름
+  (capacity_mw, capacity_mva, voltage_kv, population)
+- 대량 데이터: FacilityTable 열 저장 (좌표/수치는 NumPy 배열, 유형/운영사/지역은 정수 코드 + 이름 목록,
+  시설 이름은 UTF-8 버퍼 하나 + 오프셋)
+- 문자열 표시("10,720MW", "2,600만")는 팝업을 만들 때만 format_* 함수로 생성
+- 유형/운영사/지역별 합계는 np.bincount 한 번 (문자열 재파싱 없음)
+
+사용법:
+    python facility_model.py            # 현재 데이터의 유형/운영사/지역별 설비용량
+"""
+
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+# 시도 대표 좌표 (지역 경계 데이터가 없으므로 가장 가까운 대표 좌표의 시도로 분류)
+REGION_CENTERS = {
+    "서울": (37.566, 126.978), "인천": (37.456, 126.705), "경기": (37.275, 127.009),
+    "강원": (37.885, 127.730), "충북": (36.635, 127.491), "충남": (36.659, 126.673),
+    "대전": (36.351, 127.385), "세종": (36.480, 127.289), "전북": (35.820, 127.109),
+    "전남": (34.816, 126.463), "광주": (35.160, 126.851), "경북": (36.576, 128.506),
+    "대구": (35.871, 128.602), "경남": (35.238, 128.692), "울산": (35.539, 129.311),
+    "부산": (35.180, 129.076), "제주": (33.489, 126.498),
+}
+
+
+# ============================================================
+# 표시 형식 (팝업 생성 시점에만 사용)
+# ============================================================
+
+def format_mw(value):
+    return "-" if value is None else f"{value:,.0f}MW"
+
+
+def format_mva(value):
+    return "-" if value is None else f"{value:,.0f}MVA"
+
+
+def format_population(value):
+    """26000000 → '2,600만'"""
+    return "-" if value is None else f"{value / 10000:,.0f}만"
+
+
+# ============================================================
+# 행 단위 모델
+# ============================================================
+
+def _number(item, key, legacy_key):
+    """숫자 필드 읽기 (이전 형식의 '10,720MW' 문자열도 허용)"""
+    from grid_db import parse_quantity
+
+    value = item.get(key)
+    return parse_quantity(item.get(legacy_key)) if value is None else value
+
+
+@dataclass(slots=True)
+class PowerPlant:
+    name: str
+    type: str
+    lat: float
+    lng: float
+    capacity_mw: float
+    units: int
+    operator: str
+
+    @classmethod
+    def from_dict(cls, item):
+        return cls(item["name"], item["type"], item["lat"], item["lng"],
+                   _number(item, "capacity_mw", "capacity"), item["units"], item["operator"])
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class Substation:
+    name: str
+    type: str
+    lat: float
+    lng: float
+    voltage_kv: int
+    capacity_mva: float
+
+    @classmethod
+    def from_dict(cls, item):
+        return cls(item["name"], item["type"], item["lat"], item["lng"],
+                   item.get("voltage_kv", item.get("voltage")),
+                   _number(item, "capacity_mva", "capacity"))
+
+    def to_dict(self):
+        """korea_grid_map 딕셔너리 형식 (전압 키는 "voltage")"""
+        item = asdict(self)
+        item["voltage"] = item.pop("voltage_kv")
+        return item
+
+
+@dataclass(slots=True)
+class City:
+    name: str
+    lat: float
+    lng: float
+    population: int
+
+    @classmethod
+    def from_dict(cls, item):
+        population = item["population"]
+        if isinstance(population, str):
+            population = int(population.replace(",", "").replace("만", "")) * 10000
+        return cls(item["name"], item["lat"], item["lng"], population)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+# ============================================================
+# 열 저장 (대량 데이터)
+# ============================================================
+
+class StringColumn:
+    """문자열 목록을 UTF-8 버퍼 하나 + 오프셋 배열로 저장"""
+
+    def __init__(self, values):
+        encoded = [v.encode("utf-8") for v in values]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=self.offsets[1:])
+        self.buffer = b"".join(encoded)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    @property
+    def nbytes(self):
+        return len(self.buffer) + self.offsets.nbytes
+
+
+def categorize(values):
+    """문자열 목록 → (int16 코드 배열, 이름 목록)"""
+    labels, codes = {}, np.empty(len(values), dtype=np.int16)
+    for i, value in enumerate(values):
+        codes[i] = labels.setdefault(value, len(labels))
+    return codes, list(labels)
+
+
+def assign_regions(lat, lng):
+    """가장 가까운 시도 대표 좌표로 지역 코드 배정 (청크 단위로 거리 행렬 계산)"""
+    centers = np.array(list(REGION_CENTERS.values()))
+    k = np.cos(np.radians(36.0))
+    codes = np.empty(len(lat), dtype=np.int16)
+    for start in range(0, len(lat), 100000):
+        end = start + 100000
+        dlat = lat[start:end, None] - centers[:, 0]
+        dlng = (lng[start:end, None] - centers[:, 1]) * k
+        codes[start:end] = np.argmin(dlat * dlat + dlng * dlng, axis=1)
+    return codes
+
+
+class FacilityTable:
+    """시설 열 저장: 이름/좌표 + 수치 열(numeric) + 범주 열(categories: 코드 배열과 이름 목록)"""
+
+    def __init__(self, names, lat, lng, numeric, categorical):
+        self.names = StringColumn(names)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.numeric = {k: np.asarray(v, dtype=np.float64) for k, v in numeric.items()}
+        self.codes, self.labels = {}, {}
+        for key, values in categorical.items():
+            self.codes[key], self.labels[key] = categorize(values)
+        self.codes["region"] = assign_regions(self.lat, self.lng)
+        self.labels["region"] = list(REGION_CENTERS)
+
+    @classmethod
+    def from_plants(cls, plants):
+        plants = [p if isinstance(p, PowerPlant) else PowerPlant.from_dict(p) for p in plants]
+        return cls([p.name for p in plants], [p.lat for p in plants], [p.lng for p in plants],
+                   {"capacity_mw": [p.capacity_mw for p in plants],
+                    "units": [p.units for p in plants]},
+                   {"type": [p.type for p in plants], "operator": [p.operator for p in plants]})
+
+    @classmethod
+    def from_substations(cls, substations):
+        subs = [s if isinstance(s, Substation) else Substation.from_dict(s) for s in substations]
+        return cls([s.name for s in subs], [s.lat for s in subs], [s.lng for s in subs],
+                   {"capacity_mva": [s.capacity_mva for s in subs],
+                    "voltage_kv": [s.voltage_kv for s in subs]},
+                   {"type": [s.type for s in subs]})
+
+    def __len__(self):
+        return len(self.lat)
+
+    def total_by(self, value, by):
+        """범주(by)별 value 합계 → {이름: 합계} (큰 순서)"""
+        codes, labels = self.codes[by], self.labels[by]
+        totals = np.bincount(codes, weights=np.nan_to_num(self.numeric[value]), minlength=len(labels))
+        order = np.argsort(-totals, kind="stable")
+        return {labels[i]: float(totals[i]) for i in order if totals[i] > 0}
+
+    def top(self, value, n=10):
+        """value 상위 n개 (이름, 값)"""
+        column = self.numeric[value]
+        idx = np.argsort(-np.nan_to_num(column), kind="stable")[:n]
+        return [(self.names[i], float(column[i])) for i in idx]
+
+    @property
+    def nbytes(self):
+        total = self.names.nbytes + self.lat.nbytes + self.lng.nbytes
+        total += sum(a.nbytes for a in self.numeric.values())
+        total += sum(a.nbytes for a in self.codes.values())
+        return total
+
+
+def main():
+    import korea_grid_map as data
+
+    plants = FacilityTable.from_plants(data.POWER_PLANTS)
+    substations = FacilityTable.from_substations(data.SUBSTATIONS)
+    print(f"발전소 {len(plants)}개, 변전소 {len(substations)}개")
+    for by, title in (("type", "유형별"), ("operator", "운영사별"), ("region", "지역별")):
+        print(f"[발전 설비용량 {title}]")
+        for label, total in plants.total_by("capacity_mw", by).items():
+            label = data.facility_style(label)["label"] if by == "type" else label
+            print(f"  {label:<12} {format_mw(total):>10}")
+    print("[변전 용량 지역별]")
+    for label, total in substations.total_by("capacity_mva", "region").items():
+        print(f"  {label:<12} {format_mva(total):>10}")
+
+
+if __name__ == "__main__":
+    main()
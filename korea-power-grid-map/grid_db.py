@@ -0,0 +1,443 @@
+"""
+송전망 데이터 접근 계층 (SQLite, db_schema.sql과 같은 테이블 구조)
+- power_plants / substations / transmission_lines / transmission_towers / hvdc_links /
+  regional_power_stats
+- PostGIS GEOMETRY 대신 점은 lat/lng 컬럼, 선형(route)은 GeoJSON LineString 텍스트
+- 범위 질의는 SQLite 내장 R*Tree 가상 테이블(<테이블>_rtree)로 인덱싱
+- 질의는 고정 SQL + 파라미터 바인딩 (연결별 prepared statement 캐시 재사용), fetchall 일괄 조회
+- 연결 풀: 스레드 간 재사용 가능한 읽기 연결을 size개까지 유지
+- 반환 형식은 korea_grid_map의 POWER_PLANTS 등과 같은 딕셔너리 (지도 함수 그대로 사용)
+
+사용법:
+    python grid_db.py init grid.db              # 스키마 생성 + korea_grid_map 데이터 적재
+    python grid_db.py query grid.db --bbox 36.8 126.3 37.9 127.6 --voltage 765 345
+"""
+
+import argparse
+import json
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+
+POOL_SIZE = 4
+# 연결마다 유지할 prepared statement 수
+CACHED_STATEMENTS = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS power_plants (
+    id              INTEGER PRIMARY KEY,
+    name            TEXT NOT NULL,
+    name_en         TEXT,
+    plant_type      TEXT NOT NULL,
+    capacity_mw     REAL,
+    unit_count      INTEGER,
+    operator        TEXT,
+    status          TEXT DEFAULT 'operating',
+    commissioned_at TEXT,
+    address         TEXT,
+    lat             REAL NOT NULL,
+    lng             REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_power_plants_type ON power_plants(plant_type);
+
+CREATE TABLE IF NOT EXISTS substations (
+    id              INTEGER PRIMARY KEY,
+    name            TEXT NOT NULL,
+    name_en         TEXT,
+    voltage_kv      INTEGER NOT NULL,
+    capacity_mva    REAL,
+    sub_type        TEXT DEFAULT 'GIS',
+    regional_hq     TEXT,
+    status          TEXT DEFAULT 'operating',
+    commissioned_at TEXT,
+    address         TEXT,
+    lat             REAL NOT NULL,
+    lng             REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_substations_voltage ON substations(voltage_kv);
+
+CREATE TABLE IF NOT EXISTS transmission_lines (
+    id              INTEGER PRIMARY KEY,
+    name            TEXT NOT NULL,
+    voltage_kv      INTEGER NOT NULL,
+    line_type       TEXT DEFAULT 'overhead',
+    circuit_count   INTEGER DEFAULT 2,
+    length_km       REAL,
+    conductor_type  TEXT,
+    from_facility   INTEGER,
+    from_type       TEXT,
+    to_facility     INTEGER,
+    to_type         TEXT,
+    status          TEXT DEFAULT 'operating',
+    commissioned_at TEXT,
+    route           TEXT                            -- GeoJSON LineString
+);
+CREATE INDEX IF NOT EXISTS idx_tl_voltage ON transmission_lines(voltage_kv);
+
+CREATE TABLE IF NOT EXISTS transmission_towers (
+    id              INTEGER PRIMARY KEY,
+    line_id         INTEGER NOT NULL REFERENCES transmission_lines(id),
+    tower_number    TEXT,
+    tower_type      TEXT,
+    height_m        REAL,
+    installed_at    TEXT,
+    last_inspected  TEXT,
+    lat             REAL NOT NULL,
+    lng             REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_towers_line ON transmission_towers(line_id);
+
+CREATE TABLE IF NOT EXISTS hvdc_links (
+    id              INTEGER PRIMARY KEY,
+    name            TEXT NOT NULL,
+    capacity_mw     REAL,
+    voltage_kv      INTEGER,
+    cable_type      TEXT,
+    length_km       REAL,
+    converter_from  TEXT,
+    converter_to    TEXT,
+    status          TEXT DEFAULT 'operating',
+    commissioned_at TEXT,
+    route           TEXT                            -- GeoJSON LineString
+);
+
+CREATE TABLE IF NOT EXISTS regional_power_stats (
+    id              INTEGER PRIMARY KEY,
+    region_name     TEXT NOT NULL,
+    year            INTEGER NOT NULL,
+    demand_mw       REAL,
+    supply_mw       REAL,
+    reserve_rate    REAL,
+    population      INTEGER,
+    UNIQUE (region_name, year)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS power_plants_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng);
+CREATE VIRTUAL TABLE IF NOT EXISTS substations_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng);
+CREATE VIRTUAL TABLE IF NOT EXISTS transmission_lines_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng);
+CREATE VIRTUAL TABLE IF NOT EXISTS transmission_towers_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng);
+CREATE VIRTUAL TABLE IF NOT EXISTS hvdc_links_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng);
+"""
+
+# 범위 조건 (R*Tree 조인), 테이블 별칭 t
+BBOX_JOIN = (" JOIN {table}_rtree r ON r.id = t.id"
+             " WHERE r.max_lat >= :south AND r.min_lat <= :north"
+             " AND r.max_lng >= :west AND r.min_lng <= :east")
+
+PLANT_SQL = ("SELECT t.name, t.plant_type, t.lat, t.lng, t.capacity_mw, t.unit_count, t.operator,"
+             " t.status, t.commissioned_at FROM power_plants t")
+SUBSTATION_SQL = ("SELECT t.name, t.voltage_kv, t.lat, t.lng, t.capacity_mva, t.status,"
+                  " t.commissioned_at FROM substations t")
+LINE_SQL = ("SELECT t.id, t.name, t.voltage_kv, t.length_km, t.route, t.status, t.commissioned_at,"
+            " COALESCE(pf.name, sf.name), COALESCE(pt.name, st.name)"
+            " FROM transmission_lines t"
+            " LEFT JOIN power_plants pf ON t.from_type = 'power_plant' AND pf.id = t.from_facility"
+            " LEFT JOIN substations sf ON t.from_type = 'substation' AND sf.id = t.from_facility"
+            " LEFT JOIN power_plants pt ON t.to_type = 'power_plant' AND pt.id = t.to_facility"
+            " LEFT JOIN substations st ON t.to_type = 'substation' AND st.id = t.to_facility")
+HVDC_SQL = ("SELECT t.id, t.name, t.length_km, t.route, t.status, t.commissioned_at,"
+            " t.converter_from, t.converter_to FROM hvdc_links t")
+STATS_SQL = ("SELECT region_name, year, demand_mw, supply_mw, reserve_rate, population"
+             " FROM regional_power_stats ORDER BY year, region_name")
+TOWER_SQL = ("SELECT t.line_id, t.tower_number, t.lat, t.lng, l.voltage_kv"
+             " FROM transmission_towers t JOIN transmission_lines l ON l.id = t.line_id")
+
+
+def parse_quantity(text):
+    """'10,720MW' / '6,000MVA' → 10720.0 (숫자면 그대로)"""
+    if text is None or isinstance(text, (int, float)):
+        return text
+    digits = "".join(ch for ch in str(text) if ch.isdigit() or ch == ".")
+    return float(digits) if digits else None
+
+
+def _route(coords):
+    """[[lat, lng], ...] → GeoJSON LineString 텍스트 ([lng, lat] 순서)"""
+    return json.dumps({"type": "LineString", "coordinates": [[lng, lat] for lat, lng in coords]},
+                      separators=(",", ":"))
+
+
+def _coords(route):
+    return [[lat, lng] for lng, lat in json.loads(route)["coordinates"]]
+
+
+def _bounds(coords):
+    lats = [c[0] for c in coords]
+    lngs = [c[1] for c in coords]
+    return min(lats), max(lats), min(lngs), max(lngs)
+
+
+def _substation_type(voltage):
+    # 지도 아이콘은 765/345kV만 구분 (그 외 전압은 345kV 스타일)
+    return "substation_765" if voltage >= 765 else "substation_345"
+
+
+class ConnectionPool:
+    """SQLite 연결 풀 (필요할 때 연결을 만들고 size개까지 재사용)"""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False,
+                               cached_statements=CACHED_STATEMENTS)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class GridDB:
+    """db_schema.sql 구조의 SQLite 파일 조회 (bbox=(남, 서, 북, 동), voltages=[765, 345, ...])"""
+
+    def __init__(self, path, pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+
+    def close(self):
+        self.pool.close()
+
+    def _fetch(self, sql, table, bbox=None, where=(), params=None):
+        """고정 SQL 조각을 조합해 일괄 조회 (값은 모두 바인딩 파라미터)"""
+        params = dict(params or {})
+        clauses = list(where)
+        if bbox is not None:
+            sql += BBOX_JOIN.format(table=table)
+            params.update(zip(("south", "west", "north", "east"), bbox))
+        elif clauses:
+            sql += " WHERE 1"
+        if clauses:
+            sql += "".join(f" AND {c}" for c in clauses)
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _voltage_filter(voltages, column="t.voltage_kv"):
+        """전압 목록 조건 (목록 길이별 SQL이 고정되므로 statement 캐시 적중)"""
+        kv = [v for v in voltages or () if isinstance(v, int)]
+        names = [f":v{i}" for i in range(len(kv))]
+        return f"{column} IN ({', '.join(names)})", {f"v{i}": v for i, v in enumerate(kv)}
+
+    def plants(self, bbox=None):
+        rows = self._fetch(PLANT_SQL, "power_plants", bbox)
+        return [{"name": name, "type": kind, "lat": lat, "lng": lng,
+                 "capacity_mw": capacity, "units": units, "operator": operator,
+                 "status": status, "commissioned_at": commissioned}
+                for name, kind, lat, lng, capacity, units, operator, status, commissioned in rows]
+
+    def substations(self, bbox=None, voltages=None):
+        where, params = ([], {})
+        if voltages is not None:
+            clause, params = self._voltage_filter(voltages)
+            where = [clause]
+        rows = self._fetch(SUBSTATION_SQL, "substations", bbox, where, params)
+        return [{"name": name, "type": _substation_type(voltage), "lat": lat, "lng": lng,
+                 "voltage": voltage, "capacity_mva": capacity,
+                 "status": status, "commissioned_at": commissioned}
+                for name, voltage, lat, lng, capacity, status, commissioned in rows]
+
+    def lines(self, bbox=None, voltages=None):
+        """교류 송전선로 + HVDC 연계선 (voltages에 'HVDC'를 넣으면 HVDC 포함)"""
+        result = []
+        if voltages is None or any(isinstance(v, int) for v in voltages):
+            where, params = ([], {})
+            if voltages is not None:
+                clause, params = self._voltage_filter(voltages)
+                where = [clause]
+            rows = self._fetch(LINE_SQL, "transmission_lines", bbox, where, params)
+            for line_id, name, voltage, length, route, status, commissioned, start, end in rows:
+                result.append({"id": line_id, "name": name, "voltage": voltage,
+                               "from": start or "-", "to": end or "-",
+                               "length": length, "coords": _coords(route),
+                               "status": status, "commissioned_at": commissioned})
+        if voltages is None or "HVDC" in voltages:
+            for _, name, length, route, status, commissioned, start, end in self._fetch(
+                    HVDC_SQL, "hvdc_links", bbox):
+                result.append({"name": name, "voltage": "HVDC", "from": start, "to": end,
+                               "length": length, "coords": _coords(route),
+                               "status": status, "commissioned_at": commissioned})
+        return result
+
+    def towers(self, bbox=None, voltages=None):
+        """송전탑 (line_id, 번호, 위도, 경도, 전압) 튜플 목록"""
+        where, params = ([], {})
+        if voltages is not None:
+            clause, params = self._voltage_filter(voltages, "l.voltage_kv")
+            where = [clause]
+        return self._fetch(TOWER_SQL, "transmission_towers", bbox, where, params)
+
+    def regional_stats(self):
+        """regional_power_stats 전체 (연도, 지역 순)"""
+        with self.pool.connection() as conn:
+            rows = conn.execute(STATS_SQL).fetchall()
+        return [{"region": region, "year": year, "demand_mw": demand, "supply_mw": supply,
+                 "reserve_rate": reserve, "population": population}
+                for region, year, demand, supply, reserve, population in rows]
+
+    def counts(self):
+        with self.pool.connection() as conn:
+            return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("power_plants", "substations", "transmission_lines",
+                                  "transmission_towers", "hvdc_links", "regional_power_stats")}
+
+
+# ============================================================
+# 적재
+# ============================================================
+
+def create_schema(conn):
+    conn.executescript(SCHEMA)
+
+
+def import_grid(path, plants, substations, lines, regional_stats=()):
+    """모듈 데이터(POWER_PLANTS 등)를 SQLite에 일괄 적재 (기존 행은 비움)
+    regional_stats: [{"region", "year", "demand_mw", "supply_mw", "reserve_rate",
+                      "population"}, ...]
+    """
+    from grid_graph import PLANT, build_grid_graph
+
+    # 선로 끝점을 발전소/변전소 번호로 해석 (grid_graph와 같은 규칙)
+    graph = build_grid_graph(plants, substations, lines)
+    n_plants = len(plants)
+
+    conn = sqlite3.connect(path)
+    try:
+        create_schema(conn)
+        with conn:
+            for table in ("transmission_towers", "transmission_lines", "hvdc_links",
+                          "substations", "power_plants"):
+                conn.execute(f"DELETE FROM {table}")
+                conn.execute(f"DELETE FROM {table}_rtree")
+
+            conn.executemany(
+                "INSERT INTO power_plants (id, name, plant_type, capacity_mw, unit_count, operator,"
+                " status, commissioned_at, lat, lng) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(i + 1, p["name"], p["type"], p["capacity_mw"], p["units"], p["operator"],
+                  p.get("status", "operating"), p.get("commissioned_at"), p["lat"], p["lng"])
+                 for i, p in enumerate(plants)])
+            conn.executemany(
+                "INSERT INTO substations (id, name, voltage_kv, capacity_mva, status,"
+                " commissioned_at, lat, lng) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(i + 1, s["name"], s["voltage"], s["capacity_mva"], s.get("status", "operating"),
+                  s.get("commissioned_at"), s["lat"], s["lng"])
+                 for i, s in enumerate(substations)])
+
+            def facility(node):
+                # 단말 노드(해석 실패)는 FK 없이 저장
+                if node >= n_plants + len(substations):
+                    return None, None
+                if graph.kind[node] == PLANT:
+                    return node + 1, "power_plant"
+                return node - n_plants + 1, "substation"
+
+            # 선로별 첫 구간의 시작 노드, 마지막 구간의 끝 노드
+            ends = {}
+            for e, li in enumerate(graph.edge_line.tolist()):
+                start, _ = ends.get(li, (int(graph.edge_u[e]), None))
+                ends[li] = (start, int(graph.edge_v[e]))
+
+            line_rows, hvdc_rows, towers = [], [], []
+            for li, line in enumerate(lines):
+                start, end = ends[li]
+                if line["voltage"] == "HVDC":
+                    hvdc_rows.append((len(hvdc_rows) + 1, line["name"], line["length"],
+                                      line["from"], line["to"], line.get("status", "operating"),
+                                      line.get("commissioned_at"), _route(line["coords"])))
+                    continue
+                line_id = len(line_rows) + 1
+                line_rows.append((line_id, line["name"], line["voltage"], line["length"],
+                                  *facility(start), *facility(end), line.get("status", "operating"),
+                                  line.get("commissioned_at"), _route(line["coords"])))
+                for k, (lat, lng) in enumerate(line["coords"][1:-1], start=1):
+                    towers.append((line_id, f"#{k:03d}", lat, lng))
+
+            conn.executemany(
+                "INSERT INTO transmission_lines (id, name, voltage_kv, length_km, from_facility,"
+                " from_type, to_facility, to_type, status, commissioned_at, route)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                line_rows)
+            conn.executemany(
+                "INSERT INTO hvdc_links (id, name, length_km, converter_from, converter_to, status,"
+                " commissioned_at, route) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", hvdc_rows)
+            conn.executemany(
+                "INSERT INTO transmission_towers (line_id, tower_number, lat, lng)"
+                " VALUES (?, ?, ?, ?)", towers)
+            conn.execute("DELETE FROM regional_power_stats")
+            conn.executemany(
+                "INSERT INTO regional_power_stats (region_name, year, demand_mw, supply_mw,"
+                " reserve_rate, population) VALUES (?, ?, ?, ?, ?, ?)",
+                [(r["region"], r["year"], r.get("demand_mw"), r.get("supply_mw"),
+                  r.get("reserve_rate"), r.get("population")) for r in regional_stats])
+            rebuild_rtree(conn)
+    finally:
+        conn.close()
+
+
+def rebuild_rtree(conn):
+    """모든 R*Tree 인덱스를 원본 테이블에서 다시 채움"""
+    for table in ("power_plants", "substations", "transmission_towers"):
+        conn.execute(f"DELETE FROM {table}_rtree")
+        conn.execute(f"INSERT INTO {table}_rtree SELECT id, lat, lat, lng, lng FROM {table}")
+    for table in ("transmission_lines", "hvdc_links"):
+        conn.execute(f"DELETE FROM {table}_rtree")
+        conn.executemany(
+            f"INSERT INTO {table}_rtree VALUES (?, ?, ?, ?, ?)",
+            ((row_id, *_bounds(_coords(route)))
+             for row_id, route in conn.execute(f"SELECT id, route FROM {table}")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="송전망 SQLite 데이터 접근 계층")
+    parser.add_argument("command", choices=["init", "query"])
+    parser.add_argument("db", help="SQLite 파일 경로")
+    parser.add_argument("--bbox", type=float, nargs=4, metavar=("SOUTH", "WEST", "NORTH", "EAST"))
+    parser.add_argument("--voltage", nargs="+", help="전압 필터 (예: 765 345 HVDC)")
+    args = parser.parse_args()
+
+    if args.command == "init":
+        import korea_grid_map as data
+        from regional_balance import sample_regional_stats
+
+        import_grid(args.db, data.POWER_PLANTS, data.SUBSTATIONS, data.TRANSMISSION_LINES,
+                    sample_regional_stats())
+        db = GridDB(args.db)
+        print(f"✅ {args.db} 적재 완료: {db.counts()}")
+        return
+
+    voltages = [int(v) if v.isdigit() else v for v in args.voltage] if args.voltage else None
+    db = GridDB(args.db)
+    start = time.perf_counter()
+    plants = db.plants(args.bbox)
+    substations = db.substations(args.bbox, voltages)
+    lines = db.lines(args.bbox, voltages)
+    towers = db.towers(args.bbox, voltages)
+    elapsed = time.perf_counter() - start
+    print(f"발전소 {len(plants)}, 변전소 {len(substations)}, 선로 {len(lines)}, "
+          f"송전탑 {len(towers)} ({elapsed * 1000:.1f} ms)")
+    for line in lines:
+        print(f"  {line['voltage']}  {line['name']} ({line['from']} → {line['to']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,579 @@
+"""
+송전망 위상 그래프 엔진
+- TRANSMISSION_LINES의 시작/종점(자유 텍스트)을 발전소/변전소 노드로 해석
+  (이름 정규화 → 끝점 좌표 근접 스냅 → 해석 불가 시 끝점에 단말 노드 생성)
+- 인접 구조는 CSR(indptr / 이웃 노드 / 선로 번호) NumPy 배열
+- 도달 가능성, 연장(length) 기준 최단 경로, N-1 상정고장 분석
+- N-1은 선로마다 그래프를 다시 탐색하지 않고, DFS 한 번으로 교량(bridge)과
+  전위 순서(preorder) 구간을 구해 모든 단일 선로 고장을 한꺼번에 평가
+  (경유 변전소에서 여러 구간으로 나뉜 선로는 구간을 함께 빼고 끝점에서 국소 탐색)
+
+사용법:
+    python grid_graph.py
+    python grid_graph.py --path 영흥화력 동서울변전소
+    python grid_graph.py --check       # N-1 결과를 선로별 전수 탐색과 비교
+"""
+
+import argparse
+import heapq
+import math
+import re
+
+import numpy as np
+
+# 노드 종류
+PLANT, SUBSTATION, TERMINAL = 0, 1, 2
+KIND_LABELS = {PLANT: "발전소", SUBSTATION: "변전소", TERMINAL: "단말(미확인)"}
+
+# 시설 이름 끝의 유형 표기 (이 앞부분만 '/'로 나눠 별칭을 만듦)
+NAME_SUFFIXES = ("원자력", "화력", "LNG복합", "양수발전", "수력발전", "풍력", "변전소")
+
+# 도시를 연결할 변전소 탐색 반경 (km, 없으면 가장 가까운 변전소)
+CITY_RADIUS_KM = 15.0
+# 이름으로 못 찾은 끝점을 기존 노드에 붙이는 거리 (km)
+SNAP_KM = 1.0
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """두 지점 사이 대원 거리 (km, 배열도 가능)"""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _km(lat1, lng1, lat2, lng2):
+    """haversine_km의 스칼라 버전 (NumPy 호출 오버헤드 없음)"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_name(name):
+    """공백 제거 + 약칭 통일 ('한울원전' == '한울 원자력')"""
+    return _SPACE.sub("", name).replace("원전", "원자력")
+
+
+def name_aliases(name):
+    """시설 이름의 조회 키 목록
+    '한울(울진) 원자력' → 한울원자력, 울진원자력 / '고리/신고리 원자력' → 고리원자력, 신고리원자력
+    """
+    base = normalize_name(name)
+    variants = [base]
+    m = re.match(r"^(.*?)\((.*?)\)(.*)$", base)
+    if m:
+        variants = [m.group(1) + m.group(3), m.group(2) + m.group(3)]
+
+    aliases = []
+    for variant in variants:
+        suffix = next((s for s in NAME_SUFFIXES if variant.endswith(s) and variant != s), "")
+        stem = variant[:len(variant) - len(suffix)]
+        for part in stem.split("/"):
+            if part:
+                aliases.append(part + suffix)
+    return aliases or [base]
+
+
+class GridGraph:
+    """발전소/변전소/단말 노드와 송전선로 간선의 무방향 다중 그래프"""
+
+    def __init__(self):
+        self.names = []
+        self.kinds = []
+        self.lats = []
+        self.lngs = []
+        self.lines = []
+        self.cities = []
+        self.city_nodes = []
+        self.unresolved = []
+        self._lookup = {}
+        self._ambiguous = set()
+        self._cells = {}
+
+    # --------------------------------------------------------
+    # 구성
+    # --------------------------------------------------------
+
+    def _cell(self, lat, lng):
+        return (math.floor(lat / 0.01), math.floor(lng / 0.01))
+
+    def add_node(self, name, kind, lat, lng, aliases=None):
+        index = len(self.names)
+        self.names.append(name)
+        self.kinds.append(kind)
+        self.lats.append(lat)
+        self.lngs.append(lng)
+        for key in aliases or [normalize_name(name)]:
+            if key in self._lookup and self._lookup[key] != index:
+                self._ambiguous.add(key)
+            else:
+                self._lookup[key] = index
+        self._cells.setdefault(self._cell(lat, lng), []).append(index)
+        return index
+
+    def _snap(self, lat, lng, snap_km):
+        """좌표에서 snap_km 안의 가장 가까운 노드 (격자 버킷으로 주변 셀만 검사)"""
+        reach = max(1, math.ceil(snap_km / 1.1))
+        ci, cj = self._cell(lat, lng)
+        best, best_km = None, snap_km
+        for di in range(-reach, reach + 1):
+            for dj in range(-reach, reach + 1):
+                for index in self._cells.get((ci + di, cj + dj), ()):
+                    km = _km(lat, lng, self.lats[index], self.lngs[index])
+                    if km <= best_km:
+                        best, best_km = index, km
+        return best
+
+    def resolve(self, name, point=None, snap_km=SNAP_KM):
+        """자유 텍스트 이름(+끝점 좌표)을 노드 번호로 해석, 실패 시 None"""
+        key = normalize_name(name)
+        if key in self._lookup and key not in self._ambiguous:
+            return self._lookup[key]
+        if point is not None:
+            return self._snap(point[0], point[1], snap_km)
+        return None
+
+    def _endpoint(self, name, point, line_name, snap_km):
+        index = self.resolve(name, point, snap_km)
+        if index is None:
+            # 같은 이름의 끝점끼리는 하나의 단말 노드를 공유
+            index = self.add_node(name, TERMINAL, point[0], point[1])
+            self.unresolved.append((line_name, name))
+        return index
+
+    def finalize(self, edge_u, edge_v, edge_length, edge_line):
+        """구간(간선) 목록을 CSR 배열로 변환"""
+        n = len(self.names)
+        self.kind = np.asarray(self.kinds, dtype=np.int8)
+        self.lat = np.asarray(self.lats, dtype=np.float64)
+        self.lng = np.asarray(self.lngs, dtype=np.float64)
+        self.is_source = self.kind == PLANT
+        self.edge_u = np.asarray(edge_u, dtype=np.int32)
+        self.edge_v = np.asarray(edge_v, dtype=np.int32)
+        self.edge_length = np.asarray(edge_length, dtype=np.float64)
+        self.edge_line = np.asarray(edge_line, dtype=np.int32)
+
+        # 무방향: 간선마다 양방향 항목 2개
+        src = np.concatenate([self.edge_u, self.edge_v])
+        dst = np.concatenate([self.edge_v, self.edge_u])
+        eid = np.concatenate([np.arange(len(edge_u), dtype=np.int32)] * 2)
+        order = np.argsort(src, kind="stable")
+        self.adj_node = dst[order]
+        self.adj_edge = eid[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        return self
+
+    @property
+    def node_count(self):
+        return len(self.names)
+
+    @property
+    def edge_count(self):
+        return len(self.edge_u)
+
+    def edge_label(self, edge):
+        """'선로 이름 (시작 → 끝)' 형태의 구간 이름"""
+        line = self.lines[self.edge_line[edge]]
+        u, v = self.edge_u[edge], self.edge_v[edge]
+        return f"{line['name']} ({self.names[u]} → {self.names[v]})"
+
+    # --------------------------------------------------------
+    # 질의
+    # --------------------------------------------------------
+
+    def reachable(self, sources=None, removed_edges=()):
+        """sources(기본: 모든 발전소)에서 도달 가능한 노드 불리언 배열"""
+        if sources is None:
+            sources = np.flatnonzero(self.is_source)
+        removed = set(int(e) for e in removed_edges)
+        indptr = self.indptr.tolist()
+        adj_node = self.adj_node.tolist()
+        adj_edge = self.adj_edge.tolist()
+
+        seen = [False] * self.node_count
+        stack = []
+        for s in sources:
+            s = int(s)
+            if not seen[s]:
+                seen[s] = True
+                stack.append(s)
+        while stack:
+            v = stack.pop()
+            for i in range(indptr[v], indptr[v + 1]):
+                w = adj_node[i]
+                if not seen[w] and adj_edge[i] not in removed:
+                    seen[w] = True
+                    stack.append(w)
+        return np.asarray(seen, dtype=bool)
+
+    def shortest_path(self, source, target):
+        """연장(km) 기준 최단 경로 → (거리, 노드 목록, 선로 번호 목록), 경로 없으면 None"""
+        indptr = self.indptr.tolist()
+        adj_node = self.adj_node.tolist()
+        adj_edge = self.adj_edge.tolist()
+        length = self.edge_length.tolist()
+
+        dist = {source: 0.0}
+        prev = {}
+        heap = [(0.0, source)]
+        while heap:
+            d, v = heapq.heappop(heap)
+            if v == target:
+                break
+            if d > dist[v]:
+                continue
+            for i in range(indptr[v], indptr[v + 1]):
+                w = adj_node[i]
+                nd = d + length[adj_edge[i]]
+                if nd < dist.get(w, math.inf):
+                    dist[w] = nd
+                    prev[w] = (v, adj_edge[i])
+                    heapq.heappush(heap, (nd, w))
+
+        if target not in dist:
+            return None
+        nodes, edges = [target], []
+        while nodes[-1] != source:
+            v, e = prev[nodes[-1]]
+            nodes.append(v)
+            edges.append(e)
+        return dist[target], nodes[::-1], edges[::-1]
+
+    def _dfs_bridges(self):
+        """반복형 Tarjan DFS: 전위 번호, 하위 트리 크기, 교량(선로, 자식 노드) 목록, 연결 요소"""
+        n = self.node_count
+        indptr = self.indptr.tolist()
+        adj_node = self.adj_node.tolist()
+        adj_edge = self.adj_edge.tolist()
+
+        pre = [-1] * n
+        low = [0] * n
+        size = [0] * n
+        order = []
+        comp_start = [0] * n
+        bridges = []
+        counter = 0
+        for root in range(n):
+            if pre[root] != -1:
+                continue
+            start = counter
+            pre[root] = low[root] = counter
+            counter += 1
+            order.append(root)
+            stack = [[root, -1, indptr[root]]]
+            while stack:
+                frame = stack[-1]
+                v, parent_edge, i = frame
+                if i < indptr[v + 1]:
+                    frame[2] = i + 1
+                    e = adj_edge[i]
+                    # 부모 노드가 아니라 부모 '간선'만 건너뜀 (병렬 회선은 우회로로 취급)
+                    if e == parent_edge:
+                        continue
+                    w = adj_node[i]
+                    if pre[w] == -1:
+                        pre[w] = low[w] = counter
+                        counter += 1
+                        order.append(w)
+                        stack.append([w, e, indptr[w]])
+                    elif pre[w] < low[v]:
+                        low[v] = pre[w]
+                else:
+                    stack.pop()
+                    size[v] = counter - pre[v]
+                    comp_start[v] = start
+                    if stack:
+                        u = stack[-1][0]
+                        if low[v] < low[u]:
+                            low[u] = low[v]
+                        if low[v] > pre[u]:
+                            bridges.append((parent_edge, v))
+
+        return (np.asarray(pre, dtype=np.int64), np.asarray(size, dtype=np.int64),
+                np.asarray(order, dtype=np.int64), np.asarray(comp_start, dtype=np.int64),
+                bridges)
+
+    def line_edges(self):
+        """선로 번호 -> 그 선로의 구간(간선) 번호 배열 목록 (경유 변전소에서 나뉜 구간 포함)"""
+        counts = np.bincount(self.edge_line, minlength=len(self.lines))
+        order = np.argsort(self.edge_line, kind="stable")
+        return np.split(order, np.cumsum(counts)[:-1])
+
+    def contingency(self):
+        """모든 단일 선로 고장(N-1)을 한 번에 평가
+
+        고장 단위는 선로 하나 (경유 변전소에서 나뉜 구간은 함께 빠짐)
+        - 구간이 하나인 선로: 교량이면 DFS 하위 트리 구간으로 O(1) 평가
+        - 구간이 여러 개인 선로: 구간을 모두 빼고 끝점에서 발전원까지 국소 탐색 (_cut_off)
+
+        반환: {
+            'isolated_nodes': 평상시에도 발전원과 연결되지 않은 노드,
+            'isolated_cities': 평상시에도 발전원과 연결되지 않은 도시,
+            'bridges': 교량 구간 수,
+            'outages': [{'line', 'name', 'edges', 'stranded', 'cities'}...]  # 무언가를 고립시키는 선로만
+        }
+        """
+        pre, size, order, comp_start, bridges = self._dfs_bridges()
+        # 전위 순서로 정렬한 발전원 누적합 → 임의 하위 트리/연결 요소의 발전원 수를 O(1)로
+        gen_cum = np.concatenate([[0], np.cumsum(self.is_source[order])])
+        comp_end = comp_start + size[order[comp_start]]
+        comp_gen = gen_cum[comp_end] - gen_cum[comp_start]
+        powered = comp_gen > 0
+
+        # 도시-노드 연결 쌍 (도시는 연결된 노드 중 하나라도 발전원과 이어지면 공급 가능)
+        pair_city = np.asarray([c for c, nodes in enumerate(self.city_nodes) for _ in nodes],
+                               dtype=np.int64)
+        pair_node = np.asarray([v for nodes in self.city_nodes for v in nodes], dtype=np.int64)
+        pair_pre = pre[pair_node]
+        pair_powered = powered[pair_node]
+        n_cities = len(self.cities)
+        city_ok = np.bincount(pair_city, weights=pair_powered, minlength=n_cities) > 0
+        line_edges = self.line_edges()
+
+        def outage(li, stranded, stranded_pairs):
+            after = np.bincount(pair_city, weights=pair_powered & ~stranded_pairs,
+                                minlength=n_cities) > 0
+            return {
+                "line": li,
+                "name": self.lines[li]["name"],
+                "edges": line_edges[li].tolist(),
+                "stranded": stranded,
+                "cities": [self.cities[c]["name"] for c in np.flatnonzero(city_ok & ~after)],
+            }
+
+        outages = []
+        for e, child in bridges:
+            li = int(self.edge_line[e])
+            if len(line_edges[li]) != 1:
+                continue
+            a = pre[child]
+            b = a + size[child]
+            sub_gen = gen_cum[b] - gen_cum[a]
+            total = comp_gen[child]
+            if total == 0 or 0 < sub_gen < total:
+                continue
+            # 하위 트리에 발전원이 없으면 하위 트리가, 전부 있으면 나머지가 고립
+            inside = (pair_pre >= a) & (pair_pre < b)
+            if sub_gen == 0:
+                outages.append(outage(li, int(size[child]), inside))
+            else:
+                stranded_pairs = ~inside & (comp_start[pair_node] == comp_start[child])
+                outages.append(outage(li, int(size[order[comp_start[child]]] - size[child]),
+                                      stranded_pairs))
+
+        # 여러 구간으로 나뉜 선로는 구간을 함께 빼야 경유 변전소 고립이 드러남
+        grouped = {}
+        lists = (self.indptr.tolist(), self.adj_node.tolist(), self.adj_edge.tolist(),
+                 self.is_source.tolist())
+        for li, edges in enumerate(line_edges):
+            if len(edges) < 2:
+                continue
+            nodes = self._cut_off(edges, powered, lists)
+            if nodes:
+                lost = np.zeros(self.node_count, dtype=bool)
+                lost[nodes] = True
+                grouped[li] = sorted(nodes)
+                outages.append(outage(li, len(nodes), lost[pair_node]))
+
+        outages.sort(key=lambda o: (-len(o["cities"]), -o["stranded"], o["line"]))
+        bridge_child = {int(self.edge_line[e]): child for e, child in bridges
+                        if len(line_edges[self.edge_line[e]]) == 1}
+        return {
+            "isolated_nodes": [int(v) for v in np.flatnonzero(~powered)],
+            "isolated_cities": [self.cities[c]["name"] for c in np.flatnonzero(~city_ok)],
+            "bridges": len(bridges),
+            "outages": outages,
+            # stranded_nodes()용 DFS 결과 + 여러 구간 선로의 고립 노드
+            "_dfs": (pre, size, order, comp_start, bridge_child),
+            "_grouped": grouped,
+        }
+
+    def _cut_off(self, edges, powered, lists):
+        """구간 edges를 함께 뺐을 때 발전원과 끊기는 노드 목록
+
+        끊기는 부분은 빠진 구간의 끝점을 포함하므로 끝점에서만 탐색하고,
+        발전원에 닿으면 그 탐색은 바로 멈춤 (그래프 전체를 다시 돌지 않음)
+        """
+        indptr, adj_node, adj_edge, is_source = lists
+        removed = set(int(e) for e in edges)
+        starts = {int(v) for e in removed for v in (self.edge_u[e], self.edge_v[e])}
+        fed = set()
+        cut = []
+        for s in starts:
+            if s in fed or not powered[s] or s in cut:
+                continue
+            visited = {s}
+            stack = [s]
+            reached = is_source[s]
+            while stack and not reached:
+                v = stack.pop()
+                for i in range(indptr[v], indptr[v + 1]):
+                    w = adj_node[i]
+                    if w in visited or adj_edge[i] in removed:
+                        continue
+                    if w in fed or is_source[w]:
+                        reached = True
+                        break
+                    visited.add(w)
+                    stack.append(w)
+            if reached:
+                fed |= visited
+            else:
+                cut.extend(visited)
+        return cut
+
+    def stranded_nodes(self, report, line):
+        """contingency 결과에서 선로 line 고장 시 고립되는 노드 목록 (없으면 빈 목록)"""
+        if line in report["_grouped"]:
+            return list(report["_grouped"][line])
+        pre, size, order, comp_start, bridge_child = report["_dfs"]
+        if line not in bridge_child:
+            return []
+        child = bridge_child[line]
+        a, b = pre[child], pre[child] + size[child]
+        if not self.is_source[order[a:b]].any():
+            return order[a:b].tolist()
+        start = comp_start[child]
+        end = start + size[order[start]]
+        if self.is_source[order[start:a]].any() or self.is_source[order[b:end]].any():
+            return []
+        return order[start:a].tolist() + order[b:end].tolist()
+
+    def brute_force_contingency(self):
+        """선로마다 구간을 모두 빼고 발전원에서 다시 탐색한 기준 결과 {선로: (고립 노드, 공급 중단 도시)}"""
+        base = self.reachable()
+        city_ok = [any(base[v] for v in nodes) for nodes in self.city_nodes]
+        result = {}
+        for li, edges in enumerate(self.line_edges()):
+            after = self.reachable(removed_edges=edges)
+            lost = np.flatnonzero(base & ~after).tolist()
+            if lost:
+                cities = [self.cities[c]["name"] for c, nodes in enumerate(self.city_nodes)
+                          if city_ok[c] and not any(after[v] for v in nodes)]
+                result[li] = (lost, cities)
+        return result
+
+
+def build_grid_graph(plants, substations, lines, cities=(),
+                     snap_km=SNAP_KM, city_radius_km=CITY_RADIUS_KM):
+    """시설/선로/도시 목록으로 GridGraph 구성"""
+    graph = GridGraph()
+    for plant in plants:
+        graph.add_node(plant["name"], PLANT, plant["lat"], plant["lng"], name_aliases(plant["name"]))
+    for ss in substations:
+        graph.add_node(ss["name"], SUBSTATION, ss["lat"], ss["lng"], name_aliases(ss["name"]))
+
+    # 모든 선로의 꼭짓점 간 거리를 한 번에 계산한 뒤 선로별 누적 거리로 나눔
+    sizes = np.asarray([len(line["coords"]) for line in lines], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    pts = np.asarray([pt for line in lines for pt in line["coords"]],
+                     dtype=np.float64).reshape(-1, 2)
+    step = np.concatenate([[0.0], haversine_km(pts[:-1, 0], pts[:-1, 1], pts[1:, 0], pts[1:, 1])])
+    step[offsets[:-1]] = 0.0
+    cum_all = np.cumsum(step).tolist()
+
+    edge_u, edge_v, edge_length, edge_line = [], [], [], []
+    for li, line in enumerate(lines):
+        coords = line["coords"]
+        graph.lines.append(line)
+        # 중간 경유점이 기존 시설과 겹치면 그 시설에서 구간을 나눔 (당진→신서산→신안성)
+        stops = [(0, graph._endpoint(line["from"], coords[0], line["name"], snap_km))]
+        for i in range(1, len(coords) - 1):
+            via = graph._snap(coords[i][0], coords[i][1], snap_km)
+            if via is not None and via != stops[-1][1]:
+                stops.append((i, via))
+        stops.append((len(coords) - 1,
+                      graph._endpoint(line["to"], coords[-1], line["name"], snap_km)))
+
+        # 구간 연장은 선로 연장을 좌표 거리 비율로 나눔
+        base = offsets[li]
+        total = (cum_all[base + len(coords) - 1] - cum_all[base]) or 1.0
+        for (i, u), (j, v) in zip(stops, stops[1:]):
+            edge_u.append(u)
+            edge_v.append(v)
+            edge_length.append(float(line["length"]) * (cum_all[base + j] - cum_all[base + i]) / total)
+            edge_line.append(li)
+    graph.finalize(edge_u, edge_v, edge_length, edge_line)
+
+    # 도시는 반경 안 변전소(없으면 가장 가까운 변전소)를 통해 공급받는 것으로 간주
+    substation_ids = np.flatnonzero(graph.kind == SUBSTATION)
+    for city in cities:
+        graph.cities.append(city)
+        if not len(substation_ids):
+            graph.city_nodes.append([])
+            continue
+        km = haversine_km(city["lat"], city["lng"],
+                          graph.lat[substation_ids], graph.lng[substation_ids])
+        near = substation_ids[km <= city_radius_km]
+        if not len(near):
+            near = substation_ids[[int(np.argmin(km))]]
+        graph.city_nodes.append([int(v) for v in near])
+    return graph
+
+
+def load_default_graph():
+    """korea_grid_map의 데이터로 그래프 구성 (folium 임포트 없음)"""
+    import korea_grid_map as data
+
+    return build_grid_graph(data.POWER_PLANTS, data.SUBSTATIONS,
+                            data.TRANSMISSION_LINES, data.MAJOR_CITIES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="송전망 위상 그래프 / N-1 상정고장 분석")
+    parser.add_argument("--path", nargs=2, metavar=("FROM", "TO"),
+                        help="두 시설 사이 연장 기준 최단 경로")
+    parser.add_argument("--check", action="store_true",
+                        help="N-1 결과를 선로별 전수 탐색(구간을 모두 빼고 재탐색)과 비교")
+    args = parser.parse_args()
+
+    graph = load_default_graph()
+    print(f"노드 {graph.node_count}개, 선로 {len(graph.lines)}개 (구간 {graph.edge_count}개)")
+    for line_name, endpoint in graph.unresolved:
+        print(f"  ⚠️ 미확인 끝점 '{endpoint}' ({line_name}) → 단말 노드로 추가")
+
+    if args.path:
+        source, target = (graph.resolve(name) for name in args.path)
+        if source is None or target is None:
+            parser.error("시설 이름을 찾을 수 없습니다")
+        result = graph.shortest_path(source, target)
+        if result is None:
+            print("경로 없음")
+        else:
+            km, nodes, edges = result
+            print(f"최단 경로 {km:.0f}km: " + " → ".join(graph.names[v] for v in nodes))
+            for e in edges:
+                print(f"  - {graph.edge_label(e)}")
+
+    report = graph.contingency()
+    print(f"교량 구간 {report['bridges']}개, 고립 유발 선로 {len(report['outages'])}개")
+    for v in report["isolated_nodes"]:
+        print(f"  평상시 발전원 미연결: {graph.names[v]}")
+    for name in report["isolated_cities"]:
+        print(f"  평상시 발전원 미연결 도시: {name}")
+    for outage in report["outages"]:
+        cities = ", ".join(outage["cities"]) or "-"
+        stranded = ", ".join(graph.names[v] for v in graph.stranded_nodes(report, outage["line"]))
+        print(f"  {outage['name']}: 고립 시설 {outage['stranded']}곳 ({stranded}), "
+              f"공급 중단 도시 {cities}")
+
+    if args.check:
+        expected = {li: (sorted(nodes), sorted(cities))
+                    for li, (nodes, cities) in graph.brute_force_contingency().items()}
+        actual = {o["line"]: (sorted(graph.stranded_nodes(report, o["line"])), sorted(o["cities"]))
+                  for o in report["outages"]}
+        mismatched = [graph.lines[li]["name"] for li in sorted(set(expected) | set(actual))
+                      if expected.get(li) != actual.get(li)]
+        print(f"전수 탐색 비교 (선로 {len(graph.lines)}개): "
+              f"{'불일치 ' + ', '.join(mismatched) if mismatched else '일치'}")
+
+
+if __name__ == "__main__":
+    main()
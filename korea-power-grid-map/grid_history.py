@@ -0,0 +1,295 @@
+"""
+송전망 시간축 (commissioned_at/status 기반 연도별 스냅샷)
+- 발전소/변전소/선로마다 가동 구간 [준공일, 폐지일)을 정함
+  (준공일이 없으면 처음부터 가동, status가 decommissioned인데 폐지일이 없으면 표시하지 않음,
+   construction은 준공 예정일부터 표시)
+- IntervalIndex: 시작일/종료일을 각각 정렬해 두고 이진 탐색으로 두 날짜 사이에 시작/종료된 항목만 조회
+- 스냅샷은 첫 날짜만 전체를 구하고 이후는 이전 스냅샷에 (추가, 제거) 차분을 적용해 만듦
+- 지도: --history는 전체 피처를 한 번만 출력하고 연도 슬라이더가 차분만큼 레이어를 넣고 뺌
+  (compact_output.py의 피처 키 사용), --per-year는 연도마다 HTML 파일 하나
+
+사용법:
+    python grid_history.py --from 1970 --to 2025 --step 5          # 연도별 가동 시설 수/차분/시간
+    python grid_history.py --from 2000 --to 2025 --per-year history --db grid.db
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import date
+
+import numpy as np
+from branca.element import MacroElement
+from jinja2 import Template
+
+# 준공일이 없으면 처음부터, 폐지일이 없으면 끝까지 (date.toordinal 기준)
+ALWAYS = 0
+FOREVER = date.max.toordinal() + 1
+
+# 시간축에 올리는 목록과 피처 키 접두사 (도시는 항상 표시)
+KINDS = {"plants": "p", "substations": "s", "lines": "l"}
+
+
+def _day(value):
+    """'2010-06-01' / '2010' / 2010 → 날짜 서수 (없으면 None)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, int) or len(str(value)) == 4:
+        return date(int(value), 1, 1).toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def interval(item):
+    """시설/선로 딕셔너리 → 가동 구간 (시작, 종료) 날짜 서수"""
+    start = _day(item.get("commissioned_at"))
+    end = _day(item.get("decommissioned_at"))
+    status = item.get("status") or "operating"
+    if status == "decommissioned" and end is None:
+        return FOREVER, FOREVER
+    if status == "construction" and start is None:
+        return FOREVER, FOREVER
+    return (ALWAYS if start is None else start), (FOREVER if end is None else end)
+
+
+def feature_key(kind, i):
+    """지도 피처 키 (add_compact_layers의 keyed 출력과 같은 규칙)"""
+    return f"{KINDS[kind]}{i}"
+
+
+class IntervalIndex:
+    """가동 구간 [start, end) 색인"""
+
+    def __init__(self, starts, ends):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.by_start = np.argsort(self.starts, kind="stable")
+        self.by_end = np.argsort(self.ends, kind="stable")
+        self.sorted_starts = self.starts[self.by_start]
+        self.sorted_ends = self.ends[self.by_end]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def active(self, t):
+        """날짜 t에 가동 중인 항목 번호"""
+        return np.flatnonzero((self.starts <= t) & (t < self.ends))
+
+    @staticmethod
+    def _between(order, sorted_values, t0, t1):
+        """t0 < 값 <= t1 인 항목 번호"""
+        lo, hi = np.searchsorted(sorted_values, [t0, t1], side="right")
+        return order[lo:hi]
+
+    def diff(self, t0, t1):
+        """t0 → t1 사이 (새로 가동, 가동 종료) 항목 번호 (t1 < t0이면 반대 방향)"""
+        if t1 < t0:
+            removed, added = self.diff(t1, t0)
+            return added, removed
+        started = self._between(self.by_start, self.sorted_starts, t0, t1)
+        ended = self._between(self.by_end, self.sorted_ends, t0, t1)
+        # 두 날짜 사이에 시작해서 끝난 항목은 어느 쪽에도 넣지 않음
+        added = started[self.ends[started] > t1]
+        removed = ended[self.starts[ended] <= t0]
+        return np.sort(added), np.sort(removed)
+
+
+class GridHistory:
+    """load_grid_data 결과에 시간축 색인을 붙여 날짜별 스냅샷 생성"""
+
+    def __init__(self, data):
+        self.data = data
+        self.items = [(kind, i) for kind in KINDS for i in range(len(data[kind]))]
+        bounds = [interval(data[kind][i]) for kind, i in self.items]
+        self.index = IntervalIndex([b[0] for b in bounds], [b[1] for b in bounds])
+        self.keys = [feature_key(kind, i) for kind, i in self.items]
+        # DB 송전탑은 선로 id별로 묶어 두고 가동 중인 선로 것만 붙임
+        self.towers = None
+        if data.get("towers") is not None:
+            self.towers = {}
+            for tower in data["towers"]:
+                self.towers.setdefault(tower[0], []).append(tower)
+
+    def _build(self, active):
+        """가동 중인 항목 번호 집합 → 지도 데이터 (원래 순서 유지)"""
+        snapshot = {kind: [] for kind in KINDS}
+        for n in sorted(active):
+            kind, i = self.items[n]
+            snapshot[kind].append(self.data[kind][i])
+        snapshot["cities"] = self.data["cities"]
+        if self.towers is not None:
+            snapshot["towers"] = [t for line in snapshot["lines"]
+                                  for t in self.towers.get(line.get("id"), ())]
+        return snapshot
+
+    def snapshot(self, as_of):
+        """as_of 날짜 기준 지도 데이터"""
+        return self._build(self.index.active(_day(as_of)).tolist())
+
+    def snapshots(self, dates):
+        """날짜 순서대로 (날짜, 지도 데이터, 추가 번호, 제거 번호, 소요 초)
+        첫 날짜만 전체 질의, 이후는 이전 가동 집합에 차분만 적용
+        """
+        active, previous = set(), None
+        for as_of in dates:
+            start = time.perf_counter()
+            t = _day(as_of)
+            if previous is None:
+                added, removed = self.index.active(t), np.empty(0, dtype=np.int64)
+            else:
+                added, removed = self.index.diff(previous, t)
+            active.update(added.tolist())
+            active.difference_update(removed.tolist())
+            snapshot = self._build(active)
+            yield as_of, snapshot, added, removed, time.perf_counter() - start
+            previous = t
+
+    def steps(self, years):
+        """연말 기준 연도별 차분 → {"years", "base": 첫 해 키, "steps": [[추가 키], [제거 키]], "counts"}"""
+        dates = [year_end(y) for y in years]
+        base = self.index.active(_day(dates[0]))
+        steps, counts = [], [len(base)]
+        for t0, t1 in zip(dates, dates[1:]):
+            added, removed = self.index.diff(_day(t0), _day(t1))
+            steps.append([[self.keys[n] for n in added], [self.keys[n] for n in removed]])
+            counts.append(counts[-1] + len(added) - len(removed))
+        return {"years": list(years), "base": [self.keys[n] for n in base],
+                "steps": steps, "counts": counts}
+
+
+def year_end(year):
+    return f"{year}-12-31"
+
+
+# ============================================================
+# 지도 레이어
+# ============================================================
+
+class HistoryControl(MacroElement):
+    """연도 슬라이더/재생 컨트롤: 키별 레이어(CompactStyles keyed)를 차분만큼 넣고 뺌"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var D = {{ this.data_js }}, K = {{ this.styles_name }}_keyed, at = 0, label, timer;
+            function show(keys, on) {
+                keys.forEach(function (k) {
+                    (K[k] || []).forEach(function (e) {
+                        if (on) { e[0].addLayer(e[1]); } else { e[0].removeLayer(e[1]); }
+                    });
+                });
+            }
+            // 처음에는 모든 피처가 그려져 있으므로 첫 해에 없는 것만 제거
+            var base = {};
+            D.base.forEach(function (k) { base[k] = true; });
+            show(Object.keys(K).filter(function (k) { return !base[k]; }), false);
+
+            function go(target) {
+                // 이웃한 연도 사이 차분만 적용 (뒤로 갈 때는 추가/제거를 반대로)
+                for (; at < target; at++) { show(D.steps[at][0], true); show(D.steps[at][1], false); }
+                for (; at > target; at--) { show(D.steps[at - 1][0], false); show(D.steps[at - 1][1], true); }
+                label.innerHTML = D.years[at] + '년 · 시설/선로 ' + D.counts[at] + '개';
+            }
+
+            var control = L.control({position: 'bottomleft'});
+            control.onAdd = function () {
+                var div = L.DomUtil.create('div');
+                div.style.cssText = 'background:#fff;padding:8px 12px;border-radius:6px;' +
+                    'box-shadow:0 2px 8px rgba(0,0,0,0.2);font:12px "Malgun Gothic",sans-serif;';
+                div.innerHTML = '<b>송전망 변천</b> <span></span><br>' +
+                    '<button type="button" style="margin-right:6px;">▶</button>' +
+                    '<input type="range" min="0" max="' + (D.years.length - 1) + '" value="' +
+                    (D.years.length - 1) + '" style="width:180px;vertical-align:middle;">';
+                label = div.querySelector('span');
+                var input = div.querySelector('input'), button = div.querySelector('button');
+                input.addEventListener('input', function () { go(+this.value); });
+                button.addEventListener('click', function () {
+                    if (timer) {
+                        clearInterval(timer);
+                        timer = null;
+                        button.innerHTML = '▶';
+                        return;
+                    }
+                    if (at === D.years.length - 1) { go(0); }
+                    button.innerHTML = '❚❚';
+                    timer = setInterval(function () {
+                        go(at + 1);
+                        input.value = at;
+                        if (at === D.years.length - 1) { button.click(); }
+                    }, {{ this.interval }});
+                });
+                L.DomEvent.disableClickPropagation(div);
+                return div;
+            };
+            control.addTo({{ this.map_name }});
+            go(D.years.length - 1);
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, m, styles, steps, interval=700):
+        super().__init__()
+        self._name = "GridHistory"
+        self.map_name = m.get_name()
+        self.styles_name = styles.get_name()
+        self.interval = interval
+        self.data_js = json.dumps(steps, ensure_ascii=False, separators=(",", ":"))
+
+
+def add_history_control(m, styles, data, years):
+    """연도별 차분을 계산해 지도에 연도 슬라이더 추가 (피처 그룹을 지도에 넣은 뒤 호출)"""
+    start = time.perf_counter()
+    steps = GridHistory(data).steps(list(years))
+    elapsed = time.perf_counter() - start
+    changes = sum(len(a) + len(r) for a, r in steps["steps"])
+    print(f"시간축: {steps['years'][0]}~{steps['years'][-1]}년 {len(steps['years'])}개 스냅샷, "
+          f"변경 {changes}건 ({elapsed * 1000:.1f} ms)")
+    HistoryControl(m, styles, steps).add_to(m)
+    return steps
+
+
+# ============================================================
+# 실행
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="송전망 연도별 스냅샷 (준공일/상태 기반)")
+    parser.add_argument("--from", dest="start", type=int, default=1970, help="시작 연도")
+    parser.add_argument("--to", dest="end", type=int, default=date.today().year, help="끝 연도")
+    parser.add_argument("--step", type=int, default=1, help="연도 간격")
+    parser.add_argument("--db", help="grid_db.py로 만든 SQLite")
+    parser.add_argument("--per-year", metavar="DIR", help="연도마다 지도 HTML을 이 폴더에 저장")
+    parser.add_argument("--compact", action="store_true", help="--per-year 지도를 압축 출력으로")
+    parser.add_argument("--towers", choices=["icons", "canvas", "none"], default="icons")
+    args = parser.parse_args()
+
+    from korea_grid_map import build_map, load_grid_data
+
+    data = load_grid_data(db_path=args.db)
+    start = time.perf_counter()
+    history = GridHistory(data)
+    print(f"구간 색인: 시설/선로 {len(history.index)}개 ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    if args.per_year:
+        os.makedirs(args.per_year, exist_ok=True)
+    years = list(range(args.start, args.end + 1, args.step))
+    print(f"{'연도':>6}{'발전소':>7}{'변전소':>7}{'선로':>6}{'추가':>6}{'제거':>6}{'스냅샷':>8}"
+          + (f"{'지도':>8}{'파일':>8}" if args.per_year else ""))
+    total = 0.0
+    for as_of, snapshot, added, removed, elapsed in history.snapshots(year_end(y) for y in years):
+        total += elapsed
+        row = (f"{as_of[:4]:>8}{len(snapshot['plants']):>10}{len(snapshot['substations']):>10}"
+               f"{len(snapshot['lines']):>8}{len(added):>8}{len(removed):>8}{elapsed * 1000:>9.2f}ms")
+        if args.per_year:
+            render = time.perf_counter()
+            path = os.path.join(args.per_year, f"grid_{as_of[:4]}.html")
+            build_map(data=snapshot, towers=args.towers, compact=args.compact).save(path)
+            row += f"{(time.perf_counter() - render) * 1000:>8.0f}ms{os.path.getsize(path) / 1024:>8.0f}KB"
+        print(row)
+    print(f"스냅샷 {len(years)}개 합계 {total * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,19 @@
 대한민국 전력 송전망 개념도
 - folium 기반 인터랙티브 지도
 - 가상 데이터 (실제 송전망 위치가 아님)
+- 설비용량/인구는 숫자(capacity_mw, capacity_mva, population)로 저장하고 팝업을 만들 때만 문자열로 표시
+- folium은 지도를 만들 때만 임포트 (데이터만 쓰는 모듈은 임포트 비용 없음)
+- --contingency: grid_graph.py의 N-1 상정고장 분석 결과를 레이어로 표시
+- --bbox: spatial_index.py의 R-tree로 화면 범위 밖 시설/선로를 제외
+- --db: grid_db.py(SQLite, db_schema.sql 구조)에서 범위/전압 조건에 맞는 행만 조회
+- --towers canvas: 송전탑을 DivIcon 마커 대신 전압별 캔버스 레이어(tower_layer.py)로 표시
+- --compact: 스타일/아이콘을 한 번만 정의하고 FeatureGroup별 GeoJSON으로 출력 (compact_output.py)
+- --balance: regional_power_stats 기반 지역별 예비율 단계구분도 + 연도 슬라이더 (regional_balance.py)
+- --simplify: 선로 경로를 줌 단계별로 단순화/양자화/델타 인코딩해 줌에 맞는 단계만 그림 (line_geometry.py)
+- --as-of / --history: 준공일(commissioned_at)/상태 기준 특정 날짜의 송전망, 연도 슬라이더 (grid_history.py)
 """
 
-import folium
-from folium import plugins
-import json
+import argparse
 
 # ============================================================
 # 데이터 정의
@@ -51,169 +59,222 @@ FACILITY_ICONS = {
     "lng": {"color": "orange", "icon": "fire", "prefix": "fa", "label": "LNG발전소"},
     "hydro": {"color": "blue", "icon": "tint", "prefix": "fa", "label": "수력발전소"},
     "renewable": {"color": "green", "icon": "leaf", "prefix": "fa", "label": "신재생에너지"},
+    "wind": {"color": "lightgreen", "icon": "asterisk", "prefix": "fa", "label": "풍력발전소"},
+    "solar": {"color": "beige", "icon": "sun-o", "prefix": "fa", "label": "태양광발전소"},
+    # DB에 위 목록에 없는 발전 유형이 있을 때 (facility_style)
+    "other": {"color": "gray", "icon": "question", "prefix": "fa", "label": "기타 발전소"},
     "substation_765": {"color": "red", "icon": "circle", "prefix": "fa", "label": "765kV 변전소"},
     "substation_345": {"color": "orange", "icon": "circle", "prefix": "fa", "label": "345kV 변전소"},
     "city": {"color": "cadetblue", "icon": "building", "prefix": "fa", "label": "주요 소비지"},
 }
 
-# 발전소 데이터
+# 발전소 데이터 (commissioned_at: 첫 호기 기준 대략의 준공일, 시간축 표시용)
 POWER_PLANTS = [
     {"name": "고리/신고리 원자력", "type": "nuclear", "lat": 35.316, "lng": 129.290,
-     "capacity": "10,720MW", "units": 10, "operator": "한국수력원자력"},
+     "capacity_mw": 10720, "units": 10, "operator": "한국수력원자력",
+     "commissioned_at": "1978-04-29"},
     {"name": "한빛(영광) 원자력", "type": "nuclear", "lat": 35.413, "lng": 126.416,
-     "capacity": "5,900MW", "units": 6, "operator": "한국수력원자력"},
+     "capacity_mw": 5900, "units": 6, "operator": "한국수력원자력",
+     "commissioned_at": "1986-08-25"},
     {"name": "한울(울진) 원자력", "type": "nuclear", "lat": 37.093, "lng": 129.383,
-     "capacity": "5,900MW", "units": 6, "operator": "한국수력원자력"},
+     "capacity_mw": 5900, "units": 6, "operator": "한국수력원자력",
+     "commissioned_at": "1988-09-10"},
     {"name": "월성 원자력", "type": "nuclear", "lat": 35.714, "lng": 129.476,
-     "capacity": "4,796MW", "units": 5, "operator": "한국수력원자력"},
+     "capacity_mw": 4796, "units": 5, "operator": "한국수력원자력",
+     "commissioned_at": "1983-04-22"},
     {"name": "새울(신한울) 원자력", "type": "nuclear", "lat": 37.098, "lng": 129.380,
-     "capacity": "2,800MW", "units": 2, "operator": "한국수력원자력"},
+     "capacity_mw": 2800, "units": 2, "operator": "한국수력원자력",
+     "commissioned_at": "2022-12-07"},
     {"name": "당진 화력", "type": "coal", "lat": 36.975, "lng": 126.598,
-     "capacity": "6,040MW", "units": 10, "operator": "한국동서발전"},
+     "capacity_mw": 6040, "units": 10, "operator": "한국동서발전",
+     "commissioned_at": "1999-06-30"},
     {"name": "태안 화력", "type": "coal", "lat": 36.770, "lng": 126.260,
-     "capacity": "6,100MW", "units": 10, "operator": "한국서부발전"},
+     "capacity_mw": 6100, "units": 10, "operator": "한국서부발전",
+     "commissioned_at": "1995-06-01"},
     {"name": "보령 화력", "type": "coal", "lat": 36.380, "lng": 126.490,
-     "capacity": "4,000MW", "units": 8, "operator": "한국중부발전"},
+     "capacity_mw": 4000, "units": 8, "operator": "한국중부발전",
+     "commissioned_at": "1983-12-01"},
     {"name": "하동 화력", "type": "coal", "lat": 34.960, "lng": 127.880,
-     "capacity": "4,000MW", "units": 8, "operator": "한국남부발전"},
+     "capacity_mw": 4000, "units": 8, "operator": "한국남부발전",
+     "commissioned_at": "1997-06-01"},
     {"name": "삼천포 화력", "type": "coal", "lat": 34.913, "lng": 128.068,
-     "capacity": "3,240MW", "units": 6, "operator": "한국남동발전"},
+     "capacity_mw": 3240, "units": 6, "operator": "한국남동발전",
+     "commissioned_at": "1983-08-01"},
     {"name": "영흥 화력", "type": "coal", "lat": 37.240, "lng": 126.430,
-     "capacity": "5,080MW", "units": 6, "operator": "한국남동발전"},
+     "capacity_mw": 5080, "units": 6, "operator": "한국남동발전",
+     "commissioned_at": "2004-07-01"},
     {"name": "인천 LNG복합", "type": "lng", "lat": 37.455, "lng": 126.590,
-     "capacity": "3,413MW", "units": 8, "operator": "한국중부발전"},
+     "capacity_mw": 3413, "units": 8, "operator": "한국중부발전",
+     "commissioned_at": "2005-04-01"},
     {"name": "평택 LNG복합", "type": "lng", "lat": 36.970, "lng": 126.870,
-     "capacity": "1,972MW", "units": 6, "operator": "한국중부발전"},
+     "capacity_mw": 1972, "units": 6, "operator": "한국중부발전",
+     "commissioned_at": "1980-07-01"},
     {"name": "서인천 LNG복합", "type": "lng", "lat": 37.460, "lng": 126.580,
-     "capacity": "1,800MW", "units": 5, "operator": "한국서부발전"},
+     "capacity_mw": 1800, "units": 5, "operator": "한국서부발전",
+     "commissioned_at": "1992-09-01"},
     {"name": "양양 양수발전", "type": "hydro", "lat": 38.050, "lng": 128.640,
-     "capacity": "1,000MW", "units": 4, "operator": "한국수력원자력"},
+     "capacity_mw": 1000, "units": 4, "operator": "한국수력원자력",
+     "commissioned_at": "2006-09-01"},
     {"name": "청평 수력발전", "type": "hydro", "lat": 37.730, "lng": 127.440,
-     "capacity": "139MW", "units": 4, "operator": "한국수력원자력"},
+     "capacity_mw": 139, "units": 4, "operator": "한국수력원자력",
+     "commissioned_at": "1943-10-01"},
     {"name": "제주 한림풍력", "type": "renewable", "lat": 33.380, "lng": 126.270,
-     "capacity": "100MW", "units": 20, "operator": "제주에너지공사"},
+     "capacity_mw": 100, "units": 20, "operator": "제주에너지공사",
+     "commissioned_at": "2024-01-01"},
 ]
 
 # 주요 변전소 데이터
 SUBSTATIONS = [
     {"name": "신안성 변전소", "type": "substation_765", "lat": 37.005, "lng": 127.183,
-     "voltage": 765, "capacity": "6,000MVA"},
+     "voltage": 765, "capacity_mva": 6000,
+     "commissioned_at": "2002-05-01"},
     {"name": "신가평 변전소", "type": "substation_765", "lat": 37.798, "lng": 127.505,
-     "voltage": 765, "capacity": "8,000MVA"},
+     "voltage": 765, "capacity_mva": 8000,
+     "commissioned_at": "2002-05-01"},
     {"name": "신태백 변전소", "type": "substation_765", "lat": 37.120, "lng": 128.900,
-     "voltage": 765, "capacity": "4,000MVA"},
+     "voltage": 765, "capacity_mva": 4000,
+     "commissioned_at": "1999-12-01"},
     {"name": "북경남 변전소", "type": "substation_765", "lat": 35.620, "lng": 128.850,
-     "voltage": 765, "capacity": "6,000MVA"},
+     "voltage": 765, "capacity_mva": 6000,
+     "commissioned_at": "2014-12-28"},
     {"name": "신서산 변전소", "type": "substation_765", "lat": 36.700, "lng": 126.580,
-     "voltage": 765, "capacity": "4,000MVA"},
+     "voltage": 765, "capacity_mva": 4000,
+     "commissioned_at": "2001-06-01"},
     {"name": "동서울 변전소", "type": "substation_345", "lat": 37.540, "lng": 127.080,
-     "voltage": 345, "capacity": "3,000MVA"},
+     "voltage": 345, "capacity_mva": 3000,
+     "commissioned_at": "1979-06-01"},
     {"name": "서서울 변전소", "type": "substation_345", "lat": 37.550, "lng": 126.870,
-     "voltage": 345, "capacity": "2,500MVA"},
+     "voltage": 345, "capacity_mva": 2500,
+     "commissioned_at": "1983-06-01"},
     {"name": "신인천 변전소", "type": "substation_345", "lat": 37.430, "lng": 126.650,
-     "voltage": 345, "capacity": "2,000MVA"},
+     "voltage": 345, "capacity_mva": 2000,
+     "commissioned_at": "1988-06-01"},
     {"name": "신용인 변전소", "type": "substation_345", "lat": 37.200, "lng": 127.100,
-     "voltage": 345, "capacity": "2,500MVA"},
+     "voltage": 345, "capacity_mva": 2500,
+     "commissioned_at": "2011-06-01"},
     {"name": "대전 변전소", "type": "substation_345", "lat": 36.350, "lng": 127.400,
-     "voltage": 345, "capacity": "2,000MVA"},
+     "voltage": 345, "capacity_mva": 2000,
+     "commissioned_at": "1976-06-01"},
     {"name": "대구 변전소", "type": "substation_345", "lat": 35.880, "lng": 128.610,
-     "voltage": 345, "capacity": "2,000MVA"},
+     "voltage": 345, "capacity_mva": 2000,
+     "commissioned_at": "1980-06-01"},
     {"name": "광주 변전소", "type": "substation_345", "lat": 35.170, "lng": 126.910,
-     "voltage": 345, "capacity": "1,500MVA"},
+     "voltage": 345, "capacity_mva": 1500,
+     "commissioned_at": "1979-06-01"},
     {"name": "부산 변전소", "type": "substation_345", "lat": 35.180, "lng": 129.050,
-     "voltage": 345, "capacity": "2,000MVA"},
+     "voltage": 345, "capacity_mva": 2000,
+     "commissioned_at": "1976-06-01"},
 ]
 
 # 주요 소비 도시
 MAJOR_CITIES = [
-    {"name": "서울/수도권", "lat": 37.560, "lng": 126.970, "population": "2,600만"},
-    {"name": "부산", "lat": 35.170, "lng": 129.070, "population": "340만"},
-    {"name": "대구", "lat": 35.870, "lng": 128.600, "population": "240만"},
-    {"name": "대전/세종", "lat": 36.350, "lng": 127.380, "population": "200만"},
-    {"name": "광주", "lat": 35.160, "lng": 126.850, "population": "150만"},
+    {"name": "서울/수도권", "lat": 37.560, "lng": 126.970, "population": 26_000_000},
+    {"name": "부산", "lat": 35.170, "lng": 129.070, "population": 3_400_000},
+    {"name": "대구", "lat": 35.870, "lng": 128.600, "population": 2_400_000},
+    {"name": "대전/세종", "lat": 36.350, "lng": 127.380, "population": 2_000_000},
+    {"name": "광주", "lat": 35.160, "lng": 126.850, "population": 1_500_000},
 ]
 
-# 송전선로 데이터 (가상 경로)
+# 송전선로 데이터 (가상 경로, commissioned_at은 대략의 준공일)
 TRANSMISSION_LINES = [
     # 765kV 간선
     {"name": "서해안 765kV (당진→신서산→신안성)",
      "voltage": 765, "from": "당진화력", "to": "신안성변전소", "length": 176,
+     "commissioned_at": "2002-05-01",
      "coords": [[36.975, 126.598], [36.850, 126.570], [36.700, 126.580],
                  [36.800, 126.750], [36.900, 126.950], [37.005, 127.183]]},
     {"name": "중부 765kV (신안성→신가평)",
      "voltage": 765, "from": "신안성변전소", "to": "신가평변전소", "length": 78,
+     "commissioned_at": "2002-05-01",
      "coords": [[37.005, 127.183], [37.150, 127.250], [37.350, 127.350],
                  [37.550, 127.420], [37.798, 127.505]]},
     {"name": "동해안 765kV (한울→신태백)",
      "voltage": 765, "from": "한울원전", "to": "신태백변전소", "length": 47,
+     "commissioned_at": "1999-12-01",
      "coords": [[37.093, 129.383], [37.100, 129.200], [37.110, 129.050],
                  [37.120, 128.900]]},
     {"name": "영동 765kV (신태백→신가평)",
      "voltage": 765, "from": "신태백변전소", "to": "신가평변전소", "length": 155,
+     "commissioned_at": "2002-05-01",
      "coords": [[37.120, 128.900], [37.200, 128.600], [37.350, 128.300],
                  [37.500, 128.000], [37.650, 127.750], [37.798, 127.505]]},
     {"name": "동남 765kV (고리→북경남)",
      "voltage": 765, "from": "고리원전", "to": "북경남변전소", "length": 91,
+     "commissioned_at": "2014-12-28",
      "coords": [[35.316, 129.290], [35.400, 129.150], [35.500, 129.000],
                  [35.620, 128.850]]},
 
     # 345kV 주요 간선
     {"name": "수도권 345kV 환상망 (서서울→동서울)",
      "voltage": 345, "from": "서서울변전소", "to": "동서울변전소", "length": 35,
+     "commissioned_at": "1985-06-01",
      "coords": [[37.550, 126.870], [37.570, 126.950], [37.560, 127.000],
                  [37.540, 127.080]]},
     {"name": "수도권 345kV (신인천→서서울)",
      "voltage": 345, "from": "신인천변전소", "to": "서서울변전소", "length": 30,
+     "commissioned_at": "1990-06-01",
      "coords": [[37.430, 126.650], [37.460, 126.720], [37.500, 126.800],
                  [37.550, 126.870]]},
     {"name": "경부 345kV (신안성→대전)",
      "voltage": 345, "from": "신안성변전소", "to": "대전변전소", "length": 110,
+     "commissioned_at": "2002-05-01",
      "coords": [[37.005, 127.183], [36.850, 127.200], [36.700, 127.250],
                  [36.550, 127.300], [36.350, 127.400]]},
     {"name": "호남 345kV (대전→광주)",
      "voltage": 345, "from": "대전변전소", "to": "광주변전소", "length": 170,
+     "commissioned_at": "1983-06-01",
      "coords": [[36.350, 127.400], [36.100, 127.250], [35.850, 127.050],
                  [35.600, 126.950], [35.170, 126.910]]},
     {"name": "경부 345kV (대전→대구)",
      "voltage": 345, "from": "대전변전소", "to": "대구변전소", "length": 130,
+     "commissioned_at": "1980-06-01",
      "coords": [[36.350, 127.400], [36.200, 127.600], [36.050, 127.850],
                  [35.950, 128.150], [35.880, 128.610]]},
     {"name": "경남 345kV (대구→부산)",
      "voltage": 345, "from": "대구변전소", "to": "부산변전소", "length": 90,
+     "commissioned_at": "1980-06-01",
      "coords": [[35.880, 128.610], [35.750, 128.700], [35.600, 128.800],
                  [35.400, 128.950], [35.180, 129.050]]},
     {"name": "영광-광주 345kV",
      "voltage": 345, "from": "한빛원전", "to": "광주변전소", "length": 85,
+     "commissioned_at": "1986-08-25",
      "coords": [[35.413, 126.416], [35.350, 126.550], [35.280, 126.680],
                  [35.200, 126.800], [35.170, 126.910]]},
     {"name": "보령-대전 345kV",
      "voltage": 345, "from": "보령화력", "to": "대전변전소", "length": 95,
+     "commissioned_at": "1984-06-01",
      "coords": [[36.380, 126.490], [36.380, 126.650], [36.370, 126.850],
                  [36.360, 127.100], [36.350, 127.400]]},
     {"name": "신안성-신용인 345kV",
      "voltage": 345, "from": "신안성변전소", "to": "신용인변전소", "length": 20,
+     "commissioned_at": "2011-06-01",
      "coords": [[37.005, 127.183], [37.100, 127.150], [37.200, 127.100]]},
     {"name": "영흥-신인천 345kV",
      "voltage": 345, "from": "영흥화력", "to": "신인천변전소", "length": 40,
+     "commissioned_at": "2004-07-01",
      "coords": [[37.240, 126.430], [37.300, 126.500], [37.370, 126.580],
                  [37.430, 126.650]]},
 
     # 154kV 대표 구간
     {"name": "하동-삼천포 154kV",
      "voltage": 154, "from": "하동화력", "to": "삼천포화력", "length": 25,
+     "commissioned_at": "1997-06-01",
      "coords": [[34.960, 127.880], [34.940, 127.960], [34.913, 128.068]]},
     {"name": "월성-부산 154kV",
      "voltage": 154, "from": "월성원전", "to": "부산변전소", "length": 60,
+     "commissioned_at": "1983-04-22",
      "coords": [[35.714, 129.476], [35.600, 129.400], [35.450, 129.300],
                  [35.300, 129.150], [35.180, 129.050]]},
 
     # HVDC (제주 연계)
     {"name": "해남-제주 HVDC",
      "voltage": "HVDC", "from": "해남", "to": "제주", "length": 101,
+     "commissioned_at": "1998-03-01",
      "coords": [[34.570, 126.570], [34.400, 126.520], [34.100, 126.450],
                  [33.800, 126.400], [33.510, 126.530]]},
     {"name": "진도-제주 HVDC #2",
      "voltage": "HVDC", "from": "진도", "to": "제주", "length": 122,
+     "commissioned_at": "2014-03-01",
      "coords": [[34.490, 126.260], [34.300, 126.280], [34.050, 126.300],
                  [33.750, 126.310], [33.510, 126.530]]},
 ]
@@ -238,16 +299,56 @@ def create_popup_html(title, fields):
     </div>"""
 
 
-def add_power_plants(m, feature_group):
-    """발전소 마커 추가"""
-    for plant in POWER_PLANTS:
-        style = FACILITY_ICONS[plant["type"]]
-        popup_html = create_popup_html(plant["name"], {
-            "유형": style["label"],
-            "설비용량": plant["capacity"],
-            "호기수": f'{plant["units"]}기',
-            "운영사": plant["operator"],
-        })
+def facility_style(kind):
+    """시설 유형 스타일 (모르는 유형은 "other")"""
+    return FACILITY_ICONS.get(kind, FACILITY_ICONS["other"])
+
+
+def plant_fields(plant):
+    from facility_model import format_mw
+
+    style = facility_style(plant["type"])
+    return {
+        "유형": style["label"] if plant["type"] in FACILITY_ICONS else f'{style["label"]} ({plant["type"]})',
+        "설비용량": format_mw(plant["capacity_mw"]),
+        "호기수": f'{plant["units"]}기',
+        "운영사": plant["operator"],
+    }
+
+
+def substation_fields(ss):
+    from facility_model import format_mva
+
+    return {
+        "전압": f'{ss["voltage"]}kV',
+        "용량": format_mva(ss["capacity_mva"]),
+    }
+
+
+def city_fields(city):
+    from facility_model import format_population
+
+    return {
+        "인구": format_population(city["population"]),
+        "역할": "주요 전력 소비지",
+    }
+
+
+def line_fields(line):
+    return {
+        "전압": VOLTAGE_STYLES[line["voltage"]]["label"],
+        "구간": f'{line["from"]} → {line["to"]}',
+        "연장": f'{line["length"]}km',
+    }
+
+
+def add_power_plants(m, feature_group, plants=None):
+    """발전소 마커 추가 (plants를 주면 해당 목록만)"""
+    import folium
+
+    for plant in POWER_PLANTS if plants is None else plants:
+        style = facility_style(plant["type"])
+        popup_html = create_popup_html(plant["name"], plant_fields(plant))
         folium.Marker(
             location=[plant["lat"], plant["lng"]],
             popup=folium.Popup(popup_html, max_width=280),
@@ -256,15 +357,14 @@ def add_power_plants(m, feature_group):
         ).add_to(feature_group)
 
 
-def add_substations(m, feature_group):
-    """변전소 마커 추가"""
-    for ss in SUBSTATIONS:
+def add_substations(m, feature_group, substations=None):
+    """변전소 마커 추가 (substations를 주면 해당 목록만)"""
+    import folium
+
+    for ss in SUBSTATIONS if substations is None else substations:
         style = FACILITY_ICONS[ss["type"]]
         size = 12 if ss["voltage"] == 765 else 8
-        popup_html = create_popup_html(ss["name"], {
-            "전압": f'{ss["voltage"]}kV',
-            "용량": ss["capacity"],
-        })
+        popup_html = create_popup_html(ss["name"], substation_fields(ss))
         folium.CircleMarker(
             location=[ss["lat"], ss["lng"]],
             radius=size,
@@ -278,14 +378,13 @@ def add_substations(m, feature_group):
         ).add_to(feature_group)
 
 
-def add_cities(m, feature_group):
-    """주요 소비 도시 마커 추가"""
-    for city in MAJOR_CITIES:
+def add_cities(m, feature_group, cities=None):
+    """주요 소비 도시 마커 추가 (cities를 주면 해당 목록만)"""
+    import folium
+
+    for city in MAJOR_CITIES if cities is None else cities:
         style = FACILITY_ICONS["city"]
-        popup_html = create_popup_html(city["name"], {
-            "인구": city["population"],
-            "역할": "주요 전력 소비지",
-        })
+        popup_html = create_popup_html(city["name"], city_fields(city))
         folium.Marker(
             location=[city["lat"], city["lng"]],
             popup=folium.Popup(popup_html, max_width=250),
@@ -294,17 +393,23 @@ def add_cities(m, feature_group):
         ).add_to(feature_group)
 
 
-def add_transmission_lines(m, feature_groups):
-    """송전선로 그리기 (전압별 점선 스타일)"""
-    for line in TRANSMISSION_LINES:
+def _group_key(voltage):
+    return f"v{voltage}" if isinstance(voltage, int) else voltage
+
+
+def add_transmission_lines(m, feature_groups, lines=None, towers="icons", tower_rows=None):
+    """송전선로 그리기 (전압별 점선 스타일, lines를 주면 해당 목록만)
+    towers: "icons"(송전탑마다 DivIcon 마커), "canvas"(전압별 캔버스 레이어), "none"
+    tower_rows: DB 송전탑 (line_id, 번호, 위도, 경도, 전압) - 없으면 선로 중간 좌표 사용
+    """
+    import folium
+
+    tower_points = {}
+    for line in TRANSMISSION_LINES if lines is None else lines:
         voltage = line["voltage"]
         style = VOLTAGE_STYLES[voltage]
 
-        popup_html = create_popup_html(line["name"], {
-            "전압": style["label"],
-            "구간": f'{line["from"]} → {line["to"]}',
-            "연장": f'{line["length"]}km',
-        })
+        popup_html = create_popup_html(line["name"], line_fields(line))
 
         polyline = folium.PolyLine(
             locations=line["coords"],
@@ -317,16 +422,24 @@ def add_transmission_lines(m, feature_groups):
         )
 
         # 전압별 피처 그룹에 추가
-        group_key = f"v{voltage}" if isinstance(voltage, int) else voltage
+        group_key = _group_key(voltage)
         polyline.add_to(feature_groups[group_key])
 
         # 송전탑 아이콘 표시 (선 위 일정 간격)
-        _add_tower_icons(line["coords"], style["color"], feature_groups[group_key])
+        if towers == "icons":
+            _add_tower_icons(line["coords"], style["color"], feature_groups[group_key])
+        elif towers == "canvas" and tower_rows is None:
+            tower_points.setdefault(voltage, []).extend(line["coords"][1:-1])
 
+    if towers == "canvas":
+        for _, _, lat, lng, voltage in tower_rows or ():
+            tower_points.setdefault(voltage, []).append((lat, lng))
+        add_tower_canvas(feature_groups, tower_points)
 
-def _add_tower_icons(coords, color, feature_group):
-    """송전선로 위에 송전탑 아이콘을 일정 간격으로 배치"""
-    tower_svg = f"""
+
+def tower_svg(color):
+    """송전탑 심볼 SVG (16x20)"""
+    return f"""
     <svg width="16" height="20" viewBox="0 0 16 20" xmlns="http://www.w3.org/2000/svg">
         <line x1="8" y1="0" x2="8" y2="20" stroke="{color}" stroke-width="1.5"/>
         <line x1="2" y1="4" x2="14" y2="4" stroke="{color}" stroke-width="1.5"/>
@@ -337,8 +450,23 @@ def _add_tower_icons(coords, color, feature_group):
         <line x1="11" y1="8" x2="13" y2="20" stroke="{color}" stroke-width="0.8"/>
     </svg>"""
 
+
+def add_tower_canvas(feature_groups, tower_points):
+    """전압별 송전탑 좌표를 압축 배열 + 공유 심볼 캔버스 레이어로 추가"""
+    from tower_layer import TowerCanvasLayer
+
+    for voltage, points in tower_points.items():
+        if points and voltage in VOLTAGE_STYLES:
+            svg = tower_svg(VOLTAGE_STYLES[voltage]["color"])
+            TowerCanvasLayer(points, svg).add_to(feature_groups[_group_key(voltage)])
+
+
+def _add_tower_icons(coords, color, feature_group):
+    """송전선로 위에 송전탑 아이콘을 일정 간격으로 배치"""
+    import folium
+
     icon = folium.DivIcon(
-        html=f'<div style="opacity:0.8;">{tower_svg}</div>',
+        html=f'<div style="opacity:0.8;">{tower_svg(color)}</div>',
         icon_size=(16, 20),
         icon_anchor=(8, 10),
     )
@@ -352,8 +480,151 @@ def _add_tower_icons(coords, color, feature_group):
         ).add_to(feature_group)
 
 
+def add_compact_layers(m, groups, data, towers="icons", simplify=False, keyed=False):
+    """압축 출력: 스타일/아이콘은 한 번만 정의하고 FeatureGroup별 GeoJSON 하나로 추가 → CompactStyles
+    groups: {"plants", "substations", "cities", "v765", "v345", "v154", "HVDC"} -> FeatureGroup
+    simplify=True면 선로 좌표를 줌 단계별 델타 인코딩으로 저장 (.cache에 캐시)
+    keyed=True면 발전소/변전소/선로(송전탑 포함)에 grid_history.feature_key 규칙의 키를 붙임
+    """
+    from compact_output import CompactLayer, CompactStyles
+
+    styles = CompactStyles()
+    styles.keyed = keyed
+    styles.add_to(m)
+    layers = {key: CompactLayer(styles) for key in groups}
+
+    tiered = None
+    if simplify:
+        import json
+
+        from line_geometry import (MIN_TIER_GAIN, ZOOM_TIERS, LineGeometryCache, print_report,
+                                   select_tiers)
+
+        cache = LineGeometryCache()
+        tiers = cache.tiers(data["lines"])
+        tiered = [select_tiers([(tiers[t][0], tiers[t][1][i]) for t in ZOOM_TIERS])
+                  for i in range(len(data["lines"]))]
+        print("선로 단순화 (줌 단계별):")
+        print_report(cache.report)
+        kept = sum(len(levels) for levels in tiered)
+        print(f"  출력 단계 {kept}/{len(tiered) * len(ZOOM_TIERS)}개 "
+              f"(위 단계와 꼭짓점 차이 {MIN_TIER_GAIN}개 미만 단계 생략), "
+              f"{len(json.dumps(tiered, separators=(',', ':'))):,} B")
+
+    def icon_style(style, popup_width):
+        return styles.intern({
+            "kind": "icon", "popupWidth": popup_width,
+            "icon": {"icon": style["icon"], "prefix": style["prefix"], "markerColor": style["color"],
+                     "iconColor": "white", "extraClasses": "fa-rotate-0"},
+        })
+
+    def feature_key(prefix, i):
+        return f"{prefix}{i}" if keyed else None
+
+    for i, plant in enumerate(data["plants"]):
+        key = icon_style(facility_style(plant["type"]), 280)
+        layers["plants"].add_point(plant["lat"], plant["lng"], key, plant["name"],
+                                   plant_fields(plant), plant["name"], feature_key("p", i))
+
+    for i, ss in enumerate(data["substations"]):
+        style = FACILITY_ICONS[ss["type"]]
+        key = styles.intern({
+            "kind": "circle", "popupWidth": 250,
+            "options": {"radius": 12 if ss["voltage"] == 765 else 8, "color": style["color"],
+                        "fill": True, "fillColor": style["color"], "fillOpacity": 0.7, "weight": 2},
+        })
+        layers["substations"].add_point(ss["lat"], ss["lng"], key, ss["name"],
+                                        substation_fields(ss), ss["name"], feature_key("s", i))
+
+    for city in data["cities"]:
+        key = icon_style(FACILITY_ICONS["city"], 250)
+        layers["cities"].add_point(city["lat"], city["lng"], key, city["name"],
+                                   city_fields(city), city["name"])
+
+    tower_points = {}
+    for i, line in enumerate(data["lines"]):
+        style = VOLTAGE_STYLES[line["voltage"]]
+        layer = layers[_group_key(line["voltage"])]
+        key = styles.intern({
+            "kind": "line", "popupWidth": 280,
+            "options": {"color": style["color"], "weight": style["weight"],
+                        "opacity": style["opacity"], "dashArray": style["dash_array"]},
+        })
+        tooltip = f'{line["name"]} ({style["label"]})'
+        line_key = feature_key("l", i)
+        if tiered is not None:
+            layer.add_tiered_line(tiered[i], key, line["name"], line_fields(line), tooltip, line_key)
+        else:
+            layer.add_line(line["coords"], key, line["name"], line_fields(line), tooltip, line_key)
+        if towers == "icons":
+            tower_key = styles.intern({
+                "kind": "div", "tooltip": "송전탑",
+                "icon": {"html": f'<div style="opacity:0.8;">{tower_svg(style["color"])}</div>',
+                         "iconSize": [16, 20], "iconAnchor": [8, 10], "className": "empty"},
+            })
+            for lat, lng in line["coords"][1:-1]:
+                layer.add_point(lat, lng, tower_key, key=line_key)
+        elif towers == "canvas" and data.get("towers") is None:
+            tower_points.setdefault(line["voltage"], []).extend(line["coords"][1:-1])
+
+    for key, layer in layers.items():
+        if layer.features:
+            layer.add_to(groups[key])
+
+    if towers == "canvas":
+        for _, _, lat, lng, voltage in data.get("towers") or ():
+            tower_points.setdefault(voltage, []).append((lat, lng))
+        add_tower_canvas(groups, tower_points)
+    return styles
+
+
+def add_contingency_layer(m, feature_group, data=None):
+    """N-1 상정고장 레이어: 고장 시 발전원과 끊기는 시설이 생기는 선로와 평상시 미연결 시설
+    data(load_grid_data 결과)를 주면 해당 시설/선로만으로 분석
+    """
+    import folium
+    from grid_graph import build_grid_graph
+
+    if data is None:
+        data = {"plants": POWER_PLANTS, "substations": SUBSTATIONS,
+                "cities": MAJOR_CITIES, "lines": TRANSMISSION_LINES}
+    graph = build_grid_graph(data["plants"], data["substations"], data["lines"], data["cities"])
+    report = graph.contingency()
+
+    for outage in report["outages"]:
+        line = graph.lines[outage["line"]]
+        stranded = [graph.names[n] for n in graph.stranded_nodes(report, outage["line"])]
+        popup_html = create_popup_html("N-1 취약 선로", {
+            "선로": outage["name"],
+            "구간": f'{line["from"]} → {line["to"]}',
+            "고립 시설": ", ".join(stranded),
+            "공급 중단 도시": ", ".join(outage["cities"]) or "-",
+        })
+        folium.PolyLine(
+            locations=line["coords"],
+            weight=12 if outage["cities"] else 8,
+            color="#DB2777",
+            opacity=0.35,
+            tooltip=f"N-1 취약: {outage['name']}",
+            popup=folium.Popup(popup_html, max_width=300),
+        ).add_to(feature_group)
+
+    for n in report["isolated_nodes"]:
+        folium.CircleMarker(
+            location=[graph.lat[n], graph.lng[n]],
+            radius=6,
+            tooltip=f"{graph.names[n]} (발전원 미연결)",
+            color="#6B7280",
+            fill=True,
+            fill_opacity=0.6,
+            weight=1,
+        ).add_to(feature_group)
+
+
 def add_legend(m):
     """범례 HTML 추가"""
+    import folium
+
     legend_items = ""
     for voltage, style in VOLTAGE_STYLES.items():
         label = style["label"]
@@ -412,6 +683,8 @@ def add_legend(m):
 
 def add_title(m):
     """지도 제목 추가"""
+    import folium
+
     title_html = """
     <div style="
         position:fixed; top:10px; left:50%; transform:translateX(-50%);
@@ -430,8 +703,83 @@ def add_title(m):
 # 메인 실행
 # ============================================================
 
-def build_map():
-    """지도 생성 및 모든 레이어 추가"""
+def _voltage_match(voltage, voltages):
+    return voltages is None or voltage in voltages
+
+
+def load_grid_data(bbox=None, voltages=None, db_path=None):
+    """지도에 넣을 시설/선로 목록
+    db_path가 있으면 SQLite(grid_db.py)에서 범위/전압 조건에 맞는 행만 조회하고,
+    없으면 모듈 데이터를 공간 인덱스(spatial_index.py)로 범위 컬링
+    """
+    if db_path is not None:
+        from grid_db import GridDB
+
+        db = GridDB(db_path)
+        try:
+            data = {
+                "plants": db.plants(bbox),
+                "substations": db.substations(bbox, voltages),
+                "lines": db.lines(bbox, voltages),
+                "towers": db.towers(bbox, voltages),
+            }
+        finally:
+            db.close()
+        # 스키마는 전압을 제한하지 않지만 지도는 VOLTAGE_STYLES 등급별 레이어만 있으므로 나머지는 제외
+        unknown = sorted({line["voltage"] for line in data["lines"]} - set(VOLTAGE_STYLES), key=str)
+        if unknown:
+            skipped = [line for line in data["lines"] if line["voltage"] not in VOLTAGE_STYLES]
+            print(f"⚠️ 지원하지 않는 전압 {', '.join(f'{v}kV' for v in unknown)}: "
+                  f"선로 {len(skipped)}개 제외")
+            data["lines"] = [line for line in data["lines"] if line["voltage"] in VOLTAGE_STYLES]
+            data["towers"] = [t for t in data["towers"] if t[4] in VOLTAGE_STYLES]
+        # 도시는 DB 스키마에 없으므로 모듈 데이터에서 범위만 확인
+        data["cities"] = [
+            c for c in MAJOR_CITIES
+            if bbox is None or (bbox[0] <= c["lat"] <= bbox[2] and bbox[1] <= c["lng"] <= bbox[3])
+        ]
+        return data
+
+    data = {"plants": POWER_PLANTS, "substations": SUBSTATIONS,
+            "cities": MAJOR_CITIES, "lines": TRANSMISSION_LINES}
+    if bbox is not None:
+        from spatial_index import CITY, PLANT, SEGMENT, SUBSTATION, GridIndex
+
+        grid = GridIndex(POWER_PLANTS, SUBSTATIONS, MAJOR_CITIES, TRANSMISSION_LINES)
+        culled = grid.viewport(*bbox)
+        data = {"plants": culled[PLANT], "substations": culled[SUBSTATION],
+                "cities": culled[CITY], "lines": culled[SEGMENT]}
+    if voltages is not None:
+        data["substations"] = [s for s in data["substations"] if _voltage_match(s["voltage"], voltages)]
+        data["lines"] = [line for line in data["lines"] if _voltage_match(line["voltage"], voltages)]
+    return data
+
+
+def build_map(contingency=False, bbox=None, voltages=None, db_path=None, towers="icons",
+              compact=False, simplify=False, balance=False, regions_path=None, as_of=None,
+              history=None, data=None):
+    """지도 생성 및 모든 레이어 추가
+    contingency=True면 N-1 취약 선로 레이어 포함,
+    bbox=(남, 서, 북, 동) / voltages=[765, 345, "HVDC"]면 조건에 맞는 시설/선로만 추가,
+    db_path가 있으면 데이터를 SQLite에서 조회,
+    towers="canvas"면 송전탑을 전압별 캔버스 레이어로 그림 (DB가 있으면 transmission_towers 사용),
+    compact=True면 스타일 중복 제거 + FeatureGroup별 GeoJSON으로 출력 (compact_output.py),
+    simplify=True면 선로를 줌 단계별로 단순화해 출력 (line_geometry.py, compact 출력 사용),
+    balance=True면 지역별 예비율 단계구분도 추가 (regions_path: 시도 경계 GeoJSON, 없으면 가상 경계),
+    as_of="2010-12-31"이면 그날 가동 중인 시설/선로만,
+    history=(시작 연도, 끝 연도)면 연도 슬라이더 추가 (compact 출력, 캔버스 송전탑은 항상 표시),
+    data가 있으면 조회 대신 그대로 사용 (grid_history.py 연도별 파일)
+    """
+    import folium
+    from folium import plugins
+
+    if data is None:
+        data = load_grid_data(bbox, voltages, db_path)
+    if as_of is not None:
+        from grid_history import GridHistory
+
+        data = GridHistory(data).snapshot(as_of)
+
     m = folium.Map(
         location=[36.3, 127.8],
         zoom_start=7,
@@ -450,11 +798,23 @@ def build_map():
         "HVDC": folium.FeatureGroup(name="HVDC 직류송전", show=True),
     }
 
+    if balance:
+        from regional_balance import add_balance_layer, load_stats
+
+        # 선로/시설 아래에 깔리도록 가장 먼저 추가
+        fg_balance = folium.FeatureGroup(name="지역별 예비율", show=True)
+        add_balance_layer(m, fg_balance, data, load_stats(db_path), regions_path)
+        fg_balance.add_to(m)
+
     # 데이터 추가
-    add_power_plants(m, fg_plants)
-    add_substations(m, fg_substations)
-    add_cities(m, fg_cities)
-    add_transmission_lines(m, line_groups)
+    if compact or simplify or history:
+        groups = dict(line_groups, plants=fg_plants, substations=fg_substations, cities=fg_cities)
+        styles = add_compact_layers(m, groups, data, towers, simplify, keyed=history is not None)
+    else:
+        add_power_plants(m, fg_plants, data["plants"])
+        add_substations(m, fg_substations, data["substations"])
+        add_cities(m, fg_cities, data["cities"])
+        add_transmission_lines(m, line_groups, data["lines"], towers, data.get("towers"))
 
     # 피처 그룹을 지도에 추가
     for fg in line_groups.values():
@@ -463,6 +823,17 @@ def build_map():
     fg_substations.add_to(m)
     fg_cities.add_to(m)
 
+    if history:
+        from grid_history import add_history_control
+
+        # 키별 레이어 목록이 만들어진 뒤에 실행되도록 피처 그룹 다음에 추가
+        add_history_control(m, styles, data, range(history[0], history[1] + 1))
+
+    if contingency:
+        fg_contingency = folium.FeatureGroup(name="N-1 취약 선로", show=True)
+        add_contingency_layer(m, fg_contingency, data)
+        fg_contingency.add_to(m)
+
     # 레이어 컨트롤 추가 (체크박스)
     folium.LayerControl(collapsed=False).add_to(m)
 
@@ -473,12 +844,49 @@ def build_map():
     # 미니맵 추가
     plugins.MiniMap(toggle_display=True, position="bottomright").add_to(m)
 
+    if bbox is not None:
+        south, west, north, east = bbox
+        m.fit_bounds([[south, west], [north, east]])
+
     return m
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="대한민국 전력 송전망 개념도 생성")
+    parser.add_argument("--contingency", action="store_true",
+                        help="N-1 상정고장 분석 레이어 추가 (NumPy 필요)")
+    parser.add_argument("--bbox", type=float, nargs=4, metavar=("SOUTH", "WEST", "NORTH", "EAST"),
+                        help="이 범위와 겹치는 시설/선로만 지도에 추가 (예: 36.8 126.3 37.9 127.6)")
+    parser.add_argument("--voltage", nargs="+",
+                        help="전압 필터 (예: 765 345 HVDC)")
+    parser.add_argument("--db", help="db_schema.sql 구조의 SQLite 파일 (grid_db.py init으로 생성)")
+    parser.add_argument("--towers", choices=["icons", "canvas", "none"], default="icons",
+                        help="송전탑 표시 방식 (canvas: 전압별 압축 좌표 + 캔버스 한 장)")
+    parser.add_argument("--compact", action="store_true",
+                        help="스타일/아이콘 중복 제거 + FeatureGroup별 GeoJSON 출력")
+    parser.add_argument("--balance", action="store_true",
+                        help="지역별 전력 예비율 단계구분도 + 연도 슬라이더 추가")
+    parser.add_argument("--regions", help="--balance에 쓸 시도 경계 GeoJSON (없으면 가상 경계)")
+    parser.add_argument("--simplify", action="store_true",
+                        help="선로를 줌 단계별로 단순화/델타 인코딩 (--compact 출력 사용)")
+    parser.add_argument("--as-of", metavar="YYYY-MM-DD",
+                        help="이 날짜에 가동 중인 시설/선로만 표시 (commissioned_at/status 기준)")
+    parser.add_argument("--history", type=int, nargs=2, metavar=("FROM", "TO"),
+                        help="연도별 송전망 변천 슬라이더 (예: 1970 2025, --compact 출력 사용)")
+    parser.add_argument("--output", default="korea_grid_map.html", help="출력 HTML 경로")
+    args = parser.parse_args()
+    if args.voltage:
+        args.voltage = [int(v) if v.isdigit() else v for v in args.voltage]
+    return args
+
+
 if __name__ == "__main__":
-    m = build_map()
-    output_file = "korea_grid_map.html"
+    args = parse_args()
+    m = build_map(contingency=args.contingency, bbox=args.bbox,
+                  voltages=args.voltage, db_path=args.db, towers=args.towers,
+                  compact=args.compact, simplify=args.simplify, balance=args.balance,
+                  regions_path=args.regions, as_of=args.as_of, history=args.history)
+    output_file = args.output
     m.save(output_file)
     print(f"지도가 '{output_file}' 파일로 생성되었습니다.")
     print("웹 브라우저로 열어보세요.")
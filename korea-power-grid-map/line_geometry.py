@@ -0,0 +1,204 @@
+"""
+송전선로 경로 단순화/양자화/델타 인코딩 + 줌 단계별 캐시
+- 줌 단계마다 허용 오차(m)로 Douglas–Peucker 단순화 (양 끝점 유지)
+- 좌표는 1e-5도(약 1m) 정수로 양자화한 뒤 [위도0, 경도0, Δ위도, Δ경도, ...]로 델타 인코딩
+- 단계별 결과는 .cache/lines_<단계>.json에 선로 좌표 해시별로 저장 (바뀐 선로만 다시 계산)
+- 출력에는 선로마다 바로 위 단계보다 꼭짓점이 MIN_TIER_GAIN개 이상 적은 단계만 남김 (select_tiers)
+
+사용법:
+    python line_geometry.py            # 현재 데이터의 단계별 꼭짓점 수/바이트 보고
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+
+# 줌 단계별 (최소 줌, 단순화 허용 오차 m)
+ZOOM_TIERS = {
+    "low": (0, 1000),
+    "mid": (8, 200),
+    "high": (11, 20),
+}
+
+# 낮은 단계는 바로 위(세밀한) 단계보다 꼭짓점이 이만큼 이상 적을 때만 출력에 남김
+# (차이가 작으면 단계를 더 싣는 바이트가 그리기 절약보다 큼)
+MIN_TIER_GAIN = 16
+
+# 양자화 배율 (1e-5도 ≈ 1m)
+COORD_SCALE = 100000
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+METERS_PER_DEGREE = 111320.0
+
+
+def douglas_peucker(coords, tolerance_m):
+    """[[lat, lng], ...] Douglas–Peucker 단순화 (반복 스택, 국소 평면 m 단위)"""
+    n = len(coords)
+    if n <= 2:
+        return [list(c) for c in coords]
+
+    k = math.cos(math.radians(sum(c[0] for c in coords) / n))
+    xy = [(c[1] * METERS_PER_DEGREE * k, c[0] * METERS_PER_DEGREE) for c in coords]
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = xy[first]
+        bx, by = xy[last]
+        dx, dy = bx - ax, by - ay
+        seg_len = math.hypot(dx, dy)
+        max_dist, index = -1.0, first
+        for i in range(first + 1, last):
+            px, py = xy[i]
+            if seg_len == 0:
+                dist = math.hypot(px - ax, py - ay)
+            else:
+                dist = abs(dy * px - dx * py + bx * ay - by * ax) / seg_len
+            if dist > max_dist:
+                max_dist, index = dist, i
+        if max_dist > tolerance_m:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [list(c) for c, kept in zip(coords, keep) if kept]
+
+
+def encode(coords):
+    """양자화 + 델타 인코딩 (연속 중복점 제거)"""
+    out = []
+    prev_lat = prev_lng = None
+    for lat, lng in coords:
+        qlat, qlng = round(lat * COORD_SCALE), round(lng * COORD_SCALE)
+        if prev_lat is None:
+            out += [qlat, qlng]
+        elif (qlat, qlng) != (prev_lat, prev_lng):
+            out += [qlat - prev_lat, qlng - prev_lng]
+        else:
+            continue
+        prev_lat, prev_lng = qlat, qlng
+    return out
+
+
+def decode(encoded):
+    coords = []
+    lat = lng = 0
+    for i in range(0, len(encoded), 2):
+        lat += encoded[i]
+        lng += encoded[i + 1]
+        coords.append([lat / COORD_SCALE, lng / COORD_SCALE])
+    return coords
+
+
+def select_tiers(levels, min_gain=MIN_TIER_GAIN):
+    """[(최소 줌, 인코딩 좌표), ...] (거친 단계 → 세밀한 단계) 중 출력할 단계만 남김
+
+    가장 세밀한 단계는 항상 남기고, 그보다 거친 단계는 남긴 바로 위 단계보다
+    꼭짓점이 min_gain개 이상 적을 때만 남김. 가장 거친 단계는 최소 줌 0부터 표시.
+    """
+    kept = [levels[-1]]
+    for min_zoom, encoded in reversed(levels[:-1]):
+        if len(kept[0][1]) // 2 - len(encoded) // 2 >= min_gain:
+            kept.insert(0, (min_zoom, encoded))
+        else:
+            kept[0] = (min_zoom, kept[0][1])
+    return [[0, kept[0][1]]] + [list(level) for level in kept[1:]]
+
+
+def _line_digest(coords):
+    """(좌표 해시, 원본 JSON 바이트 수)"""
+    payload = json.dumps(coords, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest(), len(payload)
+
+
+def _json_size(obj):
+    return len(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+class LineGeometryCache:
+    """선로별/줌 단계별 인코딩 결과 디스크 캐시"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.report = []
+
+    def _path(self, tier):
+        return os.path.join(self.cache_dir, f"lines_{tier}.json")
+
+    def _load(self, tier, tolerance):
+        try:
+            with open(self._path(tier), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get("lines", {}) if data.get("tolerance") == tolerance else {}
+
+    def _save(self, tier, tolerance, lines):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(tier)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"tolerance": tolerance, "lines": lines}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def tiers(self, lines):
+        """줌 단계 -> (최소 줌, 선로 순서대로 인코딩된 좌표 목록)"""
+        self.report = []
+        digests, sizes = zip(*(_line_digest(line["coords"]) for line in lines)) if lines else ((), ())
+        source_vertices = sum(len(line["coords"]) for line in lines)
+        source_bytes = sum(sizes)
+
+        result = {}
+        for tier, (min_zoom, tolerance) in ZOOM_TIERS.items():
+            start = time.perf_counter()
+            cached = self._load(tier, tolerance)
+            fresh = {}
+            hits = 0
+            encoded = []
+            for digest, line in zip(digests, lines):
+                if digest in cached:
+                    hits += 1
+                    fresh[digest] = cached[digest]
+                elif digest not in fresh:
+                    fresh[digest] = encode(douglas_peucker(line["coords"], tolerance))
+                encoded.append(fresh[digest])
+            # 바뀐 선로가 있거나 사라진 선로가 있을 때만 저장
+            if hits != len(lines) or len(cached) != len(fresh):
+                self._save(tier, tolerance, fresh)
+
+            result[tier] = (min_zoom, encoded)
+            self.report.append({
+                "tier": tier,
+                "tolerance_m": tolerance,
+                "source_vertices": source_vertices,
+                "vertices": sum(len(e) // 2 for e in encoded),
+                "source_bytes": source_bytes,
+                "bytes": sum(_json_size(e) for e in encoded),
+                "cache_hits": hits,
+                "seconds": time.perf_counter() - start,
+            })
+        return result
+
+
+def print_report(report):
+    for r in report:
+        print(f"  [{r['tier']:<4}] 허용 오차 {r['tolerance_m']:>5}m  "
+              f"꼭짓점 {r['source_vertices']:,} → {r['vertices']:,}  "
+              f"바이트 {r['source_bytes']:,} → {r['bytes']:,}  "
+              f"(캐시 {r['cache_hits']}건, {r['seconds'] * 1000:.1f} ms)")
+
+
+def main():
+    import korea_grid_map as data
+
+    cache = LineGeometryCache()
+    cache.tiers(data.TRANSMISSION_LINES)
+    print(f"선로 {len(data.TRANSMISSION_LINES)}개")
+    print_report(cache.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""
+지역별 전력 수급(예비율) 분석 + 단계구분도(choropleth) 레이어
+- 발전소/변전소를 지역 경계 다각형에 배정: 시설 점 R-tree(spatial_index.py)로 지역 경계 상자 안의
+  후보만 고른 뒤 NumPy 광선 교차(point-in-polygon) 판정
+- 지역 경계: --regions로 시도 경계 GeoJSON을 주면 그것을, 없으면 시도 대표 좌표(facility_model.REGION_CENTERS)의
+  보로노이 영역을 가상 경계로 사용 (facility_model.assign_regions와 같은 결과)
+- 연도×지역 설비용량은 가동 여부 마스크 + np.bincount 한 번으로 집계 (commissioned_at이 없으면 전 기간 가동)
+- 수요/공급/예비율은 regional_power_stats (supply_mw가 비어 있으면 집계한 설비용량을 공급으로 사용)
+- 집계 결과는 입력 해시별로 .cache/에 저장, 지도에는 연도별 색/툴팁을 미리 만들어 넣어
+  연도 슬라이더는 표에서 골라 칠하기만 함
+
+사용법:
+    python regional_balance.py                    # 연도별 지역 예비율 표
+    python regional_balance.py --regions sido.geojson --db grid.db
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+
+import numpy as np
+from branca.element import MacroElement
+from jinja2 import Template
+
+from facility_model import REGION_CENTERS
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+# 가상 경계를 자를 전체 범위 (남, 서, 북, 동)
+BOUNDS = (33.0, 124.5, 38.7, 131.0)
+
+# 원본 GeoJSON에서 지역 이름을 찾을 속성 이름 (앞쪽 우선)
+NAME_PROPERTIES = ("region_name", "CTP_KOR_NM", "name", "NAME_1")
+
+# 샘플 regional_power_stats: 지역 -> (2020년 최대 수요 MW, 인구) (가상 데이터)
+REGIONAL_DEMAND = {
+    "서울": (8900, 9_600_000), "인천": (4500, 2_940_000), "경기": (21400, 13_500_000),
+    "강원": (3100, 1_540_000), "충북": (4500, 1_600_000), "충남": (8900, 2_120_000),
+    "대전": (1800, 1_460_000), "세종": (600, 360_000), "전북": (3600, 1_800_000),
+    "전남": (5300, 1_850_000), "광주": (1500, 1_450_000), "경북": (7100, 2_640_000),
+    "대구": (2700, 2_410_000), "경남": (6200, 3_330_000), "울산": (5300, 1_130_000),
+    "부산": (3600, 3_390_000), "제주": (900, 670_000),
+}
+SAMPLE_YEARS = range(2020, 2026)
+DEMAND_GROWTH = 0.015
+
+# 예비율(%) 구간별 색 (음수: 공급 부족, 양수: 공급 여유)
+RESERVE_COLORS = [
+    (-50, "#b2182b", "-50% 미만"),
+    (-20, "#ef8a62", "-50 ~ -20%"),
+    (0, "#fddbc7", "-20 ~ 0%"),
+    (15, "#d1e5f0", "0 ~ 15%"),
+    (50, "#67a9cf", "15 ~ 50%"),
+    (math.inf, "#2166ac", "50% 이상"),
+]
+NO_DATA_COLOR = "#cccccc"
+
+
+def sample_regional_stats(years=SAMPLE_YEARS):
+    """regional_power_stats 샘플 행 (수요만 있고 공급은 시설 집계로 채움)"""
+    rows = []
+    for year in years:
+        for region, (demand, population) in REGIONAL_DEMAND.items():
+            rows.append({"region": region, "year": year,
+                         "demand_mw": round(demand * (1 + DEMAND_GROWTH) ** (year - years[0])),
+                         "supply_mw": None, "reserve_rate": None, "population": population})
+    return rows
+
+
+# ============================================================
+# 지역 경계
+# ============================================================
+
+def _clip(polygon, point, normal):
+    """다각형을 반평면 {p : (p - point)·normal <= 0}으로 자름 (Sutherland–Hodgman)"""
+    out = []
+    for i, cur in enumerate(polygon):
+        prev = polygon[i - 1]
+        d_cur = (cur[0] - point[0]) * normal[0] + (cur[1] - point[1]) * normal[1]
+        d_prev = (prev[0] - point[0]) * normal[0] + (prev[1] - point[1]) * normal[1]
+        if (d_cur <= 0) != (d_prev <= 0):
+            t = d_prev / (d_prev - d_cur)
+            out.append((prev[0] + t * (cur[0] - prev[0]), prev[1] + t * (cur[1] - prev[1])))
+        if d_cur <= 0:
+            out.append(cur)
+    return out
+
+
+def voronoi_regions(centers=REGION_CENTERS, bounds=BOUNDS):
+    """대표 좌표의 보로노이 영역 → [(이름, [고리 [[lat, lng], ...]])] (경도는 cos(36°) 축척)"""
+    k = math.cos(math.radians(36.0))
+    south, west, north, east = bounds
+    pts = {name: (lng * k, lat) for name, (lat, lng) in centers.items()}
+    regions = []
+    for name, p in pts.items():
+        poly = [(west * k, south), (east * k, south), (east * k, north), (west * k, north)]
+        for other, q in pts.items():
+            if other == name or not poly:
+                continue
+            mid = ((p[0] + q[0]) / 2, (p[1] + q[1]) / 2)
+            poly = _clip(poly, mid, (q[0] - p[0], q[1] - p[1]))
+        regions.append((name, [[[y, x / k] for x, y in poly]]))
+    return regions
+
+
+def load_regions(path=None):
+    """시도 경계 GeoJSON → [(이름, [고리, ...])] (MultiPolygon/구멍 포함, 없으면 가상 경계)"""
+    if path is None:
+        return voronoi_regions()
+    with open(path, "r", encoding="utf-8") as f:
+        collection = json.load(f)
+    regions = []
+    for feature in collection["features"]:
+        props = feature.get("properties") or {}
+        name = next((props[p] for p in NAME_PROPERTIES if props.get(p)), None)
+        geometry = feature["geometry"]
+        polygons = geometry["coordinates"]
+        if geometry["type"] == "Polygon":
+            polygons = [polygons]
+        rings = [[[lat, lng] for lng, lat in ring] for polygon in polygons for ring in polygon]
+        regions.append((name, rings))
+    return regions
+
+
+def points_in_rings(lat, lng, rings, chunk=200000):
+    """짝홀 규칙 point-in-polygon (고리 여러 개 = 구멍/다중 다각형), 점 단위 벡터 연산"""
+    inside = np.zeros(len(lat), dtype=bool)
+    for ring in rings:
+        ring = np.asarray(ring, dtype=np.float64)
+        y1, x1 = ring[:, 0], ring[:, 1]
+        y2, x2 = np.roll(y1, -1), np.roll(x1, -1)
+        dy = np.where(y2 == y1, 1e-300, y2 - y1)
+        for start in range(0, len(lat), chunk):
+            py = lat[start:start + chunk, None]
+            px = lng[start:start + chunk, None]
+            crosses = ((y1 > py) != (y2 > py)) & (px < x1 + (py - y1) * (x2 - x1) / dy)
+            inside[start:start + chunk] ^= (np.count_nonzero(crosses, axis=1) % 2).astype(bool)
+    return inside
+
+
+def assign_regions(lat, lng, regions):
+    """점마다 지역 번호 (어느 경계에도 없으면 -1)"""
+    from spatial_index import SpatialIndex
+
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    codes = np.full(len(lat), -1, dtype=np.int16)
+    index = SpatialIndex.from_points(lat, lng)
+    for code, (_, rings) in enumerate(regions):
+        coords = np.concatenate([np.asarray(r, dtype=np.float64) for r in rings])
+        cand = index.bbox(coords[:, 0].min(), coords[:, 1].min(),
+                          coords[:, 0].max(), coords[:, 1].max())
+        cand = cand[codes[cand] < 0]
+        if len(cand):
+            codes[cand[points_in_rings(lat[cand], lng[cand], rings)]] = code
+    return codes
+
+
+# ============================================================
+# 연도×지역 집계
+# ============================================================
+
+def _year(value):
+    """commissioned_at ('2010-06-01' 또는 2010) → 연도 (없으면 None)"""
+    if value is None:
+        return None
+    return int(str(value)[:4])
+
+
+def _capacity_matrix(items, key, codes, years, n_regions):
+    """연도×지역 용량 합계 (가동 기간 마스크 + bincount)"""
+    values = np.array([item.get(key) or 0 for item in items], dtype=np.float64)
+    start = np.array([_year(item.get("commissioned_at")) or -math.inf for item in items])
+    end = np.array([_year(item.get("decommissioned_at")) or math.inf for item in items])
+    years = np.asarray(years)[:, None]
+    active = (start <= years) & (years < end) & (codes >= 0)
+    year_idx, item_idx = np.nonzero(active)
+    flat = year_idx * n_regions + codes[item_idx]
+    totals = np.bincount(flat, weights=values[item_idx], minlength=len(years) * n_regions)
+    return totals.reshape(len(years), n_regions)
+
+
+def aggregate(plants, substations, stats, regions):
+    """연도×지역 수급 표 (JSON 저장 가능한 목록)"""
+    names = [name for name, _ in regions]
+    years = sorted({row["year"] for row in stats})
+    region_idx = {name: i for i, name in enumerate(names)}
+    year_idx = {year: i for i, year in enumerate(years)}
+
+    plant_codes = assign_regions([p["lat"] for p in plants], [p["lng"] for p in plants], regions)
+    ss_codes = assign_regions([s["lat"] for s in substations], [s["lng"] for s in substations],
+                              regions)
+    installed = _capacity_matrix(plants, "capacity_mw", plant_codes, years, len(names))
+    mva = _capacity_matrix(substations, "capacity_mva", ss_codes, years, len(names))
+
+    demand = np.full((len(years), len(names)), np.nan)
+    supply = installed.copy()
+    for row in stats:
+        i, j = year_idx[row["year"]], region_idx.get(row["region"])
+        if j is None:
+            continue
+        demand[i, j] = row["demand_mw"] if row["demand_mw"] is not None else np.nan
+        if row.get("supply_mw") is not None:
+            supply[i, j] = row["supply_mw"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reserve = (supply - demand) / demand * 100
+
+    def rows(matrix):
+        return [[None if np.isnan(v) else round(float(v), 1) for v in row] for row in matrix]
+
+    return {
+        "years": years,
+        "regions": names,
+        "installed_mw": rows(installed),
+        "substation_mva": rows(mva),
+        "demand_mw": rows(demand),
+        "supply_mw": rows(supply),
+        "reserve_rate": rows(reserve),
+        "unassigned": int((plant_codes < 0).sum() + (ss_codes < 0).sum()),
+    }
+
+
+def regional_balance(plants, substations, stats, regions, cache_dir=CACHE_DIR):
+    """aggregate() 결과 (입력이 같으면 디스크 캐시 사용) → (결과, 캐시 적중 여부)"""
+    payload = json.dumps([plants, substations, stats, regions], sort_keys=True,
+                         ensure_ascii=False, default=str)
+    key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    path = os.path.join(cache_dir, "regional_balance.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            return cached["result"], True
+    except (OSError, ValueError):
+        pass
+
+    result = aggregate(plants, substations, stats, regions)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "result": result}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return result, False
+
+
+# ============================================================
+# 지도 레이어
+# ============================================================
+
+def reserve_color(rate):
+    if rate is None:
+        return NO_DATA_COLOR
+    return next(color for limit, color, _ in RESERVE_COLORS if rate < limit)
+
+
+def _fmt(value, unit):
+    return "-" if value is None else f"{value:,.0f}{unit}"
+
+
+def year_styles(result):
+    """연도 -> 지역 순서대로 [채움색, 툴팁 HTML] (슬라이더는 이 표만 참조)"""
+    styles = {}
+    for i, year in enumerate(result["years"]):
+        entries = []
+        for j, name in enumerate(result["regions"]):
+            rate = result["reserve_rate"][i][j]
+            tooltip = (f"<b>{name}</b> ({year}년)<br>"
+                       f"최대 수요 {_fmt(result['demand_mw'][i][j], 'MW')}<br>"
+                       f"공급 능력 {_fmt(result['supply_mw'][i][j], 'MW')}<br>"
+                       f"변전 용량 {_fmt(result['substation_mva'][i][j], 'MVA')}<br>"
+                       f"예비율 {'-' if rate is None else f'{rate:+.1f}%'}")
+            entries.append([reserve_color(rate), tooltip])
+        styles[year] = entries
+    return styles
+
+
+class RegionBalanceLayer(MacroElement):
+    """지역 예비율 단계구분도 (부모 FeatureGroup) + 연도 슬라이더/범례 컨트롤 (지도)"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }}_data = {{ this.data_js }};
+        var {{ this.get_name() }} = (function () {
+            var D = {{ this.get_name() }}_data, year = D.years[D.years.length - 1];
+            var layer = L.geoJSON(D.regions, {
+                style: function (f) {
+                    return {fillColor: D.styles[year][f.properties.i][0], fillOpacity: 0.45,
+                            color: '#555', weight: 1};
+                },
+                onEachFeature: function (f, l) {
+                    l.bindTooltip(D.styles[year][f.properties.i][1], {sticky: true});
+                }
+            }).addTo({{ this._parent.get_name() }});
+
+            var control = L.control({position: 'bottomleft'}), label;
+            control.onAdd = function () {
+                var div = L.DomUtil.create('div');
+                div.style.cssText = 'background:#fff;padding:8px 12px;border-radius:6px;' +
+                    'box-shadow:0 2px 8px rgba(0,0,0,0.2);font:12px "Malgun Gothic",sans-serif;';
+                div.innerHTML = '<b>지역별 예비율</b> <span></span><br>' +
+                    '<input type="range" min="0" max="' + (D.years.length - 1) + '" value="' +
+                    (D.years.length - 1) + '" style="width:180px;"><br>' + D.legend;
+                label = div.querySelector('span');
+                label.innerHTML = year + '년';
+                div.querySelector('input').addEventListener('input', function () {
+                    year = D.years[this.value];
+                    label.innerHTML = year + '년';
+                    layer.eachLayer(function (l) {
+                        var s = D.styles[year][l.feature.properties.i];
+                        l.setStyle({fillColor: s[0]});
+                        l.setTooltipContent(s[1]);
+                    });
+                });
+                L.DomEvent.disableClickPropagation(div);
+                return div;
+            };
+            control.addTo({{ this.map_name }});
+            return layer;
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, m, regions, result):
+        super().__init__()
+        self._name = "RegionBalance"
+        self.map_name = m.get_name()
+        features = [{"type": "Feature", "properties": {"i": i, "name": name},
+                     "geometry": {"type": "Polygon",
+                                  "coordinates": [[[round(lng, 4), round(lat, 4)] for lat, lng in ring]
+                                                  for ring in rings]}}
+                    for i, (name, rings) in enumerate(regions)]
+        legend = "".join(
+            f'<div><span style="display:inline-block;width:12px;height:12px;background:{color};'
+            f'margin-right:6px;vertical-align:middle;"></span>{label}</div>'
+            for _, color, label in RESERVE_COLORS)
+        data = {"years": result["years"], "styles": year_styles(result), "legend": legend,
+                "regions": {"type": "FeatureCollection", "features": features}}
+        self.data_js = json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+def add_balance_layer(m, feature_group, data, stats, regions_path=None):
+    """지도에 지역 예비율 레이어 추가 → 집계 결과"""
+    regions = load_regions(regions_path)
+    result, _ = regional_balance(data["plants"], data["substations"], stats, regions)
+    RegionBalanceLayer(m, regions, result).add_to(feature_group)
+    return result
+
+
+def load_stats(db_path=None):
+    """regional_power_stats (DB에 행이나 테이블이 없으면 샘플)"""
+    if db_path is not None:
+        import sqlite3
+
+        from grid_db import GridDB
+
+        db = GridDB(db_path)
+        try:
+            rows = db.regional_stats()
+        except sqlite3.OperationalError:
+            # 통계 테이블이 생기기 전에 만든 DB
+            rows = []
+        finally:
+            db.close()
+        if rows:
+            return rows
+    return sample_regional_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지역별 전력 수급(예비율) 분석")
+    parser.add_argument("--regions", help="시도 경계 GeoJSON (없으면 대표 좌표 보로노이 가상 경계)")
+    parser.add_argument("--db", help="grid_db.py로 만든 SQLite (regional_power_stats 사용)")
+    args = parser.parse_args()
+
+    from korea_grid_map import load_grid_data
+
+    data = load_grid_data(db_path=args.db)
+    stats = load_stats(args.db)
+    regions = load_regions(args.regions)
+    start = time.perf_counter()
+    result, cached = regional_balance(data["plants"], data["substations"], stats, regions)
+    elapsed = time.perf_counter() - start
+
+    print(f"지역 {len(regions)}개 × 연도 {len(result['years'])}개 "
+          f"({'캐시' if cached else '집계'} {elapsed * 1000:.1f} ms, 지역 밖 시설 {result['unassigned']}곳)")
+    print(f"{'지역':<6}" + "".join(f"{y:>9}" for y in result["years"]))
+    for j, name in enumerate(result["regions"]):
+        rates = [result["reserve_rate"][i][j] for i in range(len(result["years"]))]
+        print(f"{name:<6}" + "".join(f"{'-' if r is None else f'{r:+.0f}%':>9}" for r in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+시설/선로 공간 인덱스 (PostGIS 없이 ST_DWithin, 최근접, 범위 질의)
+- 정적 패킹 R-tree: 항목 경계 상자를 STR(Sort-Tile-Recursive) 순서로 정렬해
+  노드 크기만큼 묶고, 레벨별 상자를 NumPy 배열로 보관 (질의도 레벨 단위 벡터 연산)
+- 점(발전소/변전소/도시)과 선분(송전선로 구간)을 한 인덱스에 함께 넣을 수 있음
+- 거리는 haversine(km), 선분은 국소 평면에서 가장 가까운 점을 구한 뒤 haversine
+
+사용법:
+    python spatial_index.py 신안성 50
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from grid_graph import EARTH_RADIUS_KM, haversine_km, normalize_name
+
+NODE_SIZE = 16
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# 항목 종류
+PLANT, SUBSTATION, CITY, SEGMENT = 0, 1, 2, 3
+KIND_LABELS = {PLANT: "발전소", SUBSTATION: "변전소", CITY: "도시", SEGMENT: "송전선로"}
+
+
+class SpatialIndex:
+    """점/선분 항목의 정적 R-tree (좌표는 위도/경도)"""
+
+    def __init__(self, lat1, lng1, lat2, lng2, node_size=NODE_SIZE):
+        self.lat1 = np.asarray(lat1, dtype=np.float64)
+        self.lng1 = np.asarray(lng1, dtype=np.float64)
+        self.lat2 = np.asarray(lat2, dtype=np.float64)
+        self.lng2 = np.asarray(lng2, dtype=np.float64)
+        self.node_size = node_size
+        n = len(self.lat1)
+
+        boxes = np.column_stack([
+            np.minimum(self.lat1, self.lat2), np.minimum(self.lng1, self.lng2),
+            np.maximum(self.lat1, self.lat2), np.maximum(self.lng1, self.lng2),
+        ]).reshape(-1, 4)
+
+        # STR: 경도 기준 세로 띠로 나눈 뒤 띠 안에서 위도 순 정렬
+        if n:
+            cx = (boxes[:, 1] + boxes[:, 3]) / 2
+            cy = (boxes[:, 0] + boxes[:, 2]) / 2
+            leaves = math.ceil(n / node_size)
+            slice_len = math.ceil(math.sqrt(leaves)) * node_size
+            by_x = np.argsort(cx, kind="stable")
+            strip = np.empty(n, dtype=np.int64)
+            strip[by_x] = np.arange(n) // slice_len
+            self.order = np.lexsort((cy, strip))
+        else:
+            self.order = np.arange(0)
+
+        # levels[0] = 정렬된 항목 상자, levels[k] = k단계 노드 상자
+        self.levels = [boxes[self.order]]
+        while len(self.levels[-1]) > 1:
+            child = self.levels[-1]
+            starts = np.arange(0, len(child), node_size)
+            self.levels.append(np.column_stack([
+                np.minimum.reduceat(child[:, 0], starts), np.minimum.reduceat(child[:, 1], starts),
+                np.maximum.reduceat(child[:, 2], starts), np.maximum.reduceat(child[:, 3], starts),
+            ]))
+
+    @classmethod
+    def from_points(cls, lats, lngs, node_size=NODE_SIZE):
+        return cls(lats, lngs, lats, lngs, node_size)
+
+    def __len__(self):
+        return len(self.lat1)
+
+    # --------------------------------------------------------
+    # 질의
+    # --------------------------------------------------------
+
+    def bbox(self, south, west, north, east):
+        """상자와 겹치는 항목 번호 배열"""
+        if not len(self):
+            return np.arange(0)
+        cand = np.arange(len(self.levels[-1]))
+        for level in range(len(self.levels) - 1, -1, -1):
+            boxes = self.levels[level][cand]
+            hit = ((boxes[:, 0] <= north) & (boxes[:, 2] >= south)
+                   & (boxes[:, 1] <= east) & (boxes[:, 3] >= west))
+            cand = cand[hit]
+            if level:
+                cand = (cand[:, None] * self.node_size + np.arange(self.node_size)).ravel()
+                cand = cand[cand < len(self.levels[level - 1])]
+        return self.order[cand]
+
+    def distance_km(self, lat, lng, items):
+        """(lat, lng)에서 항목들까지의 거리 (km)"""
+        lat1, lng1 = self.lat1[items], self.lng1[items]
+        lat2, lng2 = self.lat2[items], self.lng2[items]
+        # 질의점 기준 국소 평면(경도 축소)에서 선분 위 가장 가까운 점의 비율 t
+        k = math.cos(math.radians(lat))
+        ax, ay = (lng1 - lng) * k, lat1 - lat
+        dx, dy = (lng2 - lng1) * k, lat2 - lat1
+        seg2 = dx * dx + dy * dy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(seg2 > 0, np.clip(-(ax * dx + ay * dy) / seg2, 0.0, 1.0), 0.0)
+        return haversine_km(lat, lng, lat1 + t * (lat2 - lat1), lng1 + t * (lng2 - lng1))
+
+    def within(self, lat, lng, radius_km):
+        """반경 안 항목 (번호, 거리) - 거리순"""
+        dlat = radius_km / KM_PER_DEGREE
+        edge_lat = min(89.9, abs(lat) + dlat)
+        dlng = min(180.0, radius_km / (KM_PER_DEGREE * math.cos(math.radians(edge_lat))))
+        items = self.bbox(lat - dlat, lng - dlng, lat + dlat, lng + dlng)
+        dist = self.distance_km(lat, lng, items)
+        keep = dist <= radius_km
+        items, dist = items[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return items[order], dist[order]
+
+    def nearest(self, lat, lng, k=1):
+        """가까운 k개 (번호, 거리) - 반경을 넓혀 가며 반경 질의 반복"""
+        n = len(self)
+        k = min(k, n)
+        if not k:
+            return np.arange(0), np.zeros(0)
+        # 초기 반경: 전체 상자 면적에서 항목 k개가 차지할 면적
+        south, west, north, east = self.levels[-1][0]
+        area = max((north - south) * (east - west), 1e-9) * KM_PER_DEGREE ** 2
+        radius = max(0.1, math.sqrt(area * k / n / math.pi) * 1.5)
+        while True:
+            items, dist = self.within(lat, lng, radius)
+            if len(items) >= k or radius > math.pi * EARTH_RADIUS_KM:
+                return items[:k], dist[:k]
+            radius *= 2
+
+
+class GridIndex:
+    """발전소/변전소/도시/송전선로 구간을 함께 담은 공간 인덱스"""
+
+    def __init__(self, plants, substations, cities, lines, node_size=NODE_SIZE):
+        self.sources = {PLANT: plants, SUBSTATION: substations, CITY: cities, SEGMENT: lines}
+        lat1, lng1, lat2, lng2, kinds, refs = [], [], [], [], [], []
+        for kind, items in ((PLANT, plants), (SUBSTATION, substations), (CITY, cities)):
+            for i, item in enumerate(items):
+                lat1.append(item["lat"])
+                lng1.append(item["lng"])
+                kinds.append(kind)
+                refs.append(i)
+        lat2.extend(lat1)
+        lng2.extend(lng1)
+        for i, line in enumerate(lines):
+            for (a_lat, a_lng), (b_lat, b_lng) in zip(line["coords"], line["coords"][1:]):
+                lat1.append(a_lat)
+                lng1.append(a_lng)
+                lat2.append(b_lat)
+                lng2.append(b_lng)
+                kinds.append(SEGMENT)
+                refs.append(i)
+        self.index = SpatialIndex(lat1, lng1, lat2, lng2, node_size)
+        self.kind = np.asarray(kinds, dtype=np.int8)
+        self.ref = np.asarray(refs, dtype=np.int64)
+
+    def _items(self, items, dist=None, kinds=None):
+        """(종류, 원본 항목, 거리) 목록, 선로는 가장 가까운 구간 하나만"""
+        result = []
+        seen = set()
+        for pos, item in enumerate(items):
+            kind, ref = int(self.kind[item]), int(self.ref[item])
+            if (kinds is not None and kind not in kinds) or (kind, ref) in seen:
+                continue
+            seen.add((kind, ref))
+            result.append((kind, self.sources[kind][ref],
+                           None if dist is None else float(dist[pos])))
+        return result
+
+    def find(self, name):
+        """이름으로 시설/도시 찾기 (공백/약칭 무시, 앞부분 일치)"""
+        key = normalize_name(name)
+        for kind in (PLANT, SUBSTATION, CITY):
+            for item in self.sources[kind]:
+                if normalize_name(item["name"]).startswith(key):
+                    return item
+        return None
+
+    def within(self, lat, lng, radius_km, kinds=None):
+        return self._items(*self.index.within(lat, lng, radius_km), kinds=kinds)
+
+    def nearest(self, lat, lng, k=1, kinds=None):
+        """가까운 k개 (kinds를 주면 해당 종류만, 부족하면 반경을 넓혀 다시 질의)"""
+        want = k
+        while True:
+            result = self._items(*self.index.nearest(lat, lng, want), kinds=kinds)
+            if len(result) >= k or want >= len(self.index):
+                return result[:k]
+            want *= 4
+
+    def viewport(self, south, west, north, east):
+        """화면 범위와 겹치는 항목을 종류별 원본 목록으로 (지도 레이어 컬링용)"""
+        items = np.sort(self.index.bbox(south, west, north, east))
+        visible = {kind: [] for kind in self.sources}
+        for kind, item, _ in self._items(items):
+            visible[kind].append(item)
+        return visible
+
+
+def build_grid_index():
+    """korea_grid_map 데이터로 GridIndex 구성 (folium 임포트 없음)"""
+    import korea_grid_map as data
+
+    return GridIndex(data.POWER_PLANTS, data.SUBSTATIONS, data.MAJOR_CITIES,
+                     data.TRANSMISSION_LINES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시설 반경 검색 (ST_DWithin 대체)")
+    parser.add_argument("name", help="기준 시설/도시 이름 (예: 신안성)")
+    parser.add_argument("radius", type=float, nargs="?", default=50.0, help="반경 km")
+    parser.add_argument("--nearest", type=int, default=3, help="가장 가까운 변전소 수")
+    args = parser.parse_args()
+
+    grid = build_grid_index()
+    origin = grid.find(args.name)
+    if origin is None:
+        parser.error(f"'{args.name}' 시설을 찾을 수 없습니다")
+
+    print(f"[{origin['name']}] 반경 {args.radius:g}km")
+    for kind, item, km in grid.within(origin["lat"], origin["lng"], args.radius):
+        if item is not origin:
+            print(f"  {km:6.1f}km  {KIND_LABELS[kind]:<5} {item['name']}")
+
+    print(f"[{origin['name']}] 가장 가까운 변전소 {args.nearest}곳")
+    nearest = grid.nearest(origin["lat"], origin["lng"], args.nearest + 1, kinds={SUBSTATION})
+    for _, item, km in [n for n in nearest if n[1] is not origin][:args.nearest]:
+        print(f"  {km:6.1f}km  {item['name']}")
+
+
+if __name__ == "__main__":
+    main()
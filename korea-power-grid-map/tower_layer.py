@@ -0,0 +1,110 @@
+"""
+송전탑 캔버스 레이어
+- 전압 등급별 송전탑 좌표를 하나의 압축 배열(1e-5도 정수 양자화 Int32, base64)로 내보내고
+- 공유 심볼(SVG 한 장을 이미지로 한 번만 로드)을 캔버스 하나에 drawImage로 그림
+- 송전탑이 몇 개든 DOM 노드는 레이어당 <canvas> 하나 (마커/DivIcon 없음)
+- 화면 범위 밖 송전탑은 건너뛰고, 줌이 낮으면 심볼을 축소
+- 그릴 때마다 걸린 시간을 window.towerFrameTimes에 기록 (브라우저 콘솔에서 확인)
+"""
+
+import base64
+import json
+
+import numpy as np
+from branca.element import Element, MacroElement
+from jinja2 import Template
+
+# 좌표 양자화 배율 (1e-5도 ≈ 1m)
+COORD_SCALE = 100000
+
+TOWER_LAYER_JS = """
+(function () {
+    if (L.TowerCanvasLayer) { return; }
+    L.TowerCanvasLayer = L.Layer.extend({
+        initialize: function (packed, scale, svg) {
+            var bin = atob(packed), bytes = new Uint8Array(bin.length);
+            for (var i = 0; i < bin.length; i++) { bytes[i] = bin.charCodeAt(i); }
+            this._coords = new Int32Array(bytes.buffer);
+            this._scale = scale;
+            this._sprite = new Image();
+            this._sprite.onload = L.bind(this._redraw, this);
+            this._sprite.src = 'data:image/svg+xml;charset=utf-8,' + encodeURIComponent(svg);
+        },
+        onAdd: function (map) {
+            this._canvas = L.DomUtil.create('canvas', 'leaflet-zoom-hide');
+            this._canvas.style.pointerEvents = 'none';
+            map.getPanes().overlayPane.appendChild(this._canvas);
+            map.on('moveend zoomend resize', this._redraw, this);
+            this._redraw();
+        },
+        onRemove: function (map) {
+            map.off('moveend zoomend resize', this._redraw, this);
+            L.DomUtil.remove(this._canvas);
+            this._canvas = null;
+        },
+        _redraw: function () {
+            var map = this._map, canvas = this._canvas;
+            if (!map || !canvas || !this._sprite.complete) { return; }
+            var t0 = performance.now();
+            var size = map.getSize(), ratio = window.devicePixelRatio || 1;
+            canvas.width = size.x * ratio;
+            canvas.height = size.y * ratio;
+            canvas.style.width = size.x + 'px';
+            canvas.style.height = size.y + 'px';
+            L.DomUtil.setPosition(canvas, map.containerPointToLayerPoint([0, 0]));
+            var ctx = canvas.getContext('2d');
+            ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+
+            var zoom = map.getZoom();
+            var w = zoom >= 10 ? 16 : (zoom >= 8 ? 8 : 4), h = w * 1.25;
+            var b = map.getBounds().pad(0.05);
+            var south = b.getSouth() * this._scale, north = b.getNorth() * this._scale;
+            var west = b.getWest() * this._scale, east = b.getEast() * this._scale;
+            var c = this._coords, k = this._scale, drawn = 0;
+            for (var j = 0; j < c.length; j += 2) {
+                var lat = c[j], lng = c[j + 1];
+                if (lat < south || lat > north || lng < west || lng > east) { continue; }
+                var p = map.latLngToContainerPoint([lat / k, lng / k]);
+                ctx.drawImage(this._sprite, p.x - w / 2, p.y - h / 2, w, h);
+                drawn++;
+            }
+            this.lastDrawn = drawn;
+            this.lastDrawMs = performance.now() - t0;
+            (window.towerFrameTimes = window.towerFrameTimes || []).push(this.lastDrawMs);
+        }
+    });
+})();
+"""
+
+
+def pack_coords(points):
+    """[(lat, lng), ...] → 양자화 Int32(little-endian) base64 문자열"""
+    arr = np.round(np.asarray(points, dtype=np.float64).reshape(-1, 2) * COORD_SCALE)
+    return base64.b64encode(arr.astype("<i4").tobytes()).decode("ascii")
+
+
+class TowerCanvasLayer(MacroElement):
+    """부모 FeatureGroup에 붙는 송전탑 캔버스 레이어 (레이어 컨트롤 on/off 그대로 동작)"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = new L.TowerCanvasLayer(
+            "{{ this.packed }}", {{ this.scale }}, {{ this.svg }}
+        ).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, points, symbol_svg):
+        super().__init__()
+        self._name = "TowerCanvasLayer"
+        self.packed = pack_coords(points)
+        self.scale = COORD_SCALE
+        self.svg = json.dumps(symbol_svg.strip())
+        self.count = len(points)
+
+    def render(self, **kwargs):
+        # 클래스 정의는 이름을 키로 figure 스크립트에 한 번만 (여러 레이어, 여러 번 render해도 하나)
+        # 처음 추가될 때 레이어 스크립트보다 앞에 들어가고, 같은 키로 다시 추가해도 자리는 유지됨
+        figure = self.get_root()
+        figure.script.add_child(Element(TOWER_LAYER_JS), name="tower_canvas_layer_js")
+        super().render(**kwargs)
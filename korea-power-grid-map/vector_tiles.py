@@ -0,0 +1,756 @@
+"""
+송전망 벡터 타일 내보내기 (Mapbox Vector Tile, z/x/y)
+- 발전소/변전소/송전선로/송전탑을 레이어별로 나눠 MBTiles(SQLite) 또는 PBF 디렉터리로 저장
+- 줌별 표시 기준: 레이어/전압마다 최소 줌, 선로는 줌의 1픽셀 오차로 단순화 (line_geometry.py)
+- 타일당 레이어별 피처 수 제한(우선순위: 설비용량/전압 순) + 최대 줌 미만에서는 4px 격자당 점 하나로 솎아냄
+- 경도 열(column) 단위로 여러 프로세스에서 생성, 쓰기는 메인 프로세스 한 곳에서
+- 타일마다 들어갈 피처 해시를 저장해 두고, 다시 내보낼 때 해시가 같은 타일은 건너뜀 (증분)
+- 뷰어 페이지(Leaflet.VectorGrid)는 화면에 보이는 타일만 요청
+
+사용법:
+    python vector_tiles.py export grid.mbtiles --maxzoom 12 --processes 4
+    python vector_tiles.py export tiles/ --db grid.db     # PBF 디렉터리 (tiles/viewer.html 포함)
+    python vector_tiles.py serve grid.mbtiles --port 8000  # http://localhost:8000/ 에서 뷰어
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import struct
+import threading
+import time
+from string import Template
+
+# 타일 좌표계 (MVT 기본값) / 타일 경계 밖으로 포함할 여유 (타일 단위)
+EXTENT = 4096
+BUFFER = 64
+MIN_ZOOM = 5
+MAX_ZOOM = 12
+
+# 타일당 레이어별 최대 피처 수
+MAX_FEATURES = 1000
+# 최대 줌 미만에서 점 솎아내기 격자 크기 (타일 단위, 64 = 4px)
+THIN_CELL = 64
+
+# 레이어별 최소 줌 (선로는 전압별)
+LAYER_MIN_ZOOM = {"plants": 5, "substations": 6, "towers": 11}
+LINE_MIN_ZOOM = {765: 5, "HVDC": 5, 345: 6, 154: 8}
+
+# 타일 내용 형식이 바뀌면 올려서 기존 해시를 모두 무효화
+TILE_FORMAT = 1
+
+POINT, LINESTRING = 1, 2
+
+# 줌 0에서 1픽셀 크기 (m, 적도 기준) / 한반도 중심 위도
+METERS_PER_PIXEL_Z0 = 156543.03
+CENTER_LAT = 36.3
+
+
+# ============================================================
+# 피처 준비
+# ============================================================
+
+def mercator(lat, lng):
+    """위경도 → 정규화된 웹 메르카토르 좌표 (0~1)"""
+    s = math.sin(math.radians(max(min(lat, 85.0511), -85.0511)))
+    return (lng + 180.0) / 360.0, 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+
+
+def _props(item, keys):
+    return {k: item[k] for k in keys if item.get(k) is not None}
+
+
+def collect_features(data):
+    """load_grid_data() 결과 → 타일용 피처 목록
+    피처: {"layer", "type", "coords"([[lat, lng], ...]), "props", "priority", "minzoom", "digest"}
+    """
+    features = []
+
+    def add(layer, geom_type, coords, props, priority, minzoom):
+        feature = {"layer": layer, "type": geom_type, "coords": coords, "props": props,
+                   "priority": priority, "minzoom": minzoom}
+        payload = json.dumps(feature, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        feature["digest"] = hashlib.sha1(payload).hexdigest()
+        features.append(feature)
+
+    for plant in data["plants"]:
+        props = _props(plant, ("name", "type", "capacity_mw", "units", "operator"))
+        add("plants", POINT, [[plant["lat"], plant["lng"]]], props,
+            plant["capacity_mw"] or 0, LAYER_MIN_ZOOM["plants"])
+
+    for ss in data["substations"]:
+        props = _props(ss, ("name", "type", "voltage", "capacity_mva"))
+        add("substations", POINT, [[ss["lat"], ss["lng"]]], props,
+            ss["voltage"], LAYER_MIN_ZOOM["substations"])
+
+    for line in data["lines"]:
+        voltage = line["voltage"]
+        props = _props(line, ("name", "from", "to", "length"))
+        props["voltage"] = str(voltage)
+        add("lines", LINESTRING, line["coords"], props,
+            1000 if voltage == "HVDC" else voltage, LINE_MIN_ZOOM.get(voltage, MIN_ZOOM))
+
+    # DB에서 읽었으면 transmission_towers 행, 아니면 선로 중간 꼭짓점을 송전탑으로
+    towers = data.get("towers")
+    if towers is None:
+        towers = [(line["name"], i, lat, lng, line["voltage"])
+                  for line in data["lines"] for i, (lat, lng) in enumerate(line["coords"][1:-1], 1)]
+    for line_id, number, lat, lng, voltage in towers:
+        add("towers", POINT, [[lat, lng]], {"line": str(line_id), "number": number,
+                                            "voltage": str(voltage)},
+            0, LAYER_MIN_ZOOM["towers"])
+
+    for feature in features:
+        xs, ys = zip(*(mercator(lat, lng) for lat, lng in feature["coords"]))
+        feature["bounds"] = (min(xs), min(ys), max(xs), max(ys))
+    return features
+
+
+# ============================================================
+# MVT 인코딩 (protobuf 직접 작성)
+# ============================================================
+
+def _varint(n):
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def _field(number, payload):
+    """길이 구분(wire type 2) 필드"""
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _uint_field(number, value):
+    return _varint(number << 3) + _varint(value)
+
+
+def _packed(number, values):
+    return _field(number, b"".join(_varint(v) for v in values))
+
+
+def _value(value):
+    if isinstance(value, str):
+        return _field(1, value.encode("utf-8"))
+    if isinstance(value, bool):
+        return _uint_field(7, int(value))
+    if isinstance(value, int):
+        return _uint_field(6, _zigzag(value))
+    return _varint(3 << 3 | 1) + struct.pack("<d", value)
+
+
+def _geometry(geom_type, parts):
+    """parts: 타일 좌표 [[(x, y), ...], ...] → 명령 정수 목록 (MoveTo=1, LineTo=2)"""
+    out = []
+    cx = cy = 0
+    if geom_type == POINT:
+        out.append(1 | len(parts) << 3)
+        for (x, y), in parts:
+            out += [_zigzag(x - cx), _zigzag(y - cy)]
+            cx, cy = x, y
+        return out
+    for part in parts:
+        x, y = part[0]
+        out += [1 | 1 << 3, _zigzag(x - cx), _zigzag(y - cy)]
+        cx, cy = x, y
+        out.append(2 | (len(part) - 1) << 3)
+        for x, y in part[1:]:
+            out += [_zigzag(x - cx), _zigzag(y - cy)]
+            cx, cy = x, y
+    return out
+
+
+def encode_tile(layers):
+    """layers: {레이어 이름: [(피처 id, 타입, parts, props), ...]} → MVT 바이트"""
+    tile = b""
+    for name, features in layers.items():
+        keys, values = {}, {}
+        body = b""
+        for fid, geom_type, parts, props in features:
+            tags = []
+            for k, v in props.items():
+                tags.append(keys.setdefault(k, len(keys)))
+                tags.append(values.setdefault((type(v).__name__, v), len(values)))
+            feature = (_uint_field(1, fid) + _packed(2, tags) + _uint_field(3, geom_type)
+                       + _packed(4, _geometry(geom_type, parts)))
+            body += _field(2, feature)
+        layer = (_uint_field(15, 2) + _field(1, name.encode("utf-8")) + body
+                 + b"".join(_field(3, k.encode("utf-8")) for k in keys)
+                 + b"".join(_field(4, _value(v)) for _, v in values)
+                 + _uint_field(5, EXTENT))
+        tile += _field(3, layer)
+    return tile
+
+
+# ============================================================
+# 타일 자르기 (작업 프로세스)
+# ============================================================
+
+_worker = {}
+
+
+def _init_worker(features, hashes, maxzoom, compress):
+    _worker.update(features=features, hashes=hashes, maxzoom=maxzoom, compress=compress,
+                   simplified={})
+
+
+def _line_world(index, z):
+    """줌 z의 1픽셀 오차로 단순화한 선로의 월드 좌표 (타일 단위, 작업 프로세스별 캐시)"""
+    from line_geometry import douglas_peucker
+
+    key = (index, z)
+    cache = _worker["simplified"]
+    if key not in cache:
+        feature = _worker["features"][index]
+        tolerance = METERS_PER_PIXEL_Z0 * math.cos(math.radians(CENTER_LAT)) / 2 ** z
+        coords = feature["coords"] if z >= _worker["maxzoom"] else \
+            douglas_peucker(feature["coords"], tolerance)
+        size = EXTENT * 2 ** z
+        cache[key] = [(x * size, y * size) for x, y in (mercator(*c) for c in coords)]
+    return cache[key]
+
+
+def _tile_range(lo, hi, z):
+    """월드 좌표 구간(여유 포함)과 겹치는 타일 번호 범위"""
+    n = 2 ** z
+    return max(int((lo - BUFFER) // EXTENT), 0), min(int((hi + BUFFER) // EXTENT), n - 1)
+
+
+def _clip_runs(world, segments, tx, ty):
+    """타일과 겹치는 선분 번호 → 연속 구간별 타일 좌표 목록 (중복점 제거, 2점 미만 구간 제외)"""
+    parts, run = [], []
+    last = None
+    for i in segments:
+        if last is not None and i != last + 1:
+            parts.append(run)
+            run = []
+        if not run:
+            run.append(world[i])
+        run.append(world[i + 1])
+        last = i
+    if run:
+        parts.append(run)
+
+    ox, oy = tx * EXTENT, ty * EXTENT
+    out = []
+    for run in parts:
+        local = []
+        for x, y in run:
+            p = (round(x - ox), round(y - oy))
+            if not local or local[-1] != p:
+                local.append(p)
+        if len(local) >= 2:
+            out.append(local)
+    return out
+
+
+def render_column(task):
+    """(z, 타일 열 x, 그 열과 겹치는 피처 번호) → [(z, x, y, 해시, 데이터 또는 None(변경 없음)), ...]"""
+    z, tx, indices = task
+    size = EXTENT * 2 ** z
+    x_lo, x_hi = tx * EXTENT - BUFFER, (tx + 1) * EXTENT + BUFFER
+    candidates = {}
+
+    for index in indices:
+        feature = _worker["features"][index]
+        b = feature["bounds"]
+        if feature["type"] == POINT:
+            x, y = b[0] * size, b[1] * size
+            x0, x1 = _tile_range(x, x, z)
+            if not x0 <= tx <= x1:
+                continue
+            y0, y1 = _tile_range(y, y, z)
+            for ty in range(y0, y1 + 1):
+                candidates.setdefault(ty, []).append((index, None))
+            continue
+        world = _line_world(index, z)
+        per_tile = {}
+        for i in range(len(world) - 1):
+            (ax, ay), (bx, by) = world[i], world[i + 1]
+            if max(ax, bx) < x_lo or min(ax, bx) > x_hi:
+                continue
+            y0, y1 = _tile_range(min(ay, by), max(ay, by), z)
+            for ty in range(y0, y1 + 1):
+                per_tile.setdefault(ty, []).append(i)
+        for ty, segments in per_tile.items():
+            candidates.setdefault(ty, []).append((index, segments))
+
+    results = []
+    for ty, entries in sorted(candidates.items()):
+        digest = hashlib.sha1(f"{TILE_FORMAT}/{z}/{_worker['maxzoom']}".encode())
+        for index, _ in entries:
+            digest.update(_worker["features"][index]["digest"].encode())
+        tile_hash = digest.hexdigest()
+        if _worker["hashes"].get((z, tx, ty)) == tile_hash:
+            results.append((z, tx, ty, tile_hash, None))
+            continue
+        data = encode_tile(_tile_layers(entries, z, tx, ty))
+        if _worker["compress"]:
+            data = gzip.compress(data)
+        results.append((z, tx, ty, tile_hash, data))
+    return results
+
+
+def _tile_layers(entries, z, tx, ty):
+    """타일 한 장의 레이어별 피처 (우선순위 정렬 → 점 솎아내기 → 개수 제한)"""
+    features = _worker["features"]
+    size = EXTENT * 2 ** z
+    ox, oy = tx * EXTENT, ty * EXTENT
+    by_layer = {}
+    for index, segments in entries:
+        by_layer.setdefault(features[index]["layer"], []).append((index, segments))
+
+    layers = {}
+    for name, items in by_layer.items():
+        items.sort(key=lambda item: (-features[item[0]]["priority"], item[0]))
+        occupied = set()
+        out = []
+        for index, segments in items:
+            feature = features[index]
+            if feature["type"] == POINT:
+                b = feature["bounds"]
+                p = (round(b[0] * size - ox), round(b[1] * size - oy))
+                if z < _worker["maxzoom"]:
+                    cell = (p[0] // THIN_CELL, p[1] // THIN_CELL)
+                    if cell in occupied:
+                        continue
+                    occupied.add(cell)
+                parts = [[p]]
+            else:
+                parts = _clip_runs(_line_world(index, z), segments, tx, ty)
+                if not parts:
+                    continue
+            out.append((index + 1, feature["type"], parts, feature["props"]))
+            if len(out) >= MAX_FEATURES:
+                break
+        if out:
+            layers[name] = out
+    return layers
+
+
+# ============================================================
+# 저장소 (MBTiles / PBF 디렉터리)
+# ============================================================
+
+class MBTilesStore:
+    """MBTiles 1.3 (tiles 테이블은 TMS 행 번호, 데이터는 gzip) + 증분용 tile_hashes 테이블"""
+
+    compress = True
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tiles (
+                zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB,
+                PRIMARY KEY (zoom_level, tile_column, tile_row));
+            CREATE TABLE IF NOT EXISTS tile_hashes (
+                zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, hash TEXT,
+                PRIMARY KEY (zoom_level, tile_column, tile_row));
+        """)
+
+    @staticmethod
+    def _row(z, y):
+        return 2 ** z - 1 - y
+
+    def hashes(self):
+        rows = self.conn.execute("SELECT zoom_level, tile_column, tile_row, hash FROM tile_hashes")
+        return {(z, x, self._row(z, row)): h for z, x, row, h in rows}
+
+    def put(self, z, x, y, data, tile_hash):
+        row = self._row(z, y)
+        self.conn.execute("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (z, x, row, data))
+        self.conn.execute("INSERT OR REPLACE INTO tile_hashes VALUES (?, ?, ?, ?)",
+                          (z, x, row, tile_hash))
+
+    def delete(self, z, x, y):
+        key = (z, x, self._row(z, y))
+        self.conn.execute("DELETE FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?", key)
+        self.conn.execute("DELETE FROM tile_hashes WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                          key)
+
+    def get(self, z, x, y):
+        row = self.conn.execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, self._row(z, y))).fetchone()
+        return row[0] if row else None
+
+    def write_metadata(self, metadata):
+        self.conn.executemany("INSERT OR REPLACE INTO metadata VALUES (?, ?)",
+                              [(k, v if isinstance(v, str) else json.dumps(v, ensure_ascii=False))
+                               for k, v in metadata.items()])
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class DirectoryStore:
+    """<디렉터리>/z/x/y.pbf (압축 없음, 정적 서버로 바로 제공) + metadata.json, hashes.json"""
+
+    compress = False
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._hash_path = os.path.join(path, "hashes.json")
+        try:
+            with open(self._hash_path, "r", encoding="utf-8") as f:
+                self._hashes = {tuple(map(int, k.split("/"))): v for k, v in json.load(f).items()}
+        except (OSError, ValueError):
+            self._hashes = {}
+
+    def _tile_path(self, z, x, y):
+        return os.path.join(self.path, str(z), str(x), f"{y}.pbf")
+
+    def hashes(self):
+        return dict(self._hashes)
+
+    def put(self, z, x, y, data, tile_hash):
+        path = self._tile_path(z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        self._hashes[(z, x, y)] = tile_hash
+
+    def delete(self, z, x, y):
+        try:
+            os.remove(self._tile_path(z, x, y))
+        except FileNotFoundError:
+            pass
+        self._hashes.pop((z, x, y), None)
+
+    def get(self, z, x, y):
+        try:
+            with open(self._tile_path(z, x, y), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write_metadata(self, metadata):
+        with open(os.path.join(self.path, "metadata.json"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(self.path, "viewer.html"), "w", encoding="utf-8") as f:
+            f.write(viewer_html(metadata))
+
+    def close(self):
+        tmp_path = self._hash_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({f"{z}/{x}/{y}": h for (z, x, y), h in sorted(self._hashes.items())}, f)
+        os.replace(tmp_path, self._hash_path)
+
+
+def open_store(path):
+    if path.endswith(".mbtiles"):
+        return MBTilesStore(path)
+    return DirectoryStore(path)
+
+
+class MBTilesReader:
+    """serve용 읽기 전용 MBTiles (mode=ro 연결 하나를 요청 스레드들이 잠금으로 나눠 씀)"""
+
+    compress = True
+
+    def __init__(self, path):
+        from urllib.request import pathname2url
+
+        uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+        self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def metadata(self):
+        with self._lock:
+            return dict(self.conn.execute("SELECT name, value FROM metadata"))
+
+    def get(self, z, x, y):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+                (z, x, MBTilesStore._row(z, y))).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        self.conn.close()
+
+
+class DirectoryReader:
+    """serve용 PBF 디렉터리 (z/x/y.pbf를 바로 읽음, hashes.json은 읽지 않음)"""
+
+    compress = False
+
+    def __init__(self, path):
+        self.path = path
+
+    def metadata(self):
+        with open(os.path.join(self.path, "metadata.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def get(self, z, x, y):
+        try:
+            with open(os.path.join(self.path, str(z), str(x), f"{y}.pbf"), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def close(self):
+        pass
+
+
+def open_reader(path):
+    if path.endswith(".mbtiles"):
+        return MBTilesReader(path)
+    return DirectoryReader(path)
+
+
+# ============================================================
+# 내보내기
+# ============================================================
+
+def _metadata(features, minzoom, maxzoom):
+    lats = [lat for f in features for lat, _ in f["coords"]]
+    lngs = [lng for f in features for _, lng in f["coords"]]
+    fields = {}
+    for f in features:
+        for k, v in f["props"].items():
+            fields.setdefault(f["layer"], {})[k] = "String" if isinstance(v, str) else "Number"
+    return {
+        "name": "대한민국 전력 송전망",
+        "format": "pbf",
+        "minzoom": str(minzoom),
+        "maxzoom": str(maxzoom),
+        "bounds": f"{min(lngs)},{min(lats)},{max(lngs)},{max(lats)}",
+        "center": f"127.8,36.3,{minzoom + 2}",
+        "json": {"vector_layers": [
+            {"id": layer, "fields": fields[layer],
+             "minzoom": max(minzoom, min(f["minzoom"] for f in features if f["layer"] == layer)),
+             "maxzoom": maxzoom}
+            for layer in fields
+        ]},
+    }
+
+
+def export_tiles(data, path, minzoom=MIN_ZOOM, maxzoom=MAX_ZOOM, processes=None):
+    """벡터 타일 내보내기 (해시가 같은 타일은 건너뜀) → 통계 딕셔너리"""
+    from multiprocessing import Pool
+
+    start = time.perf_counter()
+    features = collect_features(data)
+    store = open_store(path)
+    old_hashes = store.hashes()
+
+    # 줌별로 피처를 겹치는 타일 열에 배정 (작업 하나는 자기 열의 피처만 훑음)
+    tasks = []
+    for z in range(minzoom, maxzoom + 1):
+        size = EXTENT * 2 ** z
+        columns = {}
+        for index, feature in enumerate(features):
+            if feature["minzoom"] <= z:
+                x0, x1 = _tile_range(feature["bounds"][0] * size, feature["bounds"][2] * size, z)
+                for tx in range(x0, x1 + 1):
+                    columns.setdefault(tx, []).append(index)
+        tasks += [(z, tx, indices) for tx, indices in sorted(columns.items())]
+
+    init_args = (features, old_hashes, maxzoom, store.compress)
+    stats = {"features": len(features), "written": 0, "unchanged": 0, "deleted": 0, "bytes": 0,
+             "processes": processes or os.cpu_count()}
+    seen = set()
+
+    def consume(results):
+        for z, x, y, tile_hash, tile in results:
+            seen.add((z, x, y))
+            if tile is None:
+                stats["unchanged"] += 1
+                continue
+            store.put(z, x, y, tile, tile_hash)
+            stats["written"] += 1
+            stats["bytes"] += len(tile)
+
+    try:
+        if processes == 1:
+            _init_worker(*init_args)
+            for task in tasks:
+                consume(render_column(task))
+        else:
+            with Pool(processes, initializer=_init_worker, initargs=init_args) as pool:
+                for results in pool.imap_unordered(render_column, tasks):
+                    consume(results)
+
+        for key in set(old_hashes) - seen:
+            store.delete(*key)
+            stats["deleted"] += 1
+        store.write_metadata(_metadata(features, minzoom, maxzoom))
+    finally:
+        store.close()
+
+    stats["tiles"] = len(seen)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+# ============================================================
+# 뷰어
+# ============================================================
+
+VIEWER_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>$title (벡터 타일)</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css">
+<script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+<script src="https://unpkg.com/leaflet.vectorgrid@1.3.0/dist/Leaflet.VectorGrid.bundled.js"></script>
+<style>html, body, #map { height: 100%; margin: 0; font-family: 'Malgun Gothic', sans-serif; }</style>
+</head>
+<body>
+<div id="map"></div>
+<script>
+var VOLTAGE = $voltage_styles, PLANT_COLORS = $plant_colors;
+var map = L.map('map', {minZoom: $minzoom}).setView([36.3, 127.8], 7);
+L.tileLayer('https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png', {
+    attribution: '&copy; OpenStreetMap &copy; CARTO', subdomains: 'abcd'
+}).addTo(map);
+var grid = L.vectorGrid.protobuf('{z}/{x}/{y}.pbf', {
+    maxNativeZoom: $maxzoom,
+    interactive: true,
+    rendererFactory: L.canvas.tile,
+    getFeatureId: function (f) { return f.id; },
+    vectorTileLayerStyles: {
+        lines: function (p) {
+            var s = VOLTAGE[p.voltage] || VOLTAGE['154'];
+            return {color: s.color, weight: s.weight, opacity: s.opacity, dashArray: s.dash_array};
+        },
+        plants: function (p) {
+            return {radius: 7, fill: true, fillColor: PLANT_COLORS[p.type] || 'gray',
+                    fillOpacity: 0.9, color: '#fff', weight: 1};
+        },
+        substations: function (p) {
+            return {radius: p.voltage === 765 ? 7 : 5, fill: true, fillColor: '#1e3a5f',
+                    fillOpacity: 0.7, color: '#fff', weight: 1};
+        },
+        towers: function (p) {
+            var s = VOLTAGE[p.voltage] || VOLTAGE['154'];
+            return {radius: 2, fill: true, fillColor: s.color, fillOpacity: 0.8, stroke: false};
+        }
+    }
+}).addTo(map);
+grid.on('click', function (e) {
+    var p = e.layer.properties, rows = Object.keys(p).map(function (k) {
+        return '<tr><td style="font-weight:600;color:#555;padding:2px 8px 2px 0;">' + k +
+               '</td><td>' + p[k] + '</td></tr>';
+    }).join('');
+    L.popup().setLatLng(e.latlng).setContent('<table style="font-size:12px;">' + rows + '</table>')
+        .openOn(map);
+});
+</script>
+</body>
+</html>
+""")
+
+# folium 아이콘 색 이름 → CSS 색
+PLANT_CSS_COLORS = {"red": "#d63e2a", "darkred": "#a23336", "orange": "#f69730",
+                    "blue": "#38aadd", "green": "#72b026"}
+
+
+def viewer_html(metadata):
+    from korea_grid_map import FACILITY_ICONS, VOLTAGE_STYLES
+
+    voltage_styles = {str(k): {key: v[key] for key in ("color", "weight", "opacity", "dash_array")}
+                      for k, v in VOLTAGE_STYLES.items()}
+    plant_colors = {k: PLANT_CSS_COLORS.get(v["color"], v["color"])
+                    for k, v in FACILITY_ICONS.items()}
+    return VIEWER_TEMPLATE.substitute(
+        title=metadata["name"],
+        minzoom=metadata["minzoom"],
+        maxzoom=metadata["maxzoom"],
+        voltage_styles=json.dumps(voltage_styles),
+        plant_colors=json.dumps(plant_colors),
+    )
+
+
+def serve(path, port):
+    """MBTiles/PBF 디렉터리를 뷰어와 함께 로컬 HTTP로 제공 (보이는 타일만 요청됨)"""
+    import re
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    # 저장소는 한 번만 읽기 전용으로 열어 모든 요청이 함께 씀 (요청마다 열지 않음)
+    reader = open_reader(path)
+    metadata = reader.metadata()
+    page = viewer_html(metadata).encode("utf-8")
+    tile_pattern = re.compile(r"^/(\d+)/(\d+)/(\d+)\.pbf$")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path in ("/", "/viewer.html"):
+                self._send(200, "text/html; charset=utf-8", page)
+                return
+            match = tile_pattern.match(self.path)
+            if not match:
+                self._send(404, "text/plain", b"not found")
+                return
+            tile = reader.get(*map(int, match.groups()))
+            if tile is None:
+                self._send(204, "application/x-protobuf", b"")
+            else:
+                self._send(200, "application/x-protobuf", tile, reader.compress)
+
+        def _send(self, status, content_type, body, gzipped=False):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    print(f"http://localhost:{port}/ ({path})")
+    try:
+        ThreadingHTTPServer(("", port), Handler).serve_forever()
+    finally:
+        reader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="송전망 벡터 타일 내보내기")
+    parser.add_argument("command", choices=["export", "serve"])
+    parser.add_argument("path", help="*.mbtiles 파일 또는 PBF 디렉터리")
+    parser.add_argument("--db", help="grid_db.py로 만든 SQLite (없으면 korea_grid_map 데이터)")
+    parser.add_argument("--minzoom", type=int, default=MIN_ZOOM)
+    parser.add_argument("--maxzoom", type=int, default=MAX_ZOOM)
+    parser.add_argument("--processes", type=int, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.path, args.port)
+        return
+
+    from korea_grid_map import load_grid_data
+
+    stats = export_tiles(load_grid_data(db_path=args.db), args.path,
+                         args.minzoom, args.maxzoom, args.processes)
+    print(f"피처 {stats['features']:,}개 → 타일 {stats['tiles']:,}장 (z{args.minzoom}-{args.maxzoom}, "
+          f"프로세스 {stats['processes']}개)")
+    print(f"  새로 씀 {stats['written']:,}  변경 없음 {stats['unchanged']:,}  "
+          f"삭제 {stats['deleted']:,}  {stats['bytes'] / 1024:.1f}KB  {stats['seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()